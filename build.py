@@ -42,27 +42,52 @@ def setup_tables(c):
     
     # Create ENUM types first (before tables that use them)
     schema._create_enum_types(c)
+
+    # Stage the events JSON and turn low-cardinality TEXT columns into ENUMs
+    enum_columns = schema.infer_event_enums(c)
+    logger.info(f"Inferred ENUM types for {len(enum_columns)} events columns")
     
     # Core tables
     schema.make_competitions(c)
     schema.make_teams(c)
     schema.make_matches(c)
+    schema.make_managers(c)
+    schema.make_match_managers(c)
     schema.make_event_types(c)
     schema.make_players(c)
     schema.make_positions(c)
     schema.make_play_patterns(c)
     schema.make_countries(c)
-    schema.make_events(c)
+    schema.make_events(c, enum_columns)
+    schema.make_event_relations(c)
+    schema.make_zone_grids(c)
+    
+    # Derived tables
+    schema.make_possessions(c)
+    schema.make_actions(c)
+    schema.make_xt_grids(c)
+    schema.make_action_xt(c)
+    schema.make_heatmap_tiles(c)
+    schema.make_zone_transitions(c)
+    schema.make_pass_network_nodes(c)
+    schema.make_pass_network_edges(c)
+    schema.make_shot_features(c)
     
     # Lineup tables
     schema.make_lineups(c)
     schema.make_lineup_players(c)
     schema.make_lineup_positions(c)
     schema.make_lineup_cards(c)
+    schema.make_player_intervals(c)
+    schema.make_player_match_stats(c)
     
     # 360 data tables
     schema.make_three_sixty_frames(c)
     schema.make_three_sixty_positions(c)
+    schema.make_three_sixty_frames_packed(c)
+    schema.make_frame_pressure(c)
+    schema.make_frame_pitch_control(c)
+    schema.make_pass_options(c)
     
     logger.info("All tables created successfully")
 
@@ -88,6 +113,11 @@ def setup_tables(c):
     match_count = schema.load_matches(c)
     logger.info(f"Loaded {match_count} matches in {time.time() - matches_start:.2f}s")
 
+    # Managers are extracted from the same match staging scan
+    managers_count = c.execute("SELECT COUNT(*) FROM managers").fetchone()[0]
+    match_managers_count = c.execute("SELECT COUNT(*) FROM match_managers").fetchone()[0]
+    logger.info(f"  - Loaded {managers_count} managers and {match_managers_count} match manager records")
+
     # =========================================================================
     # Phase 3: Load reference tables and events (optimized single-pass)
     # =========================================================================
@@ -98,12 +128,18 @@ def setup_tables(c):
     countries_count = schema.load_countries(c)
     logger.info(f"  - Loaded {countries_count} countries")
     
+    # Zone grid registry (events carry one zone column per grid and location field)
+    zone_grid_count = schema.load_zone_grids(c)
+    logger.info(f"  - Registered {zone_grid_count} zone grids")
+    
     # Load events - this now handles event_types, positions, play_patterns, and players
     # via a staging table approach (single JSON scan instead of 5 separate scans)
     logger.info("Loading events with extended fields (this may take a few minutes)")
     events_start = time.time()
     event_count = schema.load_events(c)
     logger.info(f"Loaded {event_count} events in {time.time() - events_start:.2f}s")
+    relations_count = c.execute("SELECT COUNT(*) FROM event_relations").fetchone()[0]
+    logger.info(f"  - Loaded {relations_count} event relations")
     
     # Verify reference tables were populated
     event_types_count = c.execute("SELECT COUNT(*) FROM event_types").fetchone()[0]
@@ -114,6 +150,43 @@ def setup_tables(c):
     
     logger.info(f"Reference tables and events loaded in {time.time() - ref_start:.2f}s")
 
+    # =========================================================================
+    # Phase 4: Build derived tables from events
+    # =========================================================================
+    logger.info("Building derived tables from events")
+    derived_start = time.time()
+    
+    game_state_count = schema.load_game_state(c)
+    logger.info(f"  - Annotated game state on {game_state_count} events")
+    
+    pointer_count = schema.load_event_pointers(c)
+    logger.info(f"  - Linked {pointer_count} events to their successors")
+    
+    possessions_count = schema.load_possessions(c)
+    logger.info(f"  - Built {possessions_count} possessions")
+    
+    actions_count = schema.load_actions(c)
+    logger.info(f"  - Built {actions_count} SPADL actions")
+    
+    pass_network_nodes_count = schema.load_pass_networks(c)
+    pass_network_edges_count = c.execute("SELECT COUNT(*) FROM pass_network_edges").fetchone()[0]
+    logger.info(f"  - Built {pass_network_nodes_count} pass network nodes and {pass_network_edges_count} edges")
+    
+    shot_features_count = schema.load_shot_features(c)
+    logger.info(f"  - Built features for {shot_features_count} shots")
+    
+    xt_grid_count = schema.load_expected_threat(c)
+    action_xt_count = c.execute("SELECT COUNT(*) FROM action_xt").fetchone()[0]
+    logger.info(f"  - Built {xt_grid_count} xT grids and {action_xt_count} action xT values")
+    
+    heatmap_tile_count = schema.load_heatmap_tiles(c)
+    logger.info(f"  - Built {heatmap_tile_count} heatmap tiles")
+    
+    transition_count = schema.load_zone_transitions(c)
+    logger.info(f"  - Built {transition_count} zone transition cells")
+    
+    logger.info(f"Derived tables built in {time.time() - derived_start:.2f}s")
+
     # =========================================================================
     # Phase 5: Load lineup data
     # =========================================================================
@@ -132,6 +205,13 @@ def setup_tables(c):
     lineup_cards_count = schema.load_lineup_cards(c)
     logger.info(f"  - Loaded {lineup_cards_count} lineup card records")
     
+    # On-pitch intervals need both lineup positions and event period bounds
+    player_intervals_count = schema.load_player_intervals(c)
+    logger.info(f"  - Built {player_intervals_count} player intervals")
+    
+    player_match_stats_count = schema.load_player_match_stats(c)
+    logger.info(f"  - Built {player_match_stats_count} player match stat records")
+    
     logger.info(f"Lineup data loaded in {time.time() - lineup_start:.2f}s")
 
     # =========================================================================
@@ -146,6 +226,19 @@ def setup_tables(c):
     positions_count = schema.load_three_sixty_positions(c)
     logger.info(f"  - Loaded {positions_count} 360 position records")
     
+    packed_count = schema.load_three_sixty_frames_packed(c)
+    logger.info(f"  - Packed {packed_count} 360 frames into player arrays")
+    
+    # Per-frame metrics run match by match across a process pool
+    frame_pressure_count = schema.load_frame_pressure(c)
+    logger.info(f"  - Computed pressure metrics for {frame_pressure_count} 360 frames")
+    
+    pitch_control_count = schema.load_pitch_control(c)
+    logger.info(f"  - Computed pitch control for {pitch_control_count} 360 frames")
+    
+    pass_options_count = schema.load_pass_options(c)
+    logger.info(f"  - Computed passing lanes for {pass_options_count} 360 passes")
+    
     logger.info(f"360 data loaded in {time.time() - threesixty_start:.2f}s")
 
     # =========================================================================
@@ -156,6 +249,34 @@ def setup_tables(c):
     schema.create_indexes(c)
     logger.info(f"Indexes created successfully in {time.time() - idx_start:.2f}s")
 
+    # =========================================================================
+    # Phase 8: Benchmark storage layouts
+    # =========================================================================
+    logger.info("Benchmarking events <-> 360 joins, event UUID storage, inferred ENUMs and event partitions")
+    timings = schema.benchmark_event_360_join(c)
+    logger.info(
+        f"  - UUID join {timings['uuid'] * 1000:.1f}ms, "
+        f"event_key join {timings['event_key'] * 1000:.1f}ms"
+    )
+    timings = schema.benchmark_event_partitions(c)
+    logger.info(
+        f"  - Pass aggregate via events view {timings['wide_view'] * 1000:.1f}ms, "
+        f"via event_passes {timings['extension'] * 1000:.1f}ms; "
+        f"core scan via events view {timings['core_wide_view'] * 1000:.1f}ms, "
+        f"via events_core {timings['events_core'] * 1000:.1f}ms"
+    )
+    for layout, result in schema.benchmark_uuid_storage(c).items():
+        logger.info(
+            f"  - Event UUIDs as {layout}: {result['bytes'] / 2**20:.1f} MiB, "
+            f"join {result['join_seconds'] * 1000:.1f}ms"
+        )
+    if enum_columns:
+        for layout, result in schema.benchmark_enum_columns(c, list(enum_columns)).items():
+            logger.info(
+                f"  - {len(enum_columns)} inferred ENUM columns as {layout}: "
+                f"{result['bytes'] / 2**20:.1f} MiB, GROUP BY {result['group_by_seconds'] * 1000:.1f}ms"
+            )
+
 
 if __name__ == "__main__":
     main()
@@ -1,83 +1,378 @@
+"""Export the database to denormalized Parquet files in parq_output/.
+
+The match-scoped outputs (matches, events, lineups, three_sixty) are
+hive-partitioned by competition and season:
+
+    parq_output/<name>/competition_id=<id>/season_id=<id>/data.parquet
+
+Rows are sorted by match_id within each partition, so row-group statistics
+let readers skip matches too. reference.parquet stays a single file.
+
+The five outputs are exported concurrently, each on its own cursor, with a
+configurable codec and row-group size. --benchmark compares settings.
+"""
+import argparse
 import duckdb
+import json
 import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from schema.benchmarks import time_query
+
+DB_PATH = 'stats.duckdb'
+OUTPUT_DIR = 'parq_output'
+
+# Records the partitions and content hashes of the last export, in output_dir
+MANIFEST_FILE = '_manifest.json'
+
+# Default Parquet writer settings (DuckDB's own defaults)
+DEFAULT_COMPRESSION = 'snappy'
+DEFAULT_ROW_GROUP_SIZE = 122880
+
+# Label -> writer settings compared by --benchmark
+BENCHMARK_SETTINGS = {
+    "snappy": {"compression": "snappy"},
+    "zstd-1": {"compression": "zstd", "compression_level": 1},
+    "zstd-3": {"compression": "zstd", "compression_level": 3},
+    "zstd-9": {"compression": "zstd", "compression_level": 9},
+    "zstd-3-rg32k": {"compression": "zstd", "compression_level": 3, "row_group_size": 32768},
+}
+
+# Hive partition keys of the match-scoped outputs
+PARTITION_COLUMNS = ("competition_id", "season_id")
+
+# Output name -> (SELECT including the partition columns, sort order within a partition)
+PARTITIONED_EXPORTS = {
+    # matches + competitions
+    "matches": ("""
+        SELECT m.*, c.name as competition_name, c.gender, c.is_youth, c.is_international,
+               c.country_name, c.season_name, c.match_updated, c.match_available_360
+        FROM matches m
+        JOIN competitions c ON m.competition_id = c.competition_id AND m.season_id = c.season_id
+    """, "match_id"),
+    # events (already denormalized)
+    "events": ("""
+        SELECT m.competition_id, m.season_id, e.*
+        FROM events e
+        JOIN matches m ON e.match_id = m.match_id
+    """, "match_id, index_num"),
+    # lineups + players + positions + cards; LEFT JOINs keep players without
+    # cards or position changes recorded
+    "lineups": ("""
+        SELECT
+            m.competition_id, m.season_id,
+            lp.*,
+            l.team_name,
+            pos.position_name, pos.from_time, pos.to_time, pos.from_period, pos.to_period,
+            c.card_time, c.card_type, c.reason as card_reason
+        FROM lineup_players lp
+        JOIN lineups l ON lp.match_id = l.match_id AND lp.team_id = l.team_id
+        JOIN matches m ON lp.match_id = m.match_id
+        LEFT JOIN lineup_positions pos ON lp.match_id = pos.match_id AND lp.team_id = pos.team_id AND lp.player_id = pos.player_id
+        LEFT JOIN lineup_cards c ON lp.match_id = c.match_id AND lp.team_id = c.team_id AND lp.player_id = c.player_id
+    """, "match_id, team_id, player_id"),
+    # frames + positions
+    "three_sixty": ("""
+        SELECT m.competition_id, m.season_id, f.match_id, p.*, f.visible_area
+        FROM three_sixty_positions p
+        JOIN three_sixty_frames f ON p.event_key = f.event_key
+        JOIN matches m ON f.match_id = m.match_id
+    """, "match_id, event_key, id"),
+}
+
+# Consolidated lookups, written as a single reference.parquet
+REFERENCE_SQL = """
+    SELECT 'team' as table_name, id, name, gender as extra_info FROM teams
+    UNION ALL
+    SELECT 'player' as table_name, id, name, NULL as extra_info FROM players
+    UNION ALL
+    SELECT 'position' as table_name, id, name, NULL as extra_info FROM positions
+    UNION ALL
+    SELECT 'event_type' as table_name, id, name, NULL as extra_info FROM event_types
+    UNION ALL
+    SELECT 'play_pattern' as table_name, id, name, NULL as extra_info FROM play_patterns
+    UNION ALL
+    SELECT 'country' as table_name, id, name, NULL as extra_info FROM countries
+"""
+
+
+def parquet_options(compression=DEFAULT_COMPRESSION, compression_level=None, row_group_size=None):
+    """COPY options for the Parquet writer; compression_level applies to zstd."""
+    options = f"FORMAT PARQUET, COMPRESSION {compression}, ROW_GROUP_SIZE {row_group_size or DEFAULT_ROW_GROUP_SIZE}"
+    if compression_level is not None:
+        options += f", COMPRESSION_LEVEL {compression_level}"
+    return options
+
+
+def partition_path(output_dir, name, competition_id, season_id):
+    """Path of one partition's Parquet file."""
+    return os.path.join(output_dir, name, partition_key(competition_id, season_id), "data.parquet")
+
+
+def partition_key(competition_id, season_id):
+    """Manifest key of one partition, its directory relative to the output."""
+    return f"competition_id={competition_id}/season_id={season_id}"
+
+
+def load_manifest(output_dir):
+    """The manifest of the last export to output_dir, or None."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(output_dir, manifest):
+    """Write the manifest atomically, so a failed export leaves the old one."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _remove_partition(output_dir, name, key):
+    """Delete one partition's directory, and its competition directory once empty."""
+    season_dir = os.path.join(output_dir, name, key)
+    shutil.rmtree(season_dir, ignore_errors=True)
+    competition_dir = os.path.dirname(season_dir)
+    if os.path.isdir(competition_dir) and not os.listdir(competition_dir):
+        os.rmdir(competition_dir)
+
+
+def _columns(con, table):
+    """'name TYPE' of every column of table (or query); a change rewrites the whole output."""
+    return [f"{name} {column_type}" for name, column_type, *_ in con.execute(f"DESCRIBE {table};").fetchall()]
+
+
+def export_partitioned(con, name, output_dir=OUTPUT_DIR, previous=None, copy_options=None):
+    """Write the changed partitions of one hive-partitioned output.
+
+    The output's query runs once into a temp table sorted by partition and
+    match, and is hashed per partition (row count plus the sum of row
+    hashes, so row order does not matter). Only partitions whose hash
+    differs from previous, the output's entry in the last manifest, are
+    copied out; partitions that disappeared are deleted. With no previous
+    entry, different columns or different copy_options (see
+    parquet_options), the whole output is rewritten. A single COPY with
+    PARTITION_BY would not keep rows sorted within each file.
+
+    Returns (manifest entry, number of partitions written).
+    """
+    copy_options = copy_options or parquet_options()
+    select_sql, order_by = PARTITIONED_EXPORTS[name]
+    staged = f"export_{name}"
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE {staged} AS
+        SELECT * FROM ({select_sql})
+        ORDER BY {", ".join(PARTITION_COLUMNS)}, {order_by};
+    """)
+    columns = _columns(con, staged)
+    partitions = {
+        partition_key(competition_id, season_id): {
+            "competition_id": competition_id,
+            "season_id": season_id,
+            "rows": rows,
+            "hash": str(row_hash),
+        }
+        for competition_id, season_id, rows, row_hash in con.execute(f"""
+            SELECT {", ".join(PARTITION_COLUMNS)}, COUNT(*), SUM(hash(x)::HUGEINT)
+            FROM {staged} x
+            GROUP BY ALL;
+        """).fetchall()
+    }
+
+    if previous is None or previous["columns"] != columns or previous.get("copy_options") != copy_options:
+        # Drop partitions (and the pre-partitioning single file) from earlier exports
+        shutil.rmtree(os.path.join(output_dir, name), ignore_errors=True)
+        if os.path.exists(os.path.join(output_dir, f"{name}.parquet")):
+            os.remove(os.path.join(output_dir, f"{name}.parquet"))
+        previous = {"partitions": {}}
+
+    for key in previous["partitions"].keys() - partitions.keys():
+        _remove_partition(output_dir, name, key)
+
+    written = 0
+    for key, partition in sorted(partitions.items()):
+        path = partition_path(output_dir, name, partition["competition_id"], partition["season_id"])
+        if previous["partitions"].get(key, {}).get("hash") == partition["hash"] and os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        con.execute(f"""
+            COPY (
+                SELECT * EXCLUDE ({", ".join(PARTITION_COLUMNS)})
+                FROM {staged}
+                WHERE competition_id = {partition["competition_id"]} AND season_id = {partition["season_id"]}
+                ORDER BY {order_by}
+            ) TO '{path}' ({copy_options});
+        """)
+        written += 1
+    con.execute(f"DROP TABLE {staged};")
+    return {"columns": columns, "copy_options": copy_options, "partitions": partitions}, written
+
+
+def export_reference(con, output_dir=OUTPUT_DIR, previous=None, copy_options=None):
+    """Write reference.parquet unless its hash matches previous.
+
+    Returns (manifest entry, number of files written).
+    """
+    copy_options = copy_options or parquet_options()
+    path = os.path.join(output_dir, "reference.parquet")
+    columns = _columns(con, REFERENCE_SQL)
+    rows, row_hash = con.execute(f"SELECT COUNT(*), SUM(hash(x)::HUGEINT) FROM ({REFERENCE_SQL}) x;").fetchone()
+    entry = {"columns": columns, "copy_options": copy_options, "rows": rows, "hash": str(row_hash)}
+    if previous == entry and os.path.exists(path):
+        return entry, 0
+    con.execute(f"COPY ({REFERENCE_SQL}) TO '{path}' ({copy_options});")
+    return entry, 1
+
+
+def export_outputs(con, output_dir=OUTPUT_DIR, previous=None, copy_options=None, workers=None):
+    """Export all five outputs concurrently, one cursor per output.
+
+    DuckDB runs each COPY on its shared thread pool, so workers bounds how
+    many outputs are staged and written at once (all of them by default).
+    Returns {output: (manifest entry, files written)}.
+    """
+    previous = previous or {}
+    tasks = {name: export_partitioned for name in PARTITIONED_EXPORTS}
+    tasks["reference"] = export_reference
+    with ThreadPoolExecutor(max_workers=workers or len(tasks)) as pool:
+        futures = {}
+        for name, task in tasks.items():
+            args = (name,) if task is export_partitioned else ()
+            futures[name] = pool.submit(
+                task, con.cursor(), *args, output_dir=output_dir,
+                previous=previous.get(name), copy_options=copy_options,
+            )
+        return {name: future.result() for name, future in futures.items()}
+
+
+def export_to_parquet(db_path=DB_PATH, output_dir=OUTPUT_DIR, full=False, compression=DEFAULT_COMPRESSION,
+                      compression_level=None, row_group_size=None, threads=None, workers=None):
+    """Export every output, rewriting only what changed since the last export.
+
+    The manifest in output_dir lists each output's partitions with their row
+    counts and hashes. full=True, a missing manifest, or one written by a
+    different DuckDB version (row hashes are not stable across versions)
+    rewrites everything, and so does changing the writer settings. threads
+    sets DuckDB's thread pool, which the concurrent COPYs share.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file {db_path} not found. Run build.py first.")
 
-def export_to_parquet():
-    # Define paths
-    db_path = 'stats.duckdb'
-    output_dir = 'parq_output'
-    
     # Create output directory if it doesn't exist
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"Created directory: {output_dir}")
-    
+
+    manifest = None if full else load_manifest(output_dir)
+    if manifest is not None and manifest.get("duckdb_version") != duckdb.__version__:
+        manifest = None
+    previous = manifest["outputs"] if manifest else {}
+
     # Connect to DuckDB
     con = duckdb.connect(db_path)
-    
-    print("Starting export...")
+    if threads:
+        con.execute(f"SET threads = {threads};")
 
-    # 1. matches.parquet (matches + competitions)
-    print("Exporting matches.parquet...")
-    con.execute(f"""
-        COPY (
-            SELECT m.*, c.name as competition_name, c.gender, c.is_youth, c.is_international, 
-                   c.country_name, c.season_name, c.match_updated, c.match_available_360
-            FROM matches m
-            JOIN competitions c ON m.competition_id = c.competition_id AND m.season_id = c.season_id
-        ) TO '{output_dir}/matches.parquet' (FORMAT PARQUET);
-    """)
+    copy_options = parquet_options(compression, compression_level, row_group_size)
+    print(f"Starting export ({copy_options})...")
+    start = time.perf_counter()
+    results = export_outputs(con, output_dir, previous, copy_options, workers)
+    for name, (entry, written) in results.items():
+        if name in PARTITIONED_EXPORTS:
+            print(f"  {name}/: {written} of {len(entry['partitions'])} competition/season partitions rewritten")
+        else:
+            print(f"  {name}.parquet: {'rewritten' if written else 'unchanged'}")
 
-    # 2. events.parquet (already denormalized)
-    print("Exporting events.parquet...")
-    con.execute(f"COPY events TO '{output_dir}/events.parquet' (FORMAT PARQUET);")
+    outputs = {name: entry for name, (entry, _) in results.items()}
+    _write_manifest(output_dir, {"duckdb_version": duckdb.__version__, "outputs": outputs})
+    print(f"Export completed in {time.perf_counter() - start:.2f}s. Files are in '{output_dir}/'")
+    con.close()
 
-    # 3. lineups.parquet (lineups + players + positions + cards)
-    print("Exporting lineups.parquet...")
-    # Using LEFT JOINs to ensure we don't lose players who might not have cards or position changes recorded
-    con.execute(f"""
-        COPY (
-            SELECT 
-                lp.*,
-                l.team_name,
-                pos.position_name, pos.from_time, pos.to_time, pos.from_period, pos.to_period,
-                c.card_time, c.card_type, c.reason as card_reason
-            FROM lineup_players lp
-            JOIN lineups l ON lp.match_id = l.match_id AND lp.team_id = l.team_id
-            LEFT JOIN lineup_positions pos ON lp.match_id = pos.match_id AND lp.team_id = pos.team_id AND lp.player_id = pos.player_id
-            LEFT JOIN lineup_cards c ON lp.match_id = c.match_id AND lp.team_id = c.team_id AND lp.player_id = c.player_id
-        ) TO '{output_dir}/lineups.parquet' (FORMAT PARQUET);
-    """)
 
-    # 4. three_sixty.parquet (frames + positions)
-    print("Exporting three_sixty.parquet...")
-    con.execute(f"""
-        COPY (
-            SELECT f.match_id, p.*, f.visible_area
-            FROM three_sixty_positions p
-            JOIN three_sixty_frames f ON p.event_uuid = f.event_uuid
-        ) TO '{output_dir}/three_sixty.parquet' (FORMAT PARQUET);
-    """)
+def _directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
 
-    # 5. reference.parquet (consolidated lookups)
-    print("Exporting reference.parquet...")
-    con.execute(f"""
-        COPY (
-            SELECT 'team' as table_name, id, name, gender as extra_info FROM teams
-            UNION ALL
-            SELECT 'player' as table_name, id, name, NULL as extra_info FROM players
-            UNION ALL
-            SELECT 'position' as table_name, id, name, NULL as extra_info FROM positions
-            UNION ALL
-            SELECT 'event_type' as table_name, id, name, NULL as extra_info FROM event_types
-            UNION ALL
-            SELECT 'play_pattern' as table_name, id, name, NULL as extra_info FROM play_patterns
-            UNION ALL
-            SELECT 'country' as table_name, id, name, NULL as extra_info FROM countries
-        ) TO '{output_dir}/reference.parquet' (FORMAT PARQUET);
-    """)
 
-    print(f"Export completed. Files are in '{output_dir}/'")
+def benchmark_export(db_path=DB_PATH, settings=None, threads=None, workers=None, repeat=3):
+    """Full export into a scratch directory per writer setting.
+
+    Reports wall-clock seconds, output size, write throughput (rows
+    exported per second, so better compression does not read as slower)
+    and the best time of a typical filtered read: one match's event type
+    counts, pruned by partition and by match_id row groups.
+    Returns {label: {"seconds", "bytes", "rows", "rows_per_s", "query_seconds"}}.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file {db_path} not found. Run build.py first.")
+
+    con = duckdb.connect(db_path)
+    if threads:
+        con.execute(f"SET threads = {threads};")
+    match = con.execute("""
+        SELECT m.competition_id, m.season_id, m.match_id
+        FROM matches m
+        WHERE EXISTS (SELECT 1 FROM events_core e WHERE e.match_id = m.match_id)
+        ORDER BY m.match_id
+        LIMIT 1;
+    """).fetchone()
+
+    results = {}
+    for label, options in (settings or BENCHMARK_SETTINGS).items():
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            outputs = export_outputs(con, output_dir, copy_options=parquet_options(**options), workers=workers)
+            seconds = time.perf_counter() - start
+            rows = sum(
+                sum(p["rows"] for p in entry["partitions"].values()) if "partitions" in entry else entry["rows"]
+                for entry, _ in outputs.values()
+            )
+            size = _directory_bytes(output_dir)
+            query_seconds = None
+            if match is not None:
+                competition_id, season_id, match_id = match
+                query_seconds = time_query(con, f"""
+                    SELECT type, COUNT(*), AVG(location_x)
+                    FROM read_parquet('{output_dir}/events/*/*/*.parquet', hive_partitioning=true)
+                    WHERE competition_id = {competition_id} AND season_id = {season_id} AND match_id = {match_id}
+                    GROUP BY type;
+                """, repeat)
+            results[label] = {
+                "seconds": seconds,
+                "bytes": size,
+                "rows": rows,
+                "rows_per_s": rows / seconds,
+                "query_seconds": query_seconds,
+            }
     con.close()
+    return results
+
 
 if __name__ == "__main__":
-    export_to_parquet()
+    parser = argparse.ArgumentParser(description="Export stats.duckdb to Parquet.")
+    parser.add_argument("--full", action="store_true", help="rewrite every partition, ignoring the manifest")
+    parser.add_argument("--compression", default=DEFAULT_COMPRESSION,
+                        choices=["snappy", "zstd", "gzip", "lz4", "uncompressed"])
+    parser.add_argument("--compression-level", type=int, help="zstd level (1-22)")
+    parser.add_argument("--row-group-size", type=int, help=f"rows per row group (default {DEFAULT_ROW_GROUP_SIZE})")
+    parser.add_argument("--threads", type=int, help="DuckDB threads shared by the concurrent exports")
+    parser.add_argument("--workers", type=int, help="outputs exported at once (default: all five)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare BENCHMARK_SETTINGS in scratch directories instead of exporting")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"{'setting':<14}{'seconds':>9}{'MiB':>9}{'krows/s':>9}{'query ms':>10}")
+        for label, r in benchmark_export(threads=args.threads, workers=args.workers).items():
+            query_ms = f"{r['query_seconds'] * 1000:.1f}" if r["query_seconds"] is not None else "-"
+            print(f"{label:<14}{r['seconds']:>9.2f}{r['bytes'] / 2**20:>9.1f}{r['rows_per_s'] / 1000:>9.1f}{query_ms:>10}")
+    else:
+        export_to_parquet(
+            full=args.full, compression=args.compression, compression_level=args.compression_level,
+            row_group_size=args.row_group_size, threads=args.threads, workers=args.workers,
+        )
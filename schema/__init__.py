@@ -1,21 +1,41 @@
 # Table creation functions
 from .tables import (
+    EVENT_EXTENSIONS,
     _create_enum_types,
     make_competitions,
     make_matches,
     make_teams,
+    make_managers,
+    make_match_managers,
     make_event_types,
     make_players,
     make_positions,
     make_play_patterns,
     make_events,
+    make_event_relations,
+    make_zone_grids,
+    make_possessions,
+    make_actions,
+    make_xt_grids,
+    make_action_xt,
+    make_player_intervals,
+    make_player_match_stats,
+    make_heatmap_tiles,
+    make_zone_transitions,
+    make_pass_network_nodes,
+    make_pass_network_edges,
+    make_shot_features,
     make_countries,
     make_lineups,
     make_lineup_players,
     make_lineup_positions,
     make_lineup_cards,
     make_three_sixty_frames,
-    make_three_sixty_positions
+    make_three_sixty_positions,
+    make_three_sixty_frames_packed,
+    make_frame_pressure,
+    make_frame_pitch_control,
+    make_pass_options
 )
 
 # Data loading functions
@@ -37,5 +57,89 @@ from .loaders import (
     load_three_sixty_positions
 )
 
+# Pitch zones
+from .zones import (
+    ZONE_GRIDS,
+    ZONE_FIELDS,
+    zone_column,
+    load_zone_grids
+)
+
+# Derived tables
+from .derived import (
+    load_game_state,
+    load_event_pointers,
+    load_possessions,
+    load_actions,
+    load_pass_networks,
+    load_player_intervals,
+    load_player_match_stats,
+    refresh_derived_tables
+)
+
+# Expected Threat
+from .xt import (
+    DEFAULT_XT_GRID,
+    load_expected_threat,
+    get_xt_grid
+)
+
+# Shot features
+from .shots import (
+    SHOT_FEATURE_VERSION,
+    load_shot_features
+)
+
+# Heatmap tiles
+from .heatmaps import (
+    load_heatmap_tiles,
+    get_heatmap
+)
+
+# Zone transitions
+from .transitions import (
+    TRANSITION_VALUES,
+    load_zone_transitions,
+    get_transition_matrix
+)
+
+# 360 frame engines
+from .frames import (
+    pad_frames,
+    load_packed_frame_arrays,
+    frame_pressure_metrics,
+    load_frame_pressure,
+    pad_polygons,
+    pitch_control_areas,
+    load_pitch_control,
+    PASS_LANE_CLEARANCE,
+    pass_lane_metrics,
+    load_pass_options
+)
+
+# Inferred ENUM types
+from .enums import ENUM_MAX_CARDINALITY, infer_event_enums
+
+# Packed 360 layout
+from .packed import (
+    POSITION_FLAG_TEAMMATE,
+    POSITION_FLAG_ACTOR,
+    POSITION_FLAG_KEEPER,
+    load_three_sixty_frames_packed,
+    fetch_packed_positions
+)
+
 # Index creation
 from .indexes import create_indexes
+
+# Query helpers
+from .queries import get_event_chains, get_on_pitch_players
+
+# Layout benchmarks
+from .benchmarks import (
+    time_query,
+    benchmark_event_360_join,
+    benchmark_event_partitions,
+    benchmark_uuid_storage,
+    benchmark_enum_columns
+)
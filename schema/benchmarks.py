@@ -0,0 +1,150 @@
+"""Query timings logged at the end of a build.
+
+Each benchmark runs equivalent queries against alternative storage layouts
+(for example UUID vs surrogate-key joins) so the effect of a layout change
+shows up in the build log.
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+# Column types compared for event UUIDs
+UUID_LAYOUTS = ("VARCHAR", "UUID")
+
+# Equivalent events <-> 360 positions joins, by join key
+EVENT_360_JOINS = {
+    "uuid": """
+        SELECT e.type, COUNT(*), SUM(p.location_x - e.location_x)
+        FROM events_core e
+        JOIN three_sixty_positions p ON p.event_uuid = e.id
+        GROUP BY e.type;
+    """,
+    "event_key": """
+        SELECT e.type, COUNT(*), SUM(p.location_x - e.location_x)
+        FROM events_core e
+        JOIN three_sixty_positions p ON p.event_key = e.event_key
+        GROUP BY e.type;
+    """,
+}
+
+# Equivalent aggregates through the wide events view and on the narrow tables: a
+# pass aggregate vs event_passes, and a core-column scan vs events_core
+EVENT_PARTITION_QUERIES = {
+    "wide_view": """
+        SELECT team_id, COUNT(*), SUM(pass_length), COUNT(*) FILTER (WHERE pass_cross)
+        FROM events
+        WHERE type = 'Pass'
+        GROUP BY team_id;
+    """,
+    "extension": """
+        SELECT e.team_id, COUNT(*), SUM(p.pass_length), COUNT(*) FILTER (WHERE p.pass_cross)
+        FROM event_passes p
+        JOIN events_core e ON e.event_key = p.event_key
+        WHERE e.type = 'Pass'
+        GROUP BY e.team_id;
+    """,
+    # Core-only columns: the view still LEFT JOINs every extension table
+    "core_wide_view": """
+        SELECT team_id, COUNT(*), SUM(duration), COUNT(*) FILTER (WHERE under_pressure)
+        FROM events
+        GROUP BY team_id;
+    """,
+    "events_core": """
+        SELECT team_id, COUNT(*), SUM(duration), COUNT(*) FILTER (WHERE under_pressure)
+        FROM events_core
+        GROUP BY team_id;
+    """,
+}
+
+
+def time_query(c, sql, repeat=5):
+    """Best wall-clock time in seconds over repeat runs of a fully fetched query."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        c.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_event_360_join(c, repeat=5):
+    """Time the events <-> three_sixty_positions join on UUIDs and on event keys."""
+    return {name: time_query(c, sql, repeat) for name, sql in EVENT_360_JOINS.items()}
+
+
+def benchmark_event_partitions(c, repeat=5):
+    """Time the view and narrow-table pairs of EVENT_PARTITION_QUERIES."""
+    return {name: time_query(c, sql, repeat) for name, sql in EVENT_PARTITION_QUERIES.items()}
+
+
+@contextmanager
+def _scratch_database(c, name):
+    """Attach an empty scratch database file as name; detach and delete it afterwards."""
+    with tempfile.TemporaryDirectory() as tmp:
+        c.execute(f"ATTACH '{os.path.join(tmp, name)}.duckdb' AS {name} (READ_WRITE);")
+        try:
+            yield
+        finally:
+            c.execute(f"DETACH {name};")
+
+
+def _database_bytes(c, name):
+    """Checkpointed on-disk bytes of an attached database."""
+    c.execute(f"CHECKPOINT {name};")
+    used_blocks, block_size = c.execute(
+        "SELECT used_blocks, block_size FROM pragma_database_size() WHERE database_name = ?;", [name]
+    ).fetchone()
+    return used_blocks * block_size
+
+
+def benchmark_uuid_storage(c, repeat=5):
+    """Size and join latency of event UUIDs stored as VARCHAR vs native UUID.
+
+    events.id and three_sixty_positions.event_uuid are copied into a scratch
+    database file per layout, so sizes are checkpointed on-disk bytes.
+    Returns {layout: {"bytes": ..., "join_seconds": ...}}.
+    """
+    results = {}
+    for layout in UUID_LAYOUTS:
+        with _scratch_database(c, "uuid_bench"):
+            c.execute(f"CREATE TABLE uuid_bench.events AS SELECT id::{layout} as id FROM events;")
+            c.execute(f"""
+                CREATE TABLE uuid_bench.positions AS
+                SELECT event_uuid::{layout} as event_uuid FROM three_sixty_positions;
+            """)
+            results[layout] = {
+                "bytes": _database_bytes(c, "uuid_bench"),
+                "join_seconds": time_query(c, """
+                    SELECT COUNT(*)
+                    FROM uuid_bench.events e
+                    JOIN uuid_bench.positions p ON p.event_uuid = e.id;
+                """, repeat),
+            }
+    return results
+
+
+def benchmark_enum_columns(c, columns, repeat=5):
+    """Size and GROUP BY latency of the given events columns as VARCHAR vs their ENUM types.
+
+    The columns are copied into a scratch database file per layout; the
+    timing is the total of one GROUP BY per column. Returns
+    {"VARCHAR" | "ENUM": {"bytes": ..., "group_by_seconds": ...}}.
+    """
+    results = {}
+    for layout in ("VARCHAR", "ENUM"):
+        select_list = ", ".join(
+            f'"{column}"::VARCHAR as "{column}"' if layout == "VARCHAR" else f'"{column}"'
+            for column in columns
+        )
+        with _scratch_database(c, "enum_bench"):
+            c.execute(f"CREATE TABLE enum_bench.events AS SELECT {select_list} FROM events;")
+            results[layout] = {
+                "bytes": _database_bytes(c, "enum_bench"),
+                "group_by_seconds": sum(
+                    time_query(c, f'SELECT "{column}", COUNT(*) FROM enum_bench.events GROUP BY 1;', repeat)
+                    for column in columns
+                ),
+            }
+    return results
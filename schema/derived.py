@@ -0,0 +1,591 @@
+from .utils import _clock_sql, _events_sql, _match_filter, _mmss_seconds_sql
+from .frames import load_frame_pressure, load_pass_options, load_pitch_control
+from .packed import load_three_sixty_frames_packed
+from .heatmaps import load_heatmap_tiles
+from .shots import load_shot_features
+from .transitions import load_zone_transitions
+from .xt import load_expected_threat
+
+
+# Event types that move or keep the ball, used to decide how a possession ended
+ON_BALL_TYPES = ('Pass', 'Carry', 'Dribble', 'Shot', 'Miscontrol', 'Dispossessed')
+
+
+def _sql_list(values):
+    return ", ".join(f"'{v}'" for v in values)
+
+
+# Cards that send a player off
+SENDING_OFF_CARDS = ('Red Card', 'Second Yellow')
+
+
+def load_game_state(c, match_ids=None):
+    """Write score and man-advantage before each event onto events_core.
+
+    One ordered window pass per match accumulates goals (own goals credit the
+    Own Goal For team, shootout goals are ignored) and sendings-off from
+    fouls and bad behaviour, excluding the current event, so a goal's own
+    row still shows the score it was scored at. score_diff_for_team and
+    player_count_diff are from the acting team's perspective (NULL for
+    events without a team).
+    """
+    match_filter = _match_filter(match_ids, 'e.match_id')
+    c.execute(f"""
+        UPDATE events_core
+        SET
+            home_score_before = g.home_score_before,
+            away_score_before = g.away_score_before,
+            score_diff_for_team = g.score_diff_for_team,
+            player_count_diff = g.player_count_diff
+        FROM (
+            SELECT
+                event_key,
+                home_score_before,
+                away_score_before,
+                CASE
+                    WHEN is_home THEN home_score_before - away_score_before
+                    WHEN is_away THEN away_score_before - home_score_before
+                END as score_diff_for_team,
+                CASE
+                    WHEN is_home THEN away_sent_off - home_sent_off
+                    WHEN is_away THEN home_sent_off - away_sent_off
+                END as player_count_diff
+            FROM (
+                SELECT
+                    event_key,
+                    is_home,
+                    is_away,
+                    COALESCE(SUM(home_goal) OVER w, 0) as home_score_before,
+                    COALESCE(SUM(away_goal) OVER w, 0) as away_score_before,
+                    COALESCE(SUM(home_sent_off) OVER w, 0) as home_sent_off,
+                    COALESCE(SUM(away_sent_off) OVER w, 0) as away_sent_off
+                FROM (
+                    SELECT
+                        e.event_key,
+                        e.match_id,
+                        e.index_num,
+                        e.team_id = m.home_team_id as is_home,
+                        e.team_id = m.away_team_id as is_away,
+                        (e.period < 5 AND (e.type = 'Shot' AND e.shot_outcome = 'Goal' OR e.type = 'Own Goal For'))::INTEGER as is_goal,
+                        (e.foul_committed_card IN ({_sql_list(SENDING_OFF_CARDS)})
+                         OR e.bad_behaviour_card IN ({_sql_list(SENDING_OFF_CARDS)}))::INTEGER as is_sent_off,
+                        CASE WHEN e.team_id = m.home_team_id THEN is_goal ELSE 0 END as home_goal,
+                        CASE WHEN e.team_id = m.away_team_id THEN is_goal ELSE 0 END as away_goal,
+                        CASE WHEN e.team_id = m.home_team_id THEN COALESCE(is_sent_off, 0) ELSE 0 END as home_sent_off,
+                        CASE WHEN e.team_id = m.away_team_id THEN COALESCE(is_sent_off, 0) ELSE 0 END as away_sent_off
+                    FROM {_events_sql("event_shots", "event_fouls_committed", "event_bad_behaviours")} e
+                    JOIN matches m ON e.match_id = m.match_id
+                    WHERE {match_filter}
+                )
+                WINDOW w AS (PARTITION BY match_id ORDER BY index_num ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+            )
+        ) g
+        WHERE events_core.event_key = g.event_key;
+    """)
+    return c.execute(
+        f"SELECT COUNT(*) FROM events_core e WHERE {match_filter} AND e.home_score_before IS NOT NULL"
+    ).fetchone()[0]
+
+
+def load_event_pointers(c, match_ids=None):
+    """Write prev/next event keys within each match and period onto events_core.
+
+    Computed once with LAG/LEAD over (match_id, period) and
+    (match_id, period, team_id) in index_num order, so sequence queries
+    become joins on events.event_key instead of re-sorting the events table.
+    """
+    match_filter = _match_filter(match_ids)
+    c.execute(f"""
+        UPDATE events_core
+        SET
+            prev_event_key = p.prev_event_key,
+            next_event_key = p.next_event_key,
+            next_same_team_event_key = p.next_same_team_event_key
+        FROM (
+            SELECT
+                event_key,
+                LAG(event_key) OVER (PARTITION BY match_id, period ORDER BY index_num) as prev_event_key,
+                LEAD(event_key) OVER (PARTITION BY match_id, period ORDER BY index_num) as next_event_key,
+                CASE WHEN team_id IS NOT NULL THEN
+                    LEAD(event_key) OVER (PARTITION BY match_id, period, team_id ORDER BY index_num)
+                END as next_same_team_event_key
+            FROM events_core
+            WHERE {match_filter}
+        ) p
+        WHERE events_core.event_key = p.event_key;
+    """)
+    return c.execute(
+        f"SELECT COUNT(*) FROM events_core WHERE {match_filter} AND next_event_key IS NOT NULL"
+    ).fetchone()[0]
+
+
+def load_possessions(c, match_ids=None):
+    """Build the possessions table from events in a single grouped scan.
+
+    With match_ids=None the table is rebuilt for every match; otherwise only
+    the given matches are deleted and recomputed (incremental refresh).
+    """
+    match_filter = _match_filter(match_ids)
+    c.execute(f"DELETE FROM possessions WHERE {match_filter};")
+    c.execute(f"""
+        INSERT INTO possessions
+        SELECT
+            match_id,
+            possession,
+            ANY_VALUE(possession_team_id) as team_id,
+            ANY_VALUE(possession_team) as team,
+            MIN(period) as period,
+            arg_min(play_pattern_id, index_num) as play_pattern_id,
+            arg_min(play_pattern, index_num) as play_pattern,
+
+            -- Clock
+            MIN(index_num) as start_index,
+            MAX(index_num) as end_index,
+            MIN(minute * 60 + second) as start_seconds,
+            MAX(minute * 60 + second + COALESCE(duration, 0)) as end_seconds,
+            MAX(minute * 60 + second + COALESCE(duration, 0)) - MIN(minute * 60 + second) as duration,
+
+            -- Location (possession team's located events only)
+            arg_min(location_x, index_num) FILTER (WHERE is_team_event AND location_x IS NOT NULL) as start_location_x,
+            arg_min(location_y, index_num) FILTER (WHERE is_team_event AND location_x IS NOT NULL) as start_location_y,
+            arg_max(end_x, index_num) FILTER (WHERE is_team_event AND end_x IS NOT NULL) as end_location_x,
+            arg_max(end_y, index_num) FILTER (WHERE is_team_event AND end_x IS NOT NULL) as end_location_y,
+
+            -- Aggregates
+            COUNT(*) as event_count,
+            COUNT(*) FILTER (WHERE is_team_event AND type = 'Pass') as pass_count,
+            COUNT(*) FILTER (WHERE is_team_event AND type = 'Shot') as shot_count,
+            COALESCE(arg_max(type, index_num) FILTER (WHERE is_team_event AND type IN ({_sql_list(ON_BALL_TYPES)})) = 'Shot', false) as ended_in_shot,
+            COALESCE(SUM(shot_statsbomb_xg) FILTER (WHERE is_team_event), 0) as total_xg
+        FROM (
+            SELECT
+                *,
+                team_id = possession_team_id as is_team_event,
+                COALESCE(pass_end_location_x, carry_end_location_x, location_x) as end_x,
+                CASE
+                    WHEN pass_end_location_x IS NOT NULL THEN pass_end_location_y
+                    WHEN carry_end_location_x IS NOT NULL THEN carry_end_location_y
+                    ELSE location_y
+                END as end_y
+            FROM {_events_sql("event_passes", "event_carries", "event_shots")}
+            WHERE {match_filter}
+        )
+        GROUP BY match_id, possession;
+    """)
+    return c.execute("SELECT COUNT(*) FROM possessions").fetchone()[0]
+
+
+# Goal Keeper types that are saves, mapped to keeper_save
+KEEPER_SAVE_TYPES = (
+    'Shot Saved', 'Shot Saved Off Target', 'Shot Saved to Post',
+    'Penalty Saved', 'Penalty Saved to Post', 'Save', 'Smother',
+)
+
+
+def _spadl_bodypart_sql(column):
+    return f"""CASE
+        WHEN {column} IS NULL THEN 'foot'
+        WHEN {column} = 'Head' THEN 'head'
+        WHEN {column} = 'Left Foot' THEN 'foot_left'
+        WHEN {column} = 'Right Foot' THEN 'foot_right'
+        ELSE 'other'
+    END"""
+
+
+def load_actions(c, match_ids=None):
+    """Convert events into the SPADL-style actions table in one set-based statement.
+
+    Coordinates are rescaled to a 105 x 68 metre pitch with the y axis
+    pointing up. StatsBomb already records every event from the acting
+    team's perspective, so all actions share a left-to-right direction of
+    play. Events with no SPADL equivalent (pressures, ball receipts, ...)
+    are dropped and action_id numbers the remaining actions per match.
+    """
+    match_filter = _match_filter(match_ids)
+    c.execute(f"DELETE FROM actions WHERE {match_filter};")
+    c.execute(f"""
+        INSERT INTO actions
+        WITH mapped AS (
+            SELECT
+                *,
+                CASE
+                    WHEN type = 'Pass' THEN CASE
+                        WHEN pass_type = 'Throw-in' THEN 'throw_in'
+                        WHEN pass_type = 'Free Kick' THEN CASE WHEN pass_cross OR pass_height = 'High Pass' THEN 'freekick_crossed' ELSE 'freekick_short' END
+                        WHEN pass_type = 'Corner' THEN CASE WHEN pass_cross OR pass_height = 'High Pass' THEN 'corner_crossed' ELSE 'corner_short' END
+                        WHEN pass_type = 'Goal Kick' THEN 'goalkick'
+                        WHEN pass_cross THEN 'cross'
+                        ELSE 'pass'
+                    END
+                    WHEN type = 'Carry' THEN 'dribble'
+                    WHEN type = 'Dribble' THEN 'take_on'
+                    WHEN type = 'Shot' THEN CASE
+                        WHEN shot_type = 'Penalty' THEN 'shot_penalty'
+                        WHEN shot_type = 'Free Kick' THEN 'shot_freekick'
+                        ELSE 'shot'
+                    END
+                    WHEN type = 'Duel' AND duel_type = 'Tackle' THEN 'tackle'
+                    WHEN type = 'Interception' THEN 'interception'
+                    WHEN type = 'Clearance' THEN 'clearance'
+                    WHEN type = 'Goal Keeper' THEN CASE
+                        WHEN goalkeeper_type IN ({_sql_list(KEEPER_SAVE_TYPES)}) THEN 'keeper_save'
+                        WHEN goalkeeper_type = 'Collected' THEN 'keeper_claim'
+                        WHEN goalkeeper_type = 'Punch' THEN 'keeper_punch'
+                        WHEN goalkeeper_type = 'Keeper Sweeper' AND goalkeeper_outcome = 'Claim' THEN 'keeper_pick_up'
+                        WHEN goalkeeper_type = 'Keeper Sweeper' THEN 'clearance'
+                    END
+                    WHEN type = 'Foul Committed' THEN 'foul'
+                    WHEN type IN ('Miscontrol', 'Own Goal Against') THEN 'bad_touch'
+                END as type_name
+            FROM {_events_sql(
+                "event_passes", "event_carries", "event_shots", "event_dribbles", "event_duels",
+                "event_interceptions", "event_clearances", "event_goalkeeper", "event_fouls_committed",
+            )}
+            WHERE {match_filter} AND location_x IS NOT NULL
+        )
+        SELECT
+            match_id,
+            ROW_NUMBER() OVER (PARTITION BY match_id ORDER BY period, index_num) - 1 as action_id,
+            event_key,
+            period,
+            extract(epoch FROM CAST(timestamp AS TIME)) as time_seconds,
+            team_id,
+            player_id,
+
+            -- Coordinates
+            location_x / 120 * 105 as start_x,
+            68 - location_y / 80 * 68 as start_y,
+            CASE
+                WHEN type = 'Pass' THEN pass_end_location_x
+                WHEN type = 'Carry' THEN carry_end_location_x
+                WHEN type = 'Shot' THEN shot_end_location_x
+                ELSE location_x
+            END / 120 * 105 as end_x,
+            68 - CASE
+                WHEN type = 'Pass' THEN pass_end_location_y
+                WHEN type = 'Carry' THEN carry_end_location_y
+                WHEN type = 'Shot' THEN shot_end_location_y
+                ELSE location_y
+            END / 80 * 68 as end_y,
+
+            type_name::spadl_type_enum as type_name,
+            CASE
+                WHEN type = 'Pass' THEN CASE
+                    WHEN pass_outcome IS NULL THEN 'success'
+                    WHEN pass_outcome = 'Pass Offside' THEN 'offside'
+                    ELSE 'fail'
+                END
+                WHEN type = 'Shot' THEN CASE WHEN shot_outcome = 'Goal' THEN 'success' ELSE 'fail' END
+                WHEN type = 'Dribble' THEN CASE WHEN dribble_outcome = 'Complete' THEN 'success' ELSE 'fail' END
+                WHEN type = 'Duel' THEN CASE WHEN duel_outcome IN ('Won', 'Success', 'Success In Play', 'Success Out') THEN 'success' ELSE 'fail' END
+                WHEN type = 'Interception' THEN CASE WHEN interception_outcome IN ('Lost', 'Lost In Play', 'Lost Out') THEN 'fail' ELSE 'success' END
+                WHEN type = 'Goal Keeper' THEN CASE
+                    WHEN goalkeeper_outcome IN ('In Play Danger', 'No Touch', 'Fail', 'Lost In Play', 'Lost Out', 'Touched In') THEN 'fail'
+                    ELSE 'success'
+                END
+                WHEN type = 'Foul Committed' THEN CASE
+                    WHEN foul_committed_card = 'Yellow Card' THEN 'yellow_card'
+                    WHEN foul_committed_card IN ('Second Yellow', 'Red Card') THEN 'red_card'
+                    ELSE 'fail'
+                END
+                WHEN type = 'Own Goal Against' THEN 'owngoal'
+                WHEN type = 'Miscontrol' THEN 'fail'
+                ELSE 'success'
+            END::spadl_result_enum as result_name,
+            CASE
+                WHEN type_name = 'throw_in' THEN 'other'
+                WHEN type = 'Pass' THEN {_spadl_bodypart_sql('pass_body_part')}
+                WHEN type = 'Shot' THEN {_spadl_bodypart_sql('shot_body_part')}
+                WHEN type = 'Clearance' THEN {_spadl_bodypart_sql('clearance_body_part')}
+                WHEN type = 'Goal Keeper' THEN CASE
+                    WHEN goalkeeper_body_part IS NULL OR goalkeeper_body_part LIKE '%Hand%' THEN 'other'
+                    WHEN goalkeeper_body_part = 'Head' THEN 'head'
+                    WHEN goalkeeper_body_part LIKE '%Foot%' THEN 'foot'
+                    ELSE 'other'
+                END
+                ELSE 'foot'
+            END::spadl_bodypart_enum as bodypart_name
+        FROM mapped
+        WHERE type_name IS NOT NULL;
+    """)
+    return c.execute("SELECT COUNT(*) FROM actions").fetchone()[0]
+
+
+def load_player_intervals(c, match_ids=None):
+    """Build on-pitch player intervals from lineup_positions.
+
+    Lineup times are 'MM:SS' of match time, so each bound is converted to a
+    period-major integer clock (period * 10000 + seconds) and intervals are
+    half-open [start_clock, end_clock). Final-whistle intervals end just after
+    the last event of the match. seconds_played sums the overlap with each
+    period's event span (extra time included, shootout excluded), so stoppage
+    time is counted exactly. Zero-length intervals are dropped.
+    """
+    match_filter = _match_filter(match_ids)
+    c.execute(f"DELETE FROM player_intervals WHERE {match_filter};")
+    c.execute(f"""
+        INSERT INTO player_intervals
+        WITH periods AS (
+            SELECT match_id, period, MIN(minute * 60 + second) as start_seconds, MAX(minute * 60 + second) as end_seconds
+            FROM events_core
+            WHERE {match_filter}
+            GROUP BY match_id, period
+        ),
+        match_ends AS (
+            SELECT match_id, MAX(period) as period, arg_max(end_seconds, period) as end_seconds
+            FROM periods
+            GROUP BY match_id
+        ),
+        intervals AS (
+            SELECT
+                lp.match_id,
+                lp.team_id,
+                lp.player_id,
+                lp.position_id,
+                lp.from_period as start_period,
+                {_mmss_seconds_sql('lp.from_time')} as start_seconds,
+                CASE WHEN lp.to_time IS NULL THEN me.period ELSE COALESCE(lp.to_period, lp.from_period) END as end_period,
+                CASE WHEN lp.to_time IS NULL THEN me.end_seconds ELSE {_mmss_seconds_sql('lp.to_time')} END as end_seconds,
+                lp.to_time IS NULL as to_final_whistle,
+                lp.start_reason,
+                lp.end_reason
+            FROM lineup_positions lp
+            LEFT JOIN match_ends me ON me.match_id = lp.match_id
+            WHERE {_match_filter(match_ids, 'lp.match_id')}
+        )
+        SELECT
+            i.match_id,
+            i.team_id,
+            i.player_id,
+            i.position_id,
+            i.start_period,
+            i.start_seconds,
+            i.end_period,
+            i.end_seconds,
+            {_clock_sql('i.start_period', 'i.start_seconds')} as start_clock,
+            {_clock_sql('i.end_period', 'i.end_seconds')} + CASE WHEN i.to_final_whistle THEN 1 ELSE 0 END as end_clock,
+            COALESCE(SUM(GREATEST(
+                LEAST(p.end_seconds, CASE WHEN p.period = i.end_period THEN i.end_seconds ELSE p.end_seconds END)
+                - GREATEST(p.start_seconds, CASE WHEN p.period = i.start_period THEN i.start_seconds ELSE p.start_seconds END),
+                0
+            )), 0)::INTEGER as seconds_played,
+            i.start_reason,
+            i.end_reason
+        FROM intervals i
+        LEFT JOIN periods p
+            ON p.match_id = i.match_id
+           AND p.period BETWEEN i.start_period AND i.end_period
+           AND p.period <= 4
+        WHERE i.end_period IS NULL
+           OR {_clock_sql('i.start_period', 'i.start_seconds')} < {_clock_sql('i.end_period', 'i.end_seconds')}
+           OR i.to_final_whistle
+        GROUP BY ALL;
+    """)
+    return c.execute("SELECT COUNT(*) FROM player_intervals").fetchone()[0]
+
+
+# Shot outcomes that were on target (StatsBomb spelling, compared case-sensitively)
+ON_TARGET_OUTCOMES = ('Goal', 'Saved', 'Saved to Post')
+
+
+def load_player_match_stats(c, match_ids=None):
+    """Build per-player match totals from one grouped scan of events.
+
+    Event counts are joined to playing time aggregated from player_intervals,
+    so players who came on without touching the ball still get a row and
+    per-90 rates divide by a single agreed minutes figure. Matches without
+    lineup positions have NULL playing time.
+    """
+    match_filter = _match_filter(match_ids)
+    c.execute(f"DELETE FROM player_match_stats WHERE {match_filter};")
+    c.execute(f"""
+        INSERT INTO player_match_stats
+        WITH event_totals AS (
+            SELECT
+                match_id,
+                player_id,
+                ANY_VALUE(team_id) as team_id,
+
+                -- Passing
+                COUNT(*) FILTER (WHERE type = 'Pass') as passes,
+                COUNT(*) FILTER (WHERE type = 'Pass' AND pass_outcome IS NULL) as completed_passes,
+                COUNT(*) FILTER (WHERE type = 'Pass' AND (pass_shot_assist OR pass_goal_assist)) as key_passes,
+                COUNT(*) FILTER (WHERE type = 'Pass' AND pass_goal_assist) as assists,
+
+                -- Shooting
+                -- Shots exclude the penalty shootout (period 5)
+                COUNT(*) FILTER (WHERE type = 'Shot' AND period < 5) as shots,
+                COUNT(*) FILTER (WHERE type = 'Shot' AND period < 5
+                                 AND shot_outcome IN ({_sql_list(ON_TARGET_OUTCOMES)})) as shots_on_target,
+                COUNT(*) FILTER (WHERE type = 'Shot' AND period < 5 AND shot_outcome = 'Goal') as goals,
+                COALESCE(SUM(shot_statsbomb_xg) FILTER (WHERE type = 'Shot' AND period < 5), 0) as xg,
+                COALESCE(SUM(shot_statsbomb_xg) FILTER (WHERE type = 'Shot' AND period < 5
+                                                        AND shot_type IS DISTINCT FROM 'Penalty'), 0) as np_xg,
+
+                -- Ball carrying
+                COUNT(*) FILTER (WHERE type = 'Carry') as carries,
+                COUNT(*) FILTER (WHERE type = 'Dribble') as dribbles,
+                COUNT(*) FILTER (WHERE type = 'Dribble' AND dribble_outcome = 'Complete') as completed_dribbles,
+                COUNT(*) FILTER (WHERE type = 'Dispossessed') as dispossessed,
+
+                -- Defending
+                COUNT(*) FILTER (WHERE type = 'Duel' AND duel_type = 'Tackle') as tackles,
+                COUNT(*) FILTER (WHERE type = 'Duel' AND duel_type = 'Tackle'
+                                 AND duel_outcome IN ('Won', 'Success', 'Success In Play', 'Success Out')) as tackles_won,
+                COUNT(*) FILTER (WHERE type = 'Interception') as interceptions,
+                COUNT(*) FILTER (WHERE type = 'Pressure') as pressures,
+                COUNT(*) FILTER (WHERE type = 'Ball Recovery' AND ball_recovery_failure IS NOT TRUE) as ball_recoveries,
+                COUNT(*) FILTER (WHERE type = 'Clearance') as clearances,
+                COUNT(*) FILTER (WHERE type = 'Block') as blocks,
+
+                -- Discipline
+                COUNT(*) FILTER (WHERE type = 'Foul Committed') as fouls_committed,
+                COUNT(*) FILTER (WHERE type = 'Foul Won') as fouls_won
+            FROM {_events_sql(
+                "event_passes", "event_shots", "event_dribbles", "event_duels", "event_ball_recoveries",
+            )}
+            WHERE {match_filter} AND player_id IS NOT NULL
+            GROUP BY match_id, player_id
+        ),
+        playing_time AS (
+            SELECT
+                match_id,
+                player_id,
+                ANY_VALUE(team_id) as team_id,
+                BOOL_OR(start_reason = 'Starting XI') as started,
+                SUM(seconds_played)::INTEGER as seconds_played
+            FROM player_intervals
+            WHERE {match_filter}
+            GROUP BY match_id, player_id
+        )
+        SELECT
+            COALESCE(t.match_id, e.match_id) as match_id,
+            COALESCE(t.player_id, e.player_id) as player_id,
+            COALESCE(t.team_id, e.team_id) as team_id,
+            t.started,
+            t.seconds_played,
+            t.seconds_played / 60.0 as minutes_played,
+            COALESCE(e.passes, 0),
+            COALESCE(e.completed_passes, 0),
+            COALESCE(e.key_passes, 0),
+            COALESCE(e.assists, 0),
+            COALESCE(e.shots, 0),
+            COALESCE(e.shots_on_target, 0),
+            COALESCE(e.goals, 0),
+            COALESCE(e.xg, 0),
+            COALESCE(e.np_xg, 0),
+            COALESCE(e.carries, 0),
+            COALESCE(e.dribbles, 0),
+            COALESCE(e.completed_dribbles, 0),
+            COALESCE(e.dispossessed, 0),
+            COALESCE(e.tackles, 0),
+            COALESCE(e.tackles_won, 0),
+            COALESCE(e.interceptions, 0),
+            COALESCE(e.pressures, 0),
+            COALESCE(e.ball_recoveries, 0),
+            COALESCE(e.clearances, 0),
+            COALESCE(e.blocks, 0),
+            COALESCE(e.fouls_committed, 0),
+            COALESCE(e.fouls_won, 0)
+        FROM playing_time t
+        FULL OUTER JOIN event_totals e ON t.match_id = e.match_id AND t.player_id = e.player_id;
+    """)
+    return c.execute("SELECT COUNT(*) FROM player_match_stats").fetchone()[0]
+
+
+def _pass_network_passes_sql(match_filter):
+    """Passes made before each team's first substitution or sending-off."""
+    return f"""
+        WITH windows AS (
+            SELECT
+                match_id,
+                team_id,
+                MIN(index_num) FILTER (
+                    WHERE type = 'Substitution'
+                       OR foul_committed_card IN ({_sql_list(SENDING_OFF_CARDS)})
+                       OR bad_behaviour_card IN ({_sql_list(SENDING_OFF_CARDS)})
+                ) as window_end_index
+            FROM {_events_sql("event_fouls_committed", "event_bad_behaviours")}
+            WHERE {match_filter} AND team_id IS NOT NULL
+            GROUP BY match_id, team_id
+        )
+        SELECT e.*, p.* EXCLUDE (event_key), w.window_end_index
+        FROM event_passes p
+        JOIN events_core e ON e.event_key = p.event_key
+        JOIN windows w ON e.match_id = w.match_id AND e.team_id = w.team_id
+        WHERE e.type = 'Pass'
+          AND e.player_id IS NOT NULL
+          AND (w.window_end_index IS NULL OR e.index_num < w.window_end_index)
+    """
+
+
+def load_pass_networks(c, match_ids=None):
+    """Build pass_network_nodes and pass_network_edges for every match and team.
+
+    Passes are restricted to the starting XI period, i.e. before the team's
+    first substitution or sending-off. A node's average position is taken
+    over the player's pass origins and the end locations of completed passes
+    they received. Edges count completed passes between teammates.
+    Returns the number of nodes.
+    """
+    match_filter = _match_filter(match_ids)
+    passes = _pass_network_passes_sql(match_filter)
+    c.execute(f"DELETE FROM pass_network_nodes WHERE {match_filter};")
+    c.execute(f"DELETE FROM pass_network_edges WHERE {match_filter};")
+    c.execute(f"""
+        INSERT INTO pass_network_nodes
+        WITH passes AS ({passes}),
+        touches AS (
+            SELECT match_id, team_id, window_end_index, player_id, location_x as x, location_y as y,
+                   1 as made, (pass_outcome IS NULL)::INTEGER as completed, 0 as received
+            FROM passes
+            WHERE location_x IS NOT NULL
+            UNION ALL
+            SELECT match_id, team_id, window_end_index, pass_recipient_id, pass_end_location_x, pass_end_location_y,
+                   0, 0, 1
+            FROM passes
+            WHERE pass_outcome IS NULL AND pass_recipient_id IS NOT NULL AND pass_end_location_x IS NOT NULL
+        )
+        SELECT
+            match_id,
+            team_id,
+            player_id,
+            AVG(x) as avg_x,
+            AVG(y) as avg_y,
+            SUM(made) as passes,
+            SUM(completed) as completed_passes,
+            SUM(received) as passes_received,
+            ANY_VALUE(window_end_index) as window_end_index
+        FROM touches
+        GROUP BY match_id, team_id, player_id;
+    """)
+    c.execute(f"""
+        INSERT INTO pass_network_edges
+        WITH passes AS ({passes})
+        SELECT match_id, team_id, player_id as passer_id, pass_recipient_id as recipient_id, COUNT(*) as pass_count
+        FROM passes
+        WHERE pass_outcome IS NULL AND pass_recipient_id IS NOT NULL
+        GROUP BY match_id, team_id, player_id, pass_recipient_id;
+    """)
+    return c.execute("SELECT COUNT(*) FROM pass_network_nodes").fetchone()[0]
+
+
+def refresh_derived_tables(c, match_ids):
+    """Recompute every derived table for the given (changed) matches only."""
+    load_game_state(c, match_ids)
+    load_event_pointers(c, match_ids)
+    load_possessions(c, match_ids)
+    load_actions(c, match_ids)
+    load_pass_networks(c, match_ids)
+    load_shot_features(c, match_ids)
+    load_player_intervals(c, match_ids)
+    load_player_match_stats(c, match_ids)
+    # xT grids are cached per competition/season; only stale ones recompute
+    load_expected_threat(c)
+    load_heatmap_tiles(c, match_ids)
+    load_zone_transitions(c, match_ids)
+    load_three_sixty_frames_packed(c, match_ids)
+    load_frame_pressure(c, match_ids)
+    # Pitch control is cached per frame; a full refresh only fills missing frames
+    load_pitch_control(c, match_ids)
+    load_pass_options(c, match_ids)
@@ -0,0 +1,61 @@
+"""Data-driven ENUM types for low-cardinality events columns.
+
+Before the events table is created, the staged events are measured: each
+categorical column in EVENT_ENUM_COLUMNS with at most ENUM_MAX_CARDINALITY
+distinct values gets a <column>_enum type built from the values seen, and
+make_events declares the column with it. Free-text columns such as player
+and team names are never candidates, however few values a build has. The
+hand-written ENUMs in _create_enum_types are left as they are.
+"""
+from .loaders import _events_select_sql, stage_events
+from .tables import EVENT_ENUM_COLUMNS
+from .utils import _get_player_name_case
+
+
+# Columns with more distinct values than this stay TEXT (255 keeps ENUMs at one byte)
+ENUM_MAX_CARDINALITY = 255
+
+
+def _sql_string(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def infer_event_enums(c, max_cardinality=ENUM_MAX_CARDINALITY):
+    """Create ENUM types for the low-cardinality EVENT_ENUM_COLUMNS.
+
+    Stages the events if needed and returns {column: enum type name} for
+    make_events. Columns with no non-NULL values stay TEXT.
+    """
+    stage_events(c)
+    select_sql = _events_select_sql(_get_player_name_case())
+    text_columns = [
+        name for name, column_type, *_ in c.execute(f"DESCRIBE {select_sql}").fetchall()
+        if name in EVENT_ENUM_COLUMNS and column_type == "VARCHAR"
+    ]
+    if not text_columns:
+        return {}
+
+    counts = c.execute(
+        "SELECT " + ", ".join(f'COUNT(DISTINCT "{name}")' for name in text_columns)
+        + f" FROM ({select_sql});"
+    ).fetchone()
+    columns = [name for name, count in zip(text_columns, counts) if 0 < count <= max_cardinality]
+    if not columns:
+        return {}
+
+    values = c.execute(
+        "SELECT " + ", ".join(
+            f'list(DISTINCT "{name}" ORDER BY "{name}") FILTER (WHERE "{name}" IS NOT NULL)'
+            for name in columns
+        ) + f" FROM ({select_sql});"
+    ).fetchone()
+
+    enum_columns = {}
+    for name, column_values in zip(columns, values):
+        type_name = f"{name}_enum"
+        c.execute(f"""
+            DROP TYPE IF EXISTS {type_name};
+            CREATE TYPE {type_name} AS ENUM ({", ".join(_sql_string(v) for v in column_values)});
+        """)
+        enum_columns[name] = type_name
+    return enum_columns
@@ -0,0 +1,434 @@
+"""Batch engines over 360 freeze frames.
+
+Frames are processed a match at a time: the match's positions are fetched
+once from three_sixty_frames_packed, padded into (frames, players) NumPy
+arrays and every metric is computed with broadcasting. Matches are spread
+over a process pool; only the main process touches the database.
+"""
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .packed import fetch_packed_positions
+from .utils import PITCH_LENGTH, PITCH_LENGTH_M, PITCH_WIDTH, PITCH_WIDTH_M, _match_filter
+from .zones import ZONE_GRIDS
+
+
+# Matches handed to the pool per round trip (bounds memory on the full corpus)
+FRAME_BATCH_MATCHES = 64
+
+# Pressure radii in metres
+PRESSURE_RADII = (5.0, 10.0)
+
+# An opponent within this many metres of the passer -> teammate segment closes the lane
+PASS_LANE_CLEARANCE = 2.0
+
+# Frames per broadcast chunk in the pitch-control engine (bounds the
+# (frames, sample points, players) distance array)
+PITCH_CONTROL_CHUNK_FRAMES = 16
+
+
+def _fetch_match_positions(c, match_id):
+    """All 360 positions of one match as NumPy arrays, grouped by frame."""
+    return fetch_packed_positions(c, match_id)
+
+
+def _fetch_match_frames(c, match_id):
+    """Positions plus each frame's visible area polygon for one match."""
+    positions = _fetch_match_positions(c, match_id)
+    positions["visible_area"] = dict(c.execute(
+        "SELECT event_key, visible_area FROM three_sixty_frames WHERE match_id = ?;", [match_id]
+    ).fetchall())
+    return positions
+
+
+def _fetch_match_passes(c, match_id):
+    """360 positions of one match's passes, with the passer's event location."""
+    positions = _fetch_match_positions(c, match_id)
+    passes = c.execute("""
+        SELECT event_key, location_x, location_y
+        FROM events_core
+        WHERE match_id = ? AND type = 'Pass' AND location_x IS NOT NULL
+        ORDER BY event_key;
+    """, [match_id]).fetchnumpy()
+    pass_keys = np.asarray(passes["event_key"], dtype=np.int64)
+    is_pass = np.isin(positions["event_key"], pass_keys)
+    positions = {
+        name: values[is_pass] if isinstance(values, np.ndarray) else values
+        for name, values in positions.items()
+    }
+    passer = np.searchsorted(pass_keys, positions["event_key"])
+    positions["passer_x"] = np.asarray(passes["location_x"], dtype=np.float64)[passer]
+    positions["passer_y"] = np.asarray(passes["location_y"], dtype=np.float64)[passer]
+    return positions
+
+
+def pad_frames(positions):
+    """Pad frame-sorted positions into (frames, players) arrays.
+
+    Returns (event_keys, xy, teammate, actor, keeper, valid) where xy is a
+    (frames, players, 2) array in metres (105 x 68 pitch) and the masks are
+    (frames, players) booleans; valid marks real (non-padding) slots.
+    """
+    keys = np.asarray(positions["event_key"], dtype=np.int64)
+    event_keys, starts, frame_index = np.unique(keys, return_index=True, return_inverse=True)
+    n_frames = len(event_keys)
+    slot = np.arange(len(keys)) - starts[frame_index]
+    n_players = int(slot.max()) + 1 if len(slot) else 0
+
+    xy = np.full((n_frames, n_players, 2), np.nan)
+    xy[frame_index, slot, 0] = np.asarray(positions["location_x"], dtype=np.float64) * (PITCH_LENGTH_M / PITCH_LENGTH)
+    xy[frame_index, slot, 1] = np.asarray(positions["location_y"], dtype=np.float64) * (PITCH_WIDTH_M / PITCH_WIDTH)
+
+    masks = []
+    for name in ("teammate", "actor", "keeper"):
+        mask = np.zeros((n_frames, n_players), dtype=bool)
+        mask[frame_index, slot] = np.asarray(positions[name], dtype=bool)
+        masks.append(mask)
+    valid = np.zeros((n_frames, n_players), dtype=bool)
+    valid[frame_index, slot] = True
+    return (event_keys, xy, *masks, valid)
+
+
+def load_packed_frame_arrays(c, match_id):
+    """A match's packed frames as padded (frames, players) arrays; see pad_frames."""
+    return pad_frames(fetch_packed_positions(c, match_id))
+
+
+def _actor_xy(xy, actor):
+    """(frames, 2) actor locations (NaN for frames without a visible actor)."""
+    has_actor = actor.any(axis=1)
+    actor_xy = xy[np.arange(len(xy)), actor.argmax(axis=1)] if len(xy) else np.empty((0, 2))
+    actor_xy[~has_actor] = np.nan
+    return actor_xy
+
+
+def frame_pressure_metrics(xy, teammate, actor, valid, radii=PRESSURE_RADII):
+    """Distances from each frame's actor to the surrounding players.
+
+    Returns a dict of per-frame arrays: nearest_opponent_distance,
+    nearest_teammate_distance and one opponents_within_<r>m count per
+    radius. Frames without an actor get NaN throughout.
+    """
+    actor_xy = _actor_xy(xy, actor)
+    has_actor = ~np.isnan(actor_xy[:, 0])
+    distance = np.linalg.norm(xy - actor_xy[:, None, :], axis=2)
+
+    opponent = valid & ~teammate
+    mate = valid & teammate & ~actor
+    nearest_opponent = np.where(opponent, distance, np.inf).min(axis=1, initial=np.inf)
+    nearest_teammate = np.where(mate, distance, np.inf).min(axis=1, initial=np.inf)
+
+    metrics = {
+        "nearest_opponent_distance": np.where(np.isfinite(nearest_opponent), nearest_opponent, np.nan),
+        "nearest_teammate_distance": np.where(np.isfinite(nearest_teammate), nearest_teammate, np.nan),
+    }
+    for radius in radii:
+        count = (opponent & (distance <= radius)).sum(axis=1).astype(np.float64)
+        metrics[f"opponents_within_{radius:g}m"] = np.where(has_actor, count, np.nan)
+    return metrics
+
+
+def _frame_pressure_worker(positions):
+    event_keys, xy, teammate, actor, _, valid = pad_frames(positions)
+    result = {"event_key": event_keys, "match_id": np.full(len(event_keys), positions["match_id"])}
+    result.update(frame_pressure_metrics(xy, teammate, actor, valid))
+    return result
+
+
+def _run_frame_engine(c, table, columns, worker, matches, workers=None, fetch=_fetch_match_positions,
+                      group_by=None):
+    """Run a per-match frame worker over the given matches and insert its rows.
+
+    worker maps one match's fetched frames to a dict of equal-length flat
+    NumPy arrays; columns is the table's select list over that dict (casts
+    allowed), aggregated by group_by when given.
+    Callers clear any rows being replaced first. With workers=1 everything
+    runs in-process. Pool workers are spawned rather than forked, since the
+    parent's DuckDB connection already runs threads a fork would copy
+    mid-flight; they only ever receive the fetched NumPy arrays. Returns
+    the table row count.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    executor = None
+    if workers > 1 and len(matches) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        for start in range(0, len(matches), FRAME_BATCH_MATCHES):
+            batch = [fetch(c, m) for m in matches[start:start + FRAME_BATCH_MATCHES]]
+            results = executor.map(worker, batch) if executor else map(worker, batch)
+            for result in results:
+                if len(result["event_key"]) == 0:
+                    continue
+                c.register("frame_engine_result", result)
+                grouping = f" GROUP BY {group_by}" if group_by else ""
+                c.execute(f"INSERT INTO {table} SELECT {columns} FROM frame_engine_result{grouping};")
+                c.unregister("frame_engine_result")
+    finally:
+        if executor:
+            executor.shutdown()
+    return c.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def load_frame_pressure(c, match_ids=None, workers=None):
+    """Build frame_pressure for every 360 frame, one match per task."""
+    match_filter = _match_filter(match_ids)
+    c.execute(f"DELETE FROM frame_pressure WHERE {match_filter};")
+    matches = [row[0] for row in c.execute(
+        f"SELECT DISTINCT match_id FROM three_sixty_frames WHERE {match_filter} ORDER BY match_id;"
+    ).fetchall()]
+    return _run_frame_engine(
+        c, "frame_pressure",
+        """
+            event_key,
+            match_id,
+            nearest_opponent_distance,
+            "opponents_within_5m"::INTEGER,
+            "opponents_within_10m"::INTEGER,
+            nearest_teammate_distance
+        """,
+        _frame_pressure_worker, matches, workers,
+    )
+
+
+def pad_polygons(polygons):
+    """Pad flat [x1, y1, x2, y2, ...] yard polygons into a (frames, vertices, 2) array.
+
+    Coordinates are converted to metres and every ring is closed and padded
+    by repeating its last vertex (a zero-length edge). Missing polygons are
+    all-NaN rows.
+    """
+    rings = []
+    for polygon in polygons:
+        if polygon is None or len(polygon) < 6:
+            rings.append(None)
+            continue
+        ring = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+        if not np.array_equal(ring[0], ring[-1]):
+            ring = np.vstack([ring, ring[:1]])
+        rings.append(ring)
+    n_vertices = max((len(ring) for ring in rings if ring is not None), default=1)
+
+    padded = np.full((len(rings), n_vertices, 2), np.nan)
+    for i, ring in enumerate(rings):
+        if ring is not None:
+            padded[i, :len(ring)] = ring
+            padded[i, len(ring):] = ring[-1]
+    padded[..., 0] *= PITCH_LENGTH_M / PITCH_LENGTH
+    padded[..., 1] *= PITCH_WIDTH_M / PITCH_WIDTH
+    return padded
+
+
+def _sample_points(cell_size):
+    """Cell centres of a cell_size-metre lattice over the pitch, and the cell area."""
+    n_x = max(1, round(PITCH_LENGTH_M / cell_size))
+    n_y = max(1, round(PITCH_WIDTH_M / cell_size))
+    xs = (np.arange(n_x) + 0.5) * (PITCH_LENGTH_M / n_x)
+    ys = (np.arange(n_y) + 0.5) * (PITCH_WIDTH_M / n_y)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    points = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+    return points, (PITCH_LENGTH_M / n_x) * (PITCH_WIDTH_M / n_y)
+
+
+def _points_in_polygons(points, polygons):
+    """(frames, points) even-odd test of every sample point against every frame's polygon.
+
+    Frames with a missing (all-NaN) polygon count the whole pitch as visible.
+    """
+    a, b = polygons[:, None, :-1, :], polygons[:, None, 1:, :]
+    px, py = points[None, :, None, 0], points[None, :, None, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        straddles = (a[..., 1] > py) != (b[..., 1] > py)
+        x_cross = a[..., 0] + (py - a[..., 1]) * (b[..., 0] - a[..., 0]) / (b[..., 1] - a[..., 1])
+        inside = (straddles & (px < x_cross)).sum(axis=2) % 2 == 1
+    inside[np.isnan(polygons[:, 0, 0])] = True
+    return inside
+
+
+def pitch_control_areas(xy, teammate, valid, polygons, grid=ZONE_GRIDS["lanes"][0], cell_size=1.0):
+    """Discrete Voronoi control of each frame's visible area, per team and zone.
+
+    The pitch is sampled on a cell_size-metre lattice; every sample point
+    inside the frame's visible polygon is owned by its nearest player.
+    "Team" is the teammate side of the 360 frame (the acting team). grid is
+    (cols, rows) using the zone_grids row-major layout. Returns a dict of
+    per-frame visible_area, team_area and opponent_area (m^2) plus
+    (frames, zones) team_zone_area and opponent_zone_area arrays.
+    """
+    cols, rows = grid
+    points, cell_area = _sample_points(cell_size)
+    zone = (
+        np.minimum((points[:, 1] * rows / PITCH_WIDTH_M).astype(int), rows - 1) * cols
+        + np.minimum((points[:, 0] * cols / PITCH_LENGTH_M).astype(int), cols - 1)
+    )
+    sample = points.astype(np.float32)
+    n_frames, n_zones = len(xy), cols * rows
+    team_zone = np.zeros((n_frames, n_zones))
+    opponent_zone = np.zeros((n_frames, n_zones))
+
+    for start in range(0, n_frames, PITCH_CONTROL_CHUNK_FRAMES):
+        chunk = slice(start, start + PITCH_CONTROL_CHUNK_FRAMES)
+        inside = _points_in_polygons(points, polygons[chunk])
+        players = np.where(valid[chunk, :, None], xy[chunk], np.inf).astype(np.float32)
+        distance = (
+            (sample[None, :, None, 0] - players[:, None, :, 0]) ** 2
+            + (sample[None, :, None, 1] - players[:, None, :, 1]) ** 2
+        )
+        owner = distance.argmin(axis=2)
+        team = np.take_along_axis(teammate[chunk], owner, axis=1)
+        inside &= valid[chunk].any(axis=1)[:, None]
+
+        n_chunk = len(inside)
+        bins = (np.arange(n_chunk)[:, None] * n_zones + zone[None, :]).ravel()
+        size = n_chunk * n_zones
+        team_zone[chunk] = np.bincount(bins, (inside & team).ravel(), size).reshape(n_chunk, n_zones)
+        opponent_zone[chunk] = np.bincount(bins, (inside & ~team).ravel(), size).reshape(n_chunk, n_zones)
+
+    team_zone *= cell_area
+    opponent_zone *= cell_area
+    return {
+        "visible_area": team_zone.sum(axis=1) + opponent_zone.sum(axis=1),
+        "team_area": team_zone.sum(axis=1),
+        "opponent_area": opponent_zone.sum(axis=1),
+        "team_zone_area": team_zone,
+        "opponent_zone_area": opponent_zone,
+    }
+
+
+def _pitch_control_worker(frames, grid_name, cell_size):
+    """Long-format pitch control rows: one per frame and zone, as flat NumPy columns."""
+    event_keys, xy, teammate, _, _, valid = pad_frames(frames)
+    visible = frames["visible_area"]
+    polygons = pad_polygons([
+        json.loads(visible[key]) if visible.get(key) else None for key in event_keys
+    ])
+    areas = pitch_control_areas(xy, teammate, valid, polygons, ZONE_GRIDS[grid_name][0], cell_size)
+    n_frames, n_zones = areas["team_zone_area"].shape
+    return {
+        "event_key": np.repeat(event_keys, n_zones),
+        "match_id": np.full(n_frames * n_zones, frames["match_id"]),
+        "cell_size": np.full(n_frames * n_zones, cell_size),
+        "zone": np.tile(np.arange(n_zones), n_frames),
+        "team_area": areas["team_zone_area"].ravel(),
+        "opponent_area": areas["opponent_zone_area"].ravel(),
+    }
+
+
+def load_pitch_control(c, match_ids=None, grid_name="lanes", cell_size=1.0, workers=None):
+    """Build frame_pitch_control rows for one zone grid.
+
+    Results are cached per (frame, grid, cell size), so several cell sizes
+    can be kept side by side: with match_ids=None only matches holding
+    frames without a row at this grid and cell size are computed (a partly
+    cached match is recomputed whole); passing match_ids forces those
+    matches to be recomputed. Returns the table row count.
+    """
+    if grid_name not in ZONE_GRIDS:
+        raise ValueError(f"Unknown zone grid {grid_name!r}; expected one of {sorted(ZONE_GRIDS)}")
+    match_filter = _match_filter(match_ids, "f.match_id")
+    if match_ids is None:
+        match_filter = "p.event_key IS NULL"
+    matches = [row[0] for row in c.execute(f"""
+        SELECT DISTINCT f.match_id
+        FROM three_sixty_frames f
+        LEFT JOIN frame_pitch_control p
+            ON p.event_key = f.event_key AND p.grid_name = ? AND p.cell_size = ?
+        WHERE {match_filter}
+        ORDER BY f.match_id;
+    """, [grid_name, cell_size]).fetchall()]
+    c.execute(
+        f"DELETE FROM frame_pitch_control WHERE grid_name = ? AND cell_size = ? AND {_match_filter(matches)};",
+        [grid_name, cell_size],
+    )
+    # The worker returns one row per frame and zone; the zone arrays and
+    # frame totals are assembled here (grid_name is checked above)
+    return _run_frame_engine(
+        c, "frame_pitch_control",
+        f"""
+            event_key,
+            match_id,
+            '{grid_name}' as grid_name,
+            cell_size,
+            SUM(team_area + opponent_area)::REAL as visible_area,
+            SUM(team_area)::REAL as team_area,
+            SUM(opponent_area)::REAL as opponent_area,
+            list(team_area::REAL ORDER BY zone) as team_zone_area,
+            list(opponent_area::REAL ORDER BY zone) as opponent_zone_area
+        """,
+        partial(_pitch_control_worker, grid_name=grid_name, cell_size=cell_size),
+        matches, workers, fetch=_fetch_match_frames, group_by="event_key, match_id, cell_size",
+    )
+
+
+def pass_lane_metrics(xy, teammate, actor, valid, passer_xy, clearance=PASS_LANE_CLEARANCE):
+    """Open passing lanes from each frame's passer to its visible teammates.
+
+    A lane is open when no visible opponent lies within clearance metres of
+    the passer -> teammate segment. passer_xy is (frames, 2) in metres.
+    Returns a dict of per-frame visible_teammates, open_teammates and
+    open_forward_teammates (open lanes to teammates ahead of the passer).
+    """
+    mate = valid & teammate & ~actor
+    opponent = valid & ~teammate
+
+    # Every player relative to the passer: lane vectors for teammates, offsets for opponents
+    lane = xy - passer_xy[:, None, :]
+    length_sq = (lane ** 2).sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # (frames, teammate, opponent) projection of each opponent onto each lane
+        t = np.einsum("ftd,fod->fto", lane, lane) / length_sq[:, :, None]
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    closest = passer_xy[:, None, None, :] + t[..., None] * lane[:, :, None, :]
+    distance = np.linalg.norm(closest - xy[:, None, :, :], axis=3)
+
+    blocked = (opponent[:, None, :] & (distance <= clearance)).any(axis=2)
+    open_lane = mate & ~blocked
+    forward = lane[:, :, 0] > 0
+    return {
+        "visible_teammates": mate.sum(axis=1),
+        "open_teammates": open_lane.sum(axis=1),
+        "open_forward_teammates": (open_lane & forward).sum(axis=1),
+    }
+
+
+def _pass_options_worker(positions, clearance):
+    event_keys, xy, teammate, actor, _, valid = pad_frames(positions)
+    _, starts = np.unique(np.asarray(positions["event_key"], dtype=np.int64), return_index=True)
+    passer_xy = np.column_stack([
+        np.asarray(positions["passer_x"], dtype=np.float64)[starts] * (PITCH_LENGTH_M / PITCH_LENGTH),
+        np.asarray(positions["passer_y"], dtype=np.float64)[starts] * (PITCH_WIDTH_M / PITCH_WIDTH),
+    ]) if len(starts) else np.empty((0, 2))
+    result = {
+        "event_key": event_keys,
+        "match_id": np.full(len(event_keys), positions["match_id"]),
+        "lane_clearance": np.full(len(event_keys), clearance),
+    }
+    result.update(pass_lane_metrics(xy, teammate, actor, valid, passer_xy, clearance))
+    return result
+
+
+def load_pass_options(c, match_ids=None, clearance=PASS_LANE_CLEARANCE, workers=None):
+    """Build pass_options for every located pass with a 360 frame."""
+    match_filter = _match_filter(match_ids)
+    c.execute(f"DELETE FROM pass_options WHERE {match_filter};")
+    matches = [row[0] for row in c.execute(
+        f"SELECT DISTINCT match_id FROM three_sixty_frames WHERE {match_filter} ORDER BY match_id;"
+    ).fetchall()]
+    return _run_frame_engine(
+        c, "pass_options",
+        """
+            event_key,
+            match_id,
+            lane_clearance,
+            visible_teammates::INTEGER,
+            open_teammates::INTEGER,
+            open_forward_teammates::INTEGER
+        """,
+        partial(_pass_options_worker, clearance=clearance),
+        matches, workers, fetch=_fetch_match_passes,
+    )
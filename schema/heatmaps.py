@@ -0,0 +1,81 @@
+"""Precomputed heatmap tiles: event counts per zone at every zone grid.
+
+Tiles are built from the integer zone columns on events, so every
+resolution comes from the same grouped scan.
+"""
+import numpy as np
+
+from .utils import _affected_seasons_sql
+from .zones import ZONE_GRIDS, zone_column
+
+
+def load_heatmap_tiles(c, match_ids=None):
+    """Build heatmap_tiles for every player and team.
+
+    Counts of located events per zone are taken with one histogram per zone
+    grid over GROUPING SETS for players and teams, then expanded to dense
+    row-major arrays. Tiles cover a whole competition/season, so with
+    match_ids only the seasons containing those matches are rebuilt.
+    """
+    seasons = _affected_seasons_sql(match_ids)
+    c.execute(f"""
+        DELETE FROM heatmap_tiles h
+        USING ({seasons}) s
+        WHERE h.competition_id = s.competition_id AND h.season_id = s.season_id;
+    """)
+
+    histograms = ",\n                ".join(
+        f"histogram({zone_column('location', name)}) as h_{i}"
+        for i, name in enumerate(ZONE_GRIDS)
+    )
+    tiles = "\n            UNION ALL\n".join(
+        f"""
+            SELECT
+                entity_type, entity_id, competition_id, season_id, event_type,
+                '{name}' as grid_name,
+                list_transform(range({cols * rows}), i -> COALESCE(h_{i}[i::SMALLINT], 0))::INTEGER[] as counts,
+                event_count as total
+            FROM zone_counts"""
+        for i, (name, ((cols, rows), _)) in enumerate(ZONE_GRIDS.items())
+    )
+    c.execute(f"""
+        INSERT INTO heatmap_tiles
+        WITH zone_counts AS (
+            SELECT
+                CASE WHEN GROUPING(e.player_id) = 0 THEN 'player' ELSE 'team' END as entity_type,
+                CASE WHEN GROUPING(e.player_id) = 0 THEN e.player_id ELSE e.team_id END as entity_id,
+                m.competition_id,
+                m.season_id,
+                e.type as event_type,
+                COUNT(*) as event_count,
+                {histograms}
+            FROM events_core e
+            JOIN matches m ON e.match_id = m.match_id
+            JOIN ({seasons}) s ON m.competition_id = s.competition_id AND m.season_id = s.season_id
+            WHERE e.location_x IS NOT NULL
+            GROUP BY GROUPING SETS (
+                (e.player_id, m.competition_id, m.season_id, e.type),
+                (e.team_id, m.competition_id, m.season_id, e.type)
+            )
+        )
+        SELECT * FROM ({tiles}
+        )
+        WHERE entity_id IS NOT NULL;
+    """)
+    return c.execute("SELECT COUNT(*) FROM heatmap_tiles").fetchone()[0]
+
+
+def get_heatmap(c, entity_type, entity_id, competition_id, season_id, event_type, grid_name="12x8"):
+    """Return a heatmap tile as a (rows, cols) count array, or None if absent."""
+    (cols, rows), _ = ZONE_GRIDS[grid_name]
+    row = c.execute(
+        """
+        SELECT counts FROM heatmap_tiles
+        WHERE entity_type = ? AND entity_id = ? AND competition_id = ? AND season_id = ?
+          AND event_type = ? AND grid_name = ?;
+        """,
+        [entity_type, entity_id, competition_id, season_id, event_type, grid_name],
+    ).fetchone()
+    if row is None:
+        return None
+    return np.asarray(row[0], dtype=np.int64).reshape(rows, cols)
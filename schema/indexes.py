@@ -2,19 +2,29 @@ def create_indexes(c):
     """Create indexes for improved query performance."""
     indexes = [
         # Core event indexes (single-column)
-        "CREATE INDEX IF NOT EXISTS idx_events_match ON events(match_id);",
-        "CREATE INDEX IF NOT EXISTS idx_events_player ON events(player_id);",
-        "CREATE INDEX IF NOT EXISTS idx_events_type ON events(type_id);",
-        "CREATE INDEX IF NOT EXISTS idx_events_team ON events(team_id);",
-        "CREATE INDEX IF NOT EXISTS idx_events_possession ON events(possession_team_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_match ON events_core(match_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_player ON events_core(player_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_type ON events_core(type_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_team ON events_core(team_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_possession ON events_core(possession_team_id);",
         
         # Composite indexes for common query patterns
-        "CREATE INDEX IF NOT EXISTS idx_events_match_type ON events(match_id, type_id);",
-        "CREATE INDEX IF NOT EXISTS idx_events_match_player ON events(match_id, player_id);",
-        "CREATE INDEX IF NOT EXISTS idx_events_player_type ON events(player_id, type_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_match_type ON events_core(match_id, type_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_match_player ON events_core(match_id, player_id);",
+        "CREATE INDEX IF NOT EXISTS idx_events_player_type ON events_core(player_id, type_id);",
         
-        # Index for shot outcome queries (covers filtering by type + outcome)
-        "CREATE INDEX IF NOT EXISTS idx_events_type_shot_outcome ON events(type_id, shot_outcome);",
+        # Index for shot outcome queries (shot_outcome lives on the shot extension table)
+        "CREATE INDEX IF NOT EXISTS idx_event_shots_outcome ON event_shots(shot_outcome);",
+        
+        # Event relation indexes (the primary key covers event_key lookups)
+        "CREATE INDEX IF NOT EXISTS idx_event_relations_related ON event_relations(related_key);",
+        "CREATE INDEX IF NOT EXISTS idx_event_relations_match ON event_relations(match_id);",
+        
+        # Derived table indexes (primary keys cover match_id lookups)
+        "CREATE INDEX IF NOT EXISTS idx_possessions_team ON possessions(team_id);",
+        "CREATE INDEX IF NOT EXISTS idx_actions_player ON actions(player_id);",
+        "CREATE INDEX IF NOT EXISTS idx_action_xt_match ON action_xt(match_id);",
+        "CREATE INDEX IF NOT EXISTS idx_action_xt_player ON action_xt(player_id);",
         
         # Match indexes
         "CREATE INDEX IF NOT EXISTS idx_matches_competition ON matches(competition_id, season_id);",
@@ -22,6 +32,10 @@ def create_indexes(c):
         "CREATE INDEX IF NOT EXISTS idx_matches_away_team ON matches(away_team_id);",
         "CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(match_date);",
         
+        # Manager indexes
+        "CREATE INDEX IF NOT EXISTS idx_match_managers_manager ON match_managers(manager_id);",
+        "CREATE INDEX IF NOT EXISTS idx_match_managers_match ON match_managers(match_id);",
+        
         # Lineup indexes
         "CREATE INDEX IF NOT EXISTS idx_lineup_players_player ON lineup_players(player_id);",
         "CREATE INDEX IF NOT EXISTS idx_lineup_players_match ON lineup_players(match_id);",
@@ -29,10 +43,13 @@ def create_indexes(c):
         "CREATE INDEX IF NOT EXISTS idx_lineup_positions_match ON lineup_positions(match_id);",
         "CREATE INDEX IF NOT EXISTS idx_lineup_cards_player ON lineup_cards(player_id);",
         "CREATE INDEX IF NOT EXISTS idx_lineup_cards_match ON lineup_cards(match_id);",
+        "CREATE INDEX IF NOT EXISTS idx_player_intervals_match ON player_intervals(match_id);",
+        "CREATE INDEX IF NOT EXISTS idx_player_intervals_player ON player_intervals(player_id);",
+        "CREATE INDEX IF NOT EXISTS idx_player_match_stats_player ON player_match_stats(player_id);",
         
         # 360 data indexes
         "CREATE INDEX IF NOT EXISTS idx_360_frames_match ON three_sixty_frames(match_id);",
-        "CREATE INDEX IF NOT EXISTS idx_360_positions_event ON three_sixty_positions(event_uuid);",
+        "CREATE INDEX IF NOT EXISTS idx_360_positions_event ON three_sixty_positions(event_key);",
     ]
 
     for index_sql in indexes:
@@ -1,7 +1,9 @@
 import glob
 import json
 
-from .utils import _get_player_name_case
+from .tables import EVENT_EXTENSIONS
+from .utils import EVENT_KEY_FACTOR, _event_key_sql, _get_player_name_case
+from .zones import _zone_columns_sql
 
 
 def _get_valid_json_files(pattern):
@@ -61,7 +63,16 @@ def load_teams(c):
 
 
 def load_matches(c):
-    """Load match data."""
+    """Load match data along with the managers dimension and bridge tables.
+
+    Uses a staging table so the match JSON files are scanned once for both
+    the matches table and the manager tables.
+    """
+    c.execute("""
+        CREATE TEMP TABLE staging_matches AS
+        SELECT * FROM read_json_auto('./open-data/data/matches/**/*.json', format='array');
+    """)
+
     c.execute("""
         INSERT INTO matches
         SELECT 
@@ -99,11 +110,71 @@ def load_matches(c):
             metadata.data_version as data_version,
             metadata.shot_fidelity_version as shot_fidelity_version,
             metadata.xy_fidelity_version as xy_fidelity_version
-        FROM read_json_auto('./open-data/data/matches/**/*.json', format='array');
+        FROM staging_matches;
     """)
+
+    _load_managers_from_staging(c)
+
+    # Drop staging table to free memory
+    c.execute("DROP TABLE IF EXISTS staging_matches;")
+
     return c.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
 
 
+def _load_managers_from_staging(c):
+    """Load managers and match_managers from the staging_matches table.
+
+    Each match side carries a list of managers; these are unnested once into
+    a temporary table that feeds both the dimension and the bridge table.
+    """
+    # Round-trip through JSON with an explicit structure: the inferred type of
+    # the managers field differs between files where it is always absent
+    manager_structure = """[{
+        "id": "INTEGER", "name": "VARCHAR", "nickname": "VARCHAR", "dob": "VARCHAR",
+        "country": {"id": "INTEGER", "name": "VARCHAR"}
+    }]"""
+    c.execute(f"""
+        CREATE TEMP TABLE staging_match_managers AS
+        SELECT match_id, team_id, is_home, UNNEST(json_transform(managers, '{manager_structure}')) as manager
+        FROM (
+            SELECT match_id, home_team.home_team_id as team_id, true as is_home, json(home_team.managers) as managers
+            FROM staging_matches
+            UNION ALL
+            SELECT match_id, away_team.away_team_id as team_id, false as is_home, json(away_team.managers) as managers
+            FROM staging_matches
+        )
+        WHERE managers IS NOT NULL;
+    """)
+
+    # A manager can appear in many match files; keep one row per id
+    c.execute("""
+        INSERT INTO managers
+        SELECT
+            manager.id,
+            MAX(manager.name) as name,
+            MAX(manager.nickname) as nickname,
+            MAX(manager.dob) as dob,
+            MAX(manager.country.id) as country_id,
+            MAX(manager.country.name) as country_name
+        FROM staging_match_managers
+        WHERE manager.id IS NOT NULL
+        GROUP BY manager.id;
+    """)
+
+    c.execute("""
+        INSERT INTO match_managers
+        SELECT DISTINCT
+            match_id,
+            team_id,
+            manager.id as manager_id,
+            is_home
+        FROM staging_match_managers
+        WHERE manager.id IS NOT NULL;
+    """)
+
+    c.execute("DROP TABLE IF EXISTS staging_match_managers;")
+
+
 def _load_reference_tables_from_staging(c, case_stmt):
     """Load all reference tables from staging_events table in a single pass.
 
@@ -294,29 +365,36 @@ def load_countries(c):
     return c.execute("SELECT COUNT(*) FROM countries").fetchone()[0]
 
 
-def load_events(c):
-    """Load events with comprehensive field extraction for all event types.
+# Staging expression for an event's match id (from its file name)
+EVENT_MATCH_ID_SQL = "CAST(regexp_extract(filename, '([0-9]+)\\.json$', 1) AS INTEGER)"
 
-    Optimized to use a staging table approach: loads JSON once into staging_events,
-    then extracts reference tables and transforms events from the staging table.
-    This avoids multiple scans of the JSON files.
-    """
-    case_stmt = _get_player_name_case()
+# Staging expressions for each zoned location field
+EVENT_ZONE_SOURCES = {
+    "location": ("location[1]::DOUBLE", "location[2]::DOUBLE"),
+    "pass_end": ("pass.end_location[1]::DOUBLE", "pass.end_location[2]::DOUBLE"),
+    "carry_end": ("carry.end_location[1]::DOUBLE", "carry.end_location[2]::DOUBLE"),
+    "shot_end": ("shot.end_location[1]::DOUBLE", "shot.end_location[2]::DOUBLE"),
+}
 
-    # Create staging table - single scan of JSON files
+
+def stage_events(c):
+    """Load every events JSON file once into the staging_events temp table.
+
+    A no-op when the events are already staged (ENUM inference stages them
+    before the events table is created).
+    """
     # Use union_by_name=true to handle JSON files with varying schemas (different event types have different fields)
     c.execute("""
-        CREATE TEMP TABLE staging_events AS 
+        CREATE TEMP TABLE IF NOT EXISTS staging_events AS 
         SELECT * FROM read_json_auto('./open-data/data/events/*.json', format='array', filename=true, union_by_name=true);
     """)
 
-    # Extract reference tables from staging (no additional I/O)
-    _load_reference_tables_from_staging(c, case_stmt)
 
-    # Transform and insert events from staging table
-    c.execute(f"""
-        INSERT INTO events
+def _events_select_sql(case_stmt):
+    """The staging_events -> wide events SELECT, plus an in_<table> flag per extension table."""
+    return f"""
         SELECT 
+            {_event_key_sql(EVENT_MATCH_ID_SQL, '"index"')} as event_key,
             id,
             "index" as index_num,
             period,
@@ -339,7 +417,7 @@ def load_events(c):
             -- Type and match info
             type.id as type_id,
             type.name as type,
-            CAST(regexp_extract(filename, '([0-9]+)\\.json$', 1) AS INTEGER) as match_id,
+            {EVENT_MATCH_ID_SQL} as match_id,
             team.id as team_id,
             team.name as team,
             player.id as player_id,
@@ -359,6 +437,7 @@ def load_events(c):
             shot.body_part.name as shot_body_part,
             shot.type.name as shot_type,
             shot.key_pass_id as shot_key_pass_id,
+            NULL as shot_key_pass_key,
             CASE 
                 WHEN shot.freeze_frame IS NOT NULL THEN json(shot.freeze_frame)
                 ELSE NULL
@@ -387,6 +466,7 @@ def load_events(c):
             pass.outcome.name::pass_outcome_enum as pass_outcome,
             pass.technique.name as pass_technique,
             pass.assisted_shot_id as pass_assisted_shot_id,
+            NULL as pass_assisted_shot_key,
             -- Pass flags
             CASE WHEN pass IS NOT NULL THEN COALESCE(json_extract(json(pass), '$.goal_assist')::BOOLEAN, false) ELSE false END as pass_goal_assist,
             CASE WHEN pass IS NOT NULL THEN COALESCE(json_extract(json(pass), '$.shot_assist')::BOOLEAN, false) ELSE false END as pass_shot_assist,
@@ -472,15 +552,118 @@ def load_events(c):
             bad_behaviour.card.name as bad_behaviour_card,
             
             -- Injury Stoppage fields
-            CASE WHEN injury_stoppage IS NOT NULL THEN COALESCE(json_extract(json(injury_stoppage), '$.in_chain')::BOOLEAN, false) ELSE false END as injury_stoppage_in_chain
+            CASE WHEN injury_stoppage IS NOT NULL THEN COALESCE(json_extract(json(injury_stoppage), '$.in_chain')::BOOLEAN, false) ELSE false END as injury_stoppage_in_chain,
             
-        FROM staging_events;
-    """)
+            -- Game state (needs the whole match in order, filled by load_game_state)
+            NULL as home_score_before,
+            NULL as away_score_before,
+            NULL as score_diff_for_team,
+            NULL as player_count_diff,
+            
+            -- Sequence pointers (filled by load_event_pointers)
+            NULL as prev_event_key,
+            NULL as next_event_key,
+            NULL as next_same_team_event_key,
+            
+            -- Zones
+            {_zone_columns_sql(EVENT_ZONE_SOURCES)},
+
+            -- Event objects carried (which extension tables get a row)
+            {", ".join(f"{source} IS NOT NULL as in_{table}" for table, (source, _) in EVENT_EXTENSIONS.items())}
+            
+        FROM staging_events
+    """
+
+
+def _table_columns(c, table):
+    """Column names of table, in table order."""
+    return [row[0] for row in c.execute(f"DESCRIBE {table};").fetchall()]
+
+
+def load_events(c):
+    """Load events with comprehensive field extraction for all event types.
+
+    Optimized to use a staging table approach: loads JSON once into staging_events,
+    then extracts reference tables and transforms events from the staging table.
+    This avoids multiple scans of the JSON files.
+    """
+    case_stmt = _get_player_name_case()
+
+    # Create staging table - single scan of JSON files
+    stage_events(c)
+
+    max_index = c.execute('SELECT MAX("index") FROM staging_events;').fetchone()[0]
+    if max_index is not None and max_index >= EVENT_KEY_FACTOR:
+        raise ValueError(f"Event index {max_index} does not fit the surrogate key (EVENT_KEY_FACTOR={EVENT_KEY_FACTOR})")
+
+    # Extract reference tables from staging (no additional I/O)
+    _load_reference_tables_from_staging(c, case_stmt)
+
+    # Transform the staged events once, then split them into events_core and
+    # into each extension table only the events that carry its object
+    c.execute(f"CREATE TEMP TABLE staging_events_wide AS {_events_select_sql(case_stmt)};")
+    columns = ", ".join(_table_columns(c, "events_core"))
+    c.execute(f"INSERT INTO events_core ({columns}) SELECT {columns} FROM staging_events_wide;")
+    for table in EVENT_EXTENSIONS:
+        columns = ", ".join(_table_columns(c, table))
+        c.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM staging_events_wide WHERE in_{table};")
+    c.execute("DROP TABLE IF EXISTS staging_events_wide;")
+
+    # Resolve the UUID references to other events into surrogate keys
+    for table, key_column, id_column in (
+        ("event_shots", "shot_key_pass_key", "shot_key_pass_id"),
+        ("event_passes", "pass_assisted_shot_key", "pass_assisted_shot_id"),
+    ):
+        c.execute(f"""
+            UPDATE {table}
+            SET {key_column} = ref.event_key
+            FROM events_core ref
+            WHERE ref.id = {table}.{id_column};
+        """)
+
+    # related_events arrays are only available in staging, so the edge table
+    # is built here before the staging table is dropped
+    _load_event_relations_from_staging(c)
 
     # Drop staging table to free memory
     c.execute("DROP TABLE IF EXISTS staging_events;")
 
-    return c.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    return c.execute("SELECT COUNT(*) FROM events_core").fetchone()[0]
+
+
+def _load_event_relations_from_staging(c):
+    """Load event_relations edges from the related_events arrays in staging_events.
+
+    Both ends are resolved to event_key through events_core; a related id
+    with no loaded event raises instead of being dropped from the edges.
+    """
+    c.execute("""
+        CREATE TEMP TABLE staging_relations AS
+        SELECT DISTINCT id as event_id, related_id
+        FROM (
+            SELECT id, UNNEST(related_events) as related_id
+            FROM staging_events
+            WHERE related_events IS NOT NULL
+        )
+        WHERE related_id IS NOT NULL;
+    """)
+    dangling = c.execute("""
+        SELECT COUNT(*)
+        FROM staging_relations r
+        LEFT JOIN events_core e ON e.id = r.related_id
+        WHERE e.event_key IS NULL;
+    """).fetchone()[0]
+    if dangling:
+        raise ValueError(f"{dangling} related_events ids do not match a loaded event")
+
+    c.execute("""
+        INSERT INTO event_relations
+        SELECT e.event_key, rel.event_key as related_key, e.match_id
+        FROM staging_relations r
+        JOIN events_core e ON e.id = r.event_id
+        JOIN events_core rel ON rel.id = r.related_id;
+    """)
+    c.execute("DROP TABLE IF EXISTS staging_relations;")
 
 
 # =============================================================================
@@ -581,13 +764,17 @@ def load_lineup_cards(c):
 
 
 def load_three_sixty_frames(c):
-    """Load 360 frame-level metadata."""
+    """Load 360 frame-level metadata.
+
+    Frames take their event_key from the event they belong to; a frame whose
+    event_uuid matches no loaded event raises rather than being dropped.
+    """
     valid_files = _get_valid_json_files("./open-data/data/three-sixty/*.json")
     if not valid_files:
         return 0
 
     c.execute(f"""
-        INSERT INTO three_sixty_frames
+        CREATE TEMP TABLE staging_frames AS
         SELECT
             event_uuid,
             CAST(regexp_extract(filename, '([0-9]+)\\.json$', 1) AS INTEGER) as match_id,
@@ -597,6 +784,22 @@ def load_three_sixty_frames(c):
             END as visible_area
         FROM read_json_auto({valid_files}, format='array', filename=true);
     """)
+    orphans = c.execute("""
+        SELECT COUNT(*)
+        FROM staging_frames f
+        LEFT JOIN events_core e ON e.id = f.event_uuid
+        WHERE e.event_key IS NULL;
+    """).fetchone()[0]
+    if orphans:
+        raise ValueError(f"{orphans} 360 frames do not match a loaded event")
+
+    c.execute("""
+        INSERT INTO three_sixty_frames
+        SELECT e.event_key, f.event_uuid, f.match_id, f.visible_area
+        FROM staging_frames f
+        JOIN events_core e ON e.id = f.event_uuid;
+    """)
+    c.execute("DROP TABLE IF EXISTS staging_frames;")
     return c.execute("SELECT COUNT(*) FROM three_sixty_frames").fetchone()[0]
 
 
@@ -607,17 +810,19 @@ def load_three_sixty_positions(c):
         return 0
 
     c.execute(f"""
-        INSERT INTO three_sixty_positions (event_uuid, teammate, actor, keeper, location_x, location_y)
+        INSERT INTO three_sixty_positions (event_key, event_uuid, teammate, actor, keeper, location_x, location_y)
         SELECT
-            event_uuid,
-            pos.teammate,
-            pos.actor,
-            pos.keeper,
-            pos.location[1]::DOUBLE as location_x,
-            pos.location[2]::DOUBLE as location_y
+            f.event_key,
+            s.event_uuid,
+            s.pos.teammate,
+            s.pos.actor,
+            s.pos.keeper,
+            s.pos.location[1]::DOUBLE as location_x,
+            s.pos.location[2]::DOUBLE as location_y
         FROM (
             SELECT event_uuid, UNNEST(freeze_frame) as pos
             FROM read_json_auto({valid_files}, format='array', filename=true)
-        );
+        ) s
+        JOIN three_sixty_frames f ON f.event_uuid = s.event_uuid;
     """)
     return c.execute("SELECT COUNT(*) FROM three_sixty_positions").fetchone()[0]
@@ -0,0 +1,69 @@
+"""Packed array-per-frame layout for 360 positions.
+
+three_sixty_frames_packed holds one row per frame with the players as
+parallel location arrays and a per-player flag bitmask, instead of one
+row per player. The three_sixty_positions_unpacked view gives the row
+layout back, and fetch_packed_positions reads a match straight into flat
+NumPy arrays; the frame engines in schema/frames.py read it this way.
+"""
+import numpy as np
+
+from .utils import _match_filter
+
+
+# Per-player flag bits
+POSITION_FLAG_TEAMMATE = 1
+POSITION_FLAG_ACTOR = 2
+POSITION_FLAG_KEEPER = 4
+
+
+def load_three_sixty_frames_packed(c, match_ids=None):
+    """Pack three_sixty_positions into one row per frame, players in id order."""
+    match_filter = _match_filter(match_ids, "f.match_id")
+    c.execute(f"DELETE FROM three_sixty_frames_packed WHERE {_match_filter(match_ids)};")
+    c.execute(f"""
+        INSERT INTO three_sixty_frames_packed
+        SELECT
+            f.event_key,
+            f.match_id,
+            COALESCE(list(p.location_x ORDER BY p.id) FILTER (WHERE p.id IS NOT NULL), []),
+            COALESCE(list(p.location_y ORDER BY p.id) FILTER (WHERE p.id IS NOT NULL), []),
+            COALESCE(list((
+                COALESCE(p.teammate, false)::UTINYINT * {POSITION_FLAG_TEAMMATE}
+                + COALESCE(p.actor, false)::UTINYINT * {POSITION_FLAG_ACTOR}
+                + COALESCE(p.keeper, false)::UTINYINT * {POSITION_FLAG_KEEPER}
+            )::UTINYINT ORDER BY p.id) FILTER (WHERE p.id IS NOT NULL), [])
+        FROM three_sixty_frames f
+        LEFT JOIN three_sixty_positions p ON p.event_key = f.event_key
+        WHERE {match_filter}
+        GROUP BY f.event_key, f.match_id;
+    """)
+    return c.execute("SELECT COUNT(*) FROM three_sixty_frames_packed").fetchone()[0]
+
+
+def fetch_packed_positions(c, match_id):
+    """One match's packed frames as flat NumPy arrays, grouped by frame.
+
+    Returns the positions dict the frame engines consume (event_key,
+    teammate, actor, keeper, location_x, location_y, match_id). The lists
+    are unnested in SQL and the flag bits split with vectorised masks, so
+    no Python code runs per player or per frame.
+    """
+    flat = c.execute("""
+        SELECT
+            event_key,
+            UNNEST(range(len(location_x))) as player_index,
+            UNNEST(location_x) as location_x,
+            UNNEST(location_y) as location_y,
+            UNNEST(flags) as flags
+        FROM three_sixty_frames_packed
+        WHERE match_id = ?
+        ORDER BY event_key, player_index;
+    """, [match_id]).fetchnumpy()
+    flags = np.asarray(flat.pop("flags"), dtype=np.uint8)
+    flat.pop("player_index")
+    flat["teammate"] = (flags & POSITION_FLAG_TEAMMATE) != 0
+    flat["actor"] = (flags & POSITION_FLAG_ACTOR) != 0
+    flat["keeper"] = (flags & POSITION_FLAG_KEEPER) != 0
+    flat["match_id"] = match_id
+    return flat
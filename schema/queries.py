@@ -0,0 +1,69 @@
+from .utils import _clock_sql, _match_filter
+
+
+def get_event_chains(c, match_id, max_depth=5):
+    """Walk related_events chains for every event in a match in one query.
+
+    Uses a recursive CTE over event_relations restricted to the match, so
+    linking a duel to its dribble or a pass to its ball receipt is a single
+    indexed traversal instead of heuristic self-joins on events. Cycles
+    (relations are usually recorded in both directions) are cut by tracking
+    the visited path.
+
+    Returns a list of (event_key, reachable_key, depth) tuples, one per pair,
+    with the shortest depth at which reachable_key is reached from event_key.
+    """
+    return c.execute("""
+        WITH RECURSIVE match_relations AS (
+            SELECT event_key, related_key
+            FROM event_relations
+            WHERE match_id = $match_id
+        ),
+        chain(start_key, event_key, depth, path) AS (
+            SELECT event_key, related_key, 1, [event_key, related_key]
+            FROM match_relations
+
+            UNION ALL
+
+            SELECT ch.start_key, r.related_key, ch.depth + 1, list_append(ch.path, r.related_key)
+            FROM chain ch
+            JOIN match_relations r ON r.event_key = ch.event_key
+            WHERE ch.depth < $max_depth
+              AND NOT list_contains(ch.path, r.related_key)
+        )
+        SELECT start_key as event_key, event_key as reachable_key, MIN(depth) as depth
+        FROM chain
+        GROUP BY start_key, event_key
+        ORDER BY start_key, depth, reachable_key;
+    """, {"match_id": match_id, "max_depth": max_depth}).fetchall()
+
+
+def _on_pitch_sql(match_filter):
+    """SQL for (event_key, match_id, team_id, player_id) rows: every player on
+    the pitch at each event, as an equi-join on match plus an integer range
+    join on the period-major clock."""
+    return f"""
+        SELECT e.event_key, e.match_id, pi.team_id, pi.player_id
+        FROM events_core e
+        JOIN player_intervals pi
+            ON pi.match_id = e.match_id
+           AND {_clock_sql('e.period', 'e.minute * 60 + e.second')} >= pi.start_clock
+           AND {_clock_sql('e.period', 'e.minute * 60 + e.second')} < pi.end_clock
+        WHERE {match_filter}
+    """
+
+
+def get_on_pitch_players(c, match_ids=None):
+    """Return the players on the pitch for every event of the given matches.
+
+    One set-based interval join against player_intervals, so the full corpus
+    costs a single range join rather than a per-event lookup. Returns a list
+    of (event_key, team_id, player_ids) tuples, one per event and team, with
+    player_ids sorted.
+    """
+    return c.execute(f"""
+        SELECT event_key, team_id, list_sort(list(player_id)) as player_ids
+        FROM ({_on_pitch_sql(_match_filter(match_ids, 'e.match_id'))})
+        GROUP BY event_key, team_id
+        ORDER BY event_key, team_id;
+    """).fetchall()
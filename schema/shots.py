@@ -0,0 +1,119 @@
+"""Shot feature store computed from events and shot freeze frames."""
+from .utils import GOAL_Y_HIGH, GOAL_Y_LOW, PITCH_LENGTH, _match_filter
+
+
+# Bump when a feature definition changes; older rows are recomputed on the next load
+SHOT_FEATURE_VERSION = 1
+
+FREEZE_FRAME_STRUCTURE = '[{"location": ["DOUBLE"], "teammate": "BOOLEAN", "position": {"name": "VARCHAR"}}]'
+
+
+def _cross_sql(ax, ay, bx, by, px, py):
+    """Sign of the cross product telling which side of a->b the point p is on."""
+    return f"(({bx}) - ({ax})) * (({py}) - ({ay})) - (({by}) - ({ay})) * (({px}) - ({ax}))"
+
+
+def _in_shot_cone_sql(sx, sy, px, py):
+    """SQL predicate: p lies in the triangle between the shot and both posts."""
+    edges = [
+        _cross_sql(sx, sy, PITCH_LENGTH, GOAL_Y_LOW, px, py),
+        _cross_sql(PITCH_LENGTH, GOAL_Y_LOW, PITCH_LENGTH, GOAL_Y_HIGH, px, py),
+        _cross_sql(PITCH_LENGTH, GOAL_Y_HIGH, sx, sy, px, py),
+    ]
+    return (
+        "((" + " AND ".join(f"{e} >= 0" for e in edges) + ") OR ("
+        + " AND ".join(f"{e} <= 0" for e in edges) + "))"
+    )
+
+
+def _distance_sql(ax, ay, bx, by):
+    return f"sqrt(pow(({ax}) - ({bx}), 2) + pow(({ay}) - ({by}), 2))"
+
+
+def load_shot_features(c, match_ids=None):
+    """Build shot_features in one set-based statement.
+
+    Freeze frames are unnested with json_transform and aggregated per shot,
+    so defenders in the cone, nearest defender and goalkeeper features need
+    no per-shot Python. Rows for the given matches (all of them for None),
+    and any rows computed with an older SHOT_FEATURE_VERSION, are
+    recomputed; shots missing from the table are always added, so
+    match_ids=[] only catches up stale and missing shots. Returns the
+    number of shots computed.
+    """
+    match_filter = _match_filter(match_ids)
+    c.execute(f"""
+        DELETE FROM shot_features
+        WHERE {match_filter} OR feature_version != {SHOT_FEATURE_VERSION};
+    """)
+    goal_y = (GOAL_Y_LOW + GOAL_Y_HIGH) / 2
+    before = c.execute("SELECT COUNT(*) FROM shot_features").fetchone()[0]
+    c.execute(f"""
+        INSERT INTO shot_features
+        WITH shots AS (
+            SELECT *
+            FROM event_shots
+            JOIN events_core USING (event_key)
+            WHERE type = 'Shot'
+              AND location_x IS NOT NULL
+              AND event_key NOT IN (SELECT event_key FROM shot_features)
+        ),
+        frame AS (
+            SELECT
+                s.event_key,
+                f.location[1] as px,
+                f.location[2] as py,
+                f.teammate,
+                f.position.name = 'Goalkeeper' as is_keeper,
+                {_in_shot_cone_sql('s.location_x', 's.location_y', 'f.location[1]', 'f.location[2]')} as in_cone,
+                {_distance_sql('s.location_x', 's.location_y', 'f.location[1]', 'f.location[2]')} as distance
+            FROM shots s, UNNEST(json_transform(s.shot_freeze_frame, '{FREEZE_FRAME_STRUCTURE}')) as t(f)
+        ),
+        frame_features AS (
+            SELECT
+                event_key,
+                COUNT(*) FILTER (WHERE NOT teammate AND NOT is_keeper AND in_cone) as defenders_in_cone,
+                MIN(distance) FILTER (WHERE NOT teammate AND NOT is_keeper) as nearest_defender_distance,
+                arg_min(px, distance) FILTER (WHERE NOT teammate AND is_keeper) as gk_x,
+                arg_min(py, distance) FILTER (WHERE NOT teammate AND is_keeper) as gk_y,
+                MIN(distance) FILTER (WHERE NOT teammate AND is_keeper) as gk_distance
+            FROM frame
+            GROUP BY event_key
+        )
+        SELECT
+            s.event_key,
+            s.match_id,
+            s.team_id,
+            s.player_id,
+            {SHOT_FEATURE_VERSION} as feature_version,
+
+            -- Geometry
+            s.location_x,
+            s.location_y,
+            {_distance_sql('s.location_x', 's.location_y', PITCH_LENGTH, goal_y)} as distance,
+            abs(atan2({GOAL_Y_HIGH} - s.location_y, {PITCH_LENGTH} - s.location_x)
+                - atan2({GOAL_Y_LOW} - s.location_y, {PITCH_LENGTH} - s.location_x)) as angle,
+
+            -- Context
+            COALESCE(s.under_pressure, false) as under_pressure,
+            COALESCE(s.shot_first_time, false) as first_time,
+            s.shot_body_part as body_part,
+            s.shot_type,
+            s.play_pattern,
+
+            -- Freeze frame
+            s.shot_freeze_frame IS NOT NULL as has_freeze_frame,
+            CASE WHEN s.shot_freeze_frame IS NOT NULL THEN COALESCE(f.defenders_in_cone, 0) END as defenders_in_cone,
+            f.nearest_defender_distance,
+            f.gk_x,
+            f.gk_y,
+            f.gk_distance,
+            {_distance_sql('f.gk_x', 'f.gk_y', PITCH_LENGTH, goal_y)} as gk_distance_to_goal,
+
+            -- Labels
+            s.shot_statsbomb_xg as statsbomb_xg,
+            s.shot_outcome = 'Goal' as is_goal
+        FROM shots s
+        LEFT JOIN frame_features f ON f.event_key = s.event_key;
+    """)
+    return c.execute("SELECT COUNT(*) FROM shot_features").fetchone()[0] - before
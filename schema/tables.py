@@ -1,3 +1,7 @@
+from .packed import POSITION_FLAG_ACTOR, POSITION_FLAG_KEEPER, POSITION_FLAG_TEAMMATE
+from .zones import _zone_columns_ddl
+
+
 def _create_enum_types(c):
     """Create ENUM types for low-cardinality categorical columns.
     
@@ -21,6 +25,30 @@ def _create_enum_types(c):
         );
     """)
 
+    # SPADL action vocabulary (used by the actions table)
+    c.execute("""
+        DROP TYPE IF EXISTS spadl_type_enum;
+        CREATE TYPE spadl_type_enum AS ENUM (
+            'pass', 'cross', 'throw_in', 'freekick_crossed', 'freekick_short',
+            'corner_crossed', 'corner_short', 'take_on', 'foul', 'tackle',
+            'interception', 'shot', 'shot_penalty', 'shot_freekick', 'keeper_save',
+            'keeper_claim', 'keeper_punch', 'keeper_pick_up', 'clearance',
+            'bad_touch', 'dribble', 'goalkick'
+        );
+    """)
+    c.execute("""
+        DROP TYPE IF EXISTS spadl_result_enum;
+        CREATE TYPE spadl_result_enum AS ENUM (
+            'fail', 'success', 'offside', 'owngoal', 'yellow_card', 'red_card'
+        );
+    """)
+    c.execute("""
+        DROP TYPE IF EXISTS spadl_bodypart_enum;
+        CREATE TYPE spadl_bodypart_enum AS ENUM (
+            'foot', 'head', 'other', 'foot_left', 'foot_right'
+        );
+    """)
+
 
 def make_competitions(c):
     c.execute(
@@ -96,6 +124,43 @@ def make_matches(c):
     )
 
 
+def make_managers(c):
+    """Reference table for team managers."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS managers;
+        CREATE TABLE managers (
+            id              INTEGER PRIMARY KEY,
+            name            TEXT,
+            nickname        TEXT,
+            dob             TEXT,
+            country_id      INTEGER,
+            country_name    TEXT
+        );
+        """
+    )
+
+
+def make_match_managers(c):
+    """Bridge table linking each match side to its managers."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS match_managers;
+        CREATE TABLE match_managers (
+            match_id    INTEGER,
+            team_id     INTEGER,
+            manager_id  INTEGER,
+            is_home     BOOL,
+
+            PRIMARY KEY (match_id, team_id, manager_id),
+            FOREIGN KEY (match_id)   REFERENCES matches(match_id),
+            FOREIGN KEY (team_id)    REFERENCES teams(id),
+            FOREIGN KEY (manager_id) REFERENCES managers(id)
+        );
+        """
+    )
+
+
 def make_teams(c):
     c.execute(
         """
@@ -170,63 +235,46 @@ def make_countries(c):
     )
 
 
-def make_events(c):
-    c.execute(
-        """
-        DROP TABLE IF EXISTS events;
-        CREATE TABLE events (
-            -- Core Attributes
-                id                      TEXT PRIMARY KEY,
-                index_num               INTEGER,
-
-                -- Time
-                period                  INTEGER,
-                minute                  INTEGER,
-                second                  INTEGER,
-                timestamp               TEXT,
-                duration                REAL,
+# Categorical TEXT columns of events with a fixed StatsBomb vocabulary: the only
+# candidates for inferred ENUM types (see schema.enums). Names (player, team,
+# pass_recipient, ...) stay TEXT, so the schema does not depend on corpus size.
+EVENT_ENUM_COLUMNS = (
+    "type", "play_pattern", "position",
+    "shot_technique", "shot_body_part", "shot_type",
+    "pass_height", "pass_body_part", "pass_type", "pass_technique",
+    "dribble_outcome", "duel_type", "duel_outcome",
+    "foul_committed_card", "foul_committed_type",
+    "goalkeeper_type", "goalkeeper_outcome", "goalkeeper_technique", "goalkeeper_position", "goalkeeper_body_part",
+    "clearance_body_part", "interception_outcome", "substitution_outcome",
+    "fifty_fifty_outcome", "bad_behaviour_card",
+)
 
-                -- Location (extracted coordinates only - JSON removed for efficiency)
-                location_x              REAL,
-                location_y              REAL,
 
-                -- Possession
-                possession              INTEGER,
-                possession_team_id      INTEGER,
-                possession_team         TEXT,
+def _event_column_types(enum_columns=None):
+    """Type of every EVENT_ENUM_COLUMNS column: its inferred ENUM, else TEXT."""
+    enum_columns = enum_columns or {}
+    return {column: enum_columns.get(column, "TEXT") for column in EVENT_ENUM_COLUMNS}
 
-                -- Flags
-                out                     BOOL,
-                off_camera              BOOL,
-                counterpress            BOOL,
-                under_pressure          BOOL,
 
-                -- Enums
-                type_id                 INTEGER,
-                type                    TEXT,
-                match_id                INTEGER,
-                team_id                 INTEGER,
-                team                    TEXT,
-                player_id               INTEGER,
-                player                  TEXT,
-                position_id             INTEGER,
-                position                TEXT,
-                play_pattern_id         INTEGER,
-                play_pattern            TEXT,
+def _event_extensions(types):
+    """Extension table -> (StatsBomb event object it is split from, column definitions).
 
-            -- Shot Attributes (extracted coordinates only - JSON removed for efficiency)
+    An event gets a row in an extension table only when it carries that
+    object. Categorical columns are declared with their type from types.
+    """
+    return {
+        "event_shots": ("shot", f"""
                 shot_end_location_x     REAL,
                 shot_end_location_y     REAL,
                 shot_end_location_z     REAL,
                 shot_statsbomb_xg       REAL,
                 shot_outcome            shot_outcome_enum,
-                shot_technique          TEXT,
-                shot_body_part          TEXT,
-                shot_type               TEXT,
-                shot_key_pass_id        TEXT,
+                shot_technique          {types["shot_technique"]},
+                shot_body_part          {types["shot_body_part"]},
+                shot_type               {types["shot_type"]},
+                shot_key_pass_id        UUID,
+                shot_key_pass_key       BIGINT,
                 shot_freeze_frame       TEXT,
-
-                -- Shot Flags
                 shot_first_time         BOOL,
                 shot_deflected          BOOL,
                 shot_aerial_won         BOOL,
@@ -236,22 +284,21 @@ def make_events(c):
                 shot_redirect           BOOL,
                 shot_saved_off_target   BOOL,
                 shot_saved_to_post      BOOL,
-
-            -- Pass Attributes (extracted coordinates only - JSON removed for efficiency)
+                {_zone_columns_ddl(("shot_end",))}"""),
+        "event_passes": ("pass", f"""
                 pass_end_location_x     REAL,
                 pass_end_location_y     REAL,
                 pass_recipient_id       INTEGER,
                 pass_recipient          TEXT,
                 pass_length             REAL,
                 pass_angle              REAL,
-                pass_height             TEXT,
-                pass_body_part          TEXT,
-                pass_type               TEXT,
+                pass_height             {types["pass_height"]},
+                pass_body_part          {types["pass_body_part"]},
+                pass_type               {types["pass_type"]},
                 pass_outcome            pass_outcome_enum,
-                pass_technique          TEXT,
-                pass_assisted_shot_id   TEXT,
-
-                -- Pass Flags
+                pass_technique          {types["pass_technique"]},
+                pass_assisted_shot_id   UUID,
+                pass_assisted_shot_key  BIGINT,
                 pass_goal_assist        BOOL,
                 pass_shot_assist        BOOL,
                 pass_cross              BOOL,
@@ -265,88 +312,558 @@ def make_events(c):
                 pass_cut_back           BOOL,
                 pass_straight           BOOL,
                 pass_miscommunication   BOOL,
-
-            -- Carry Attributes (extracted coordinates only - JSON removed for efficiency)
+                {_zone_columns_ddl(("pass_end",))}FOREIGN KEY (pass_recipient_id) REFERENCES players(id),"""),
+        "event_carries": ("carry", f"""
                 carry_end_location_x    REAL,
                 carry_end_location_y    REAL,
-
-            -- Dribble Attributes
-                dribble_outcome         TEXT,
+                {_zone_columns_ddl(("carry_end",))}"""),
+        "event_dribbles": ("dribble", f"""
+                dribble_outcome         {types["dribble_outcome"]},
                 dribble_nutmeg          BOOL,
                 dribble_overrun         BOOL,
-                dribble_no_touch        BOOL,
-
-            -- Duel Attributes
-                duel_type               TEXT,
-                duel_outcome            TEXT,
-
-            -- Foul Committed Attributes
-                foul_committed_card     TEXT,
-                foul_committed_type     TEXT,
+                dribble_no_touch        BOOL,"""),
+        "event_duels": ("duel", f"""
+                duel_type               {types["duel_type"]},
+                duel_outcome            {types["duel_outcome"]},"""),
+        "event_fouls_committed": ("foul_committed", f"""
+                foul_committed_card         {types["foul_committed_card"]},
+                foul_committed_type         {types["foul_committed_type"]},
                 foul_committed_offensive    BOOL,
                 foul_committed_advantage    BOOL,
-                foul_committed_penalty      BOOL,
-
-            -- Foul Won Attributes
+                foul_committed_penalty      BOOL,"""),
+        "event_fouls_won": ("foul_won", """
                 foul_won_defensive      BOOL,
                 foul_won_advantage      BOOL,
-                foul_won_penalty        BOOL,
-
-            -- Goalkeeper Attributes
-                goalkeeper_type             TEXT,
-                goalkeeper_outcome          TEXT,
-                goalkeeper_technique        TEXT,
-                goalkeeper_position         TEXT,
-                goalkeeper_body_part        TEXT,
-                -- goalkeeper_end_location JSON removed - use extracted coordinates
+                foul_won_penalty        BOOL,"""),
+        "event_goalkeeper": ("goalkeeper", f"""
+                goalkeeper_type             {types["goalkeeper_type"]},
+                goalkeeper_outcome          {types["goalkeeper_outcome"]},
+                goalkeeper_technique        {types["goalkeeper_technique"]},
+                goalkeeper_position         {types["goalkeeper_position"]},
+                goalkeeper_body_part        {types["goalkeeper_body_part"]},
                 goalkeeper_end_location_x   REAL,
-                goalkeeper_end_location_y   REAL,
-
-            -- Clearance Attributes
-                clearance_body_part         TEXT,
+                goalkeeper_end_location_y   REAL,"""),
+        "event_clearances": ("clearance", f"""
+                clearance_body_part         {types["clearance_body_part"]},
                 clearance_aerial_won        BOOL,
                 clearance_head              BOOL,
                 clearance_left_foot         BOOL,
-                clearance_right_foot        BOOL,
-
-            -- Interception Attributes
-                interception_outcome        TEXT,
-
-            -- Block Attributes
+                clearance_right_foot        BOOL,"""),
+        "event_interceptions": ("interception", f"""
+                interception_outcome        {types["interception_outcome"]},"""),
+        "event_blocks": ("block", """
                 block_deflection            BOOL,
                 block_offensive             BOOL,
-                block_save_block            BOOL,
-
-            -- Ball Recovery Attributes
+                block_save_block            BOOL,"""),
+        "event_ball_recoveries": ("ball_recovery", """
                 ball_recovery_offensive     BOOL,
-                ball_recovery_failure       BOOL,
-
-            -- Miscontrol Attributes
-                miscontrol_aerial_won       BOOL,
-
-            -- Substitution Attributes
+                ball_recovery_failure       BOOL,"""),
+        "event_miscontrols": ("miscontrol", """
+                miscontrol_aerial_won       BOOL,"""),
+        # substitution_replacement_id intentionally has no FK constraint because
+        # replacement players may not appear as event actors in the players table
+        "event_substitutions": ("substitution", f"""
                 substitution_replacement_id     INTEGER,
                 substitution_replacement_name   TEXT,
-                substitution_outcome            TEXT,
+                substitution_outcome            {types["substitution_outcome"]},"""),
+        "event_fifty_fifties": ('"50_50"', f"""
+                fifty_fifty_outcome         {types["fifty_fifty_outcome"]},"""),
+        "event_bad_behaviours": ("bad_behaviour", f"""
+                bad_behaviour_card          {types["bad_behaviour_card"]},"""),
+        "event_injury_stoppages": ("injury_stoppage", """
+                injury_stoppage_in_chain    BOOL,"""),
+    }
 
-            -- 50/50 Attributes
-                fifty_fifty_outcome         TEXT,
 
-            -- Bad Behaviour Attributes
-                bad_behaviour_card          TEXT,
+EVENT_EXTENSIONS = _event_extensions(_event_column_types())
 
-            -- Injury Stoppage Attributes
-                injury_stoppage_in_chain    BOOL,
-            
+
+def make_events(c, enum_columns=None):
+    """Vertically partitioned events: a narrow events_core table, one
+    extension table per EVENT_EXTENSIONS entry, and the wide events view.
+
+    The view LEFT JOINs every extension back onto events_core, so queries
+    written against the old wide table keep working; extension booleans
+    read false for events without the object, as they were stored before.
+    enum_columns maps EVENT_ENUM_COLUMNS to inferred ENUM types (see
+    schema.enums); the other categorical columns are declared TEXT.
+    """
+    types = _event_column_types(enum_columns)
+    extensions = _event_extensions(types)
+    ddl = f"""
+        DROP VIEW IF EXISTS events;
+        {"".join(f"DROP TABLE IF EXISTS {table};" for table in EVENT_EXTENSIONS)}
+        DROP TABLE IF EXISTS events_core;
+        CREATE TABLE events_core (
+            -- Core Attributes
+                event_key               BIGINT PRIMARY KEY,     -- match_id * EVENT_KEY_FACTOR + index_num
+                id                      UUID UNIQUE NOT NULL,   -- event UUID
+                index_num               INTEGER,
+
+                -- Time
+                period                  INTEGER,
+                minute                  INTEGER,
+                second                  INTEGER,
+                timestamp               TEXT,
+                duration                REAL,
+
+                -- Location (extracted coordinates only - JSON removed for efficiency)
+                location_x              REAL,
+                location_y              REAL,
+
+                -- Possession
+                possession              INTEGER,
+                possession_team_id      INTEGER,
+                possession_team         TEXT,
+
+                -- Flags
+                out                     BOOL,
+                off_camera              BOOL,
+                counterpress            BOOL,
+                under_pressure          BOOL,
+
+                -- Enums
+                type_id                 INTEGER,
+                type                    {types["type"]},
+                match_id                INTEGER,
+                team_id                 INTEGER,
+                team                    TEXT,
+                player_id               INTEGER,
+                player                  TEXT,
+                position_id             INTEGER,
+                position                {types["position"]},
+                play_pattern_id         INTEGER,
+                play_pattern            {types["play_pattern"]},
+
+            -- Game State (before the event; filled after load)
+                home_score_before           INTEGER,
+                away_score_before           INTEGER,
+                score_diff_for_team         INTEGER,
+                player_count_diff           INTEGER,
+
+            -- Sequence Pointers (within match and period; filled after load)
+                prev_event_key              BIGINT,
+                next_event_key              BIGINT,
+                next_same_team_event_key    BIGINT,
+
+            -- Zones (SMALLINT cell ids per zone grid, see zone_grids)
+                {_zone_columns_ddl(("location",))}
             FOREIGN KEY (type_id)               REFERENCES event_types(id),
             FOREIGN KEY (match_id)              REFERENCES matches(match_id),
             FOREIGN KEY (team_id)               REFERENCES teams(id),
             FOREIGN KEY (player_id)             REFERENCES players(id),
             FOREIGN KEY (position_id)           REFERENCES positions(id),
-            FOREIGN KEY (possession_team_id)    REFERENCES teams(id),
-            FOREIGN KEY (pass_recipient_id)     REFERENCES players(id)
-            -- Note: substitution_replacement_id intentionally has no FK constraint
-            -- because replacement players may not appear as event actors in the players table
+            FOREIGN KEY (possession_team_id)    REFERENCES teams(id)
+        );
+        """
+    for table, (_, columns) in extensions.items():
+        ddl += f"""
+        CREATE TABLE {table} (
+                event_key               BIGINT PRIMARY KEY,
+                {columns.strip()}
+            FOREIGN KEY (event_key) REFERENCES events_core(event_key)
+        );
+        """
+    c.execute(ddl)
+
+    select_list = ["e.*"]
+    joins = []
+    for i, table in enumerate(EVENT_EXTENSIONS):
+        for name, column_type, *_ in c.execute(f"DESCRIBE {table};").fetchall():
+            if name == "event_key":
+                continue
+            select_list.append(
+                f"COALESCE(x{i}.{name}, false) AS {name}" if column_type == "BOOLEAN" else f"x{i}.{name}"
+            )
+        joins.append(f"LEFT JOIN {table} x{i} ON x{i}.event_key = e.event_key")
+    c.execute(f"""
+        CREATE VIEW events AS
+        SELECT {", ".join(select_list)}
+        FROM events_core e
+        {" ".join(joins)};
+    """)
+
+
+def make_event_relations(c):
+    """Edge table of StatsBomb related_events links between events."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS event_relations;
+        CREATE TABLE event_relations (
+            event_key   BIGINT,
+            related_key BIGINT,
+            match_id    INTEGER,
+
+            PRIMARY KEY (event_key, related_key),
+            FOREIGN KEY (event_key) REFERENCES events_core(event_key),
+            FOREIGN KEY (related_key) REFERENCES events_core(event_key),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id)
+        );
+        """
+    )
+
+
+def make_zone_grids(c):
+    """Registry of the zone grids behind the events zone columns."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS zone_grids;
+        CREATE TABLE zone_grids (
+            name            TEXT PRIMARY KEY,
+            grid_cols       INTEGER,
+            grid_rows       INTEGER,
+            cell_length     REAL,
+            cell_width      REAL,
+            description     TEXT
+        );
+        """
+    )
+
+
+# =============================================================================
+# Derived Tables
+# =============================================================================
+
+def make_possessions(c):
+    """One row per possession, aggregated from events after load."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS possessions;
+        CREATE TABLE possessions (
+            match_id            INTEGER,
+            possession          INTEGER,
+            team_id             INTEGER,
+            team                TEXT,
+            period              INTEGER,
+            play_pattern_id     INTEGER,
+            play_pattern        TEXT,
+
+            -- Clock (seconds of match time, minute * 60 + second)
+            start_index         INTEGER,
+            end_index           INTEGER,
+            start_seconds       INTEGER,
+            end_seconds         REAL,
+            duration            REAL,
+
+            -- Location (possession team's events only)
+            start_location_x    REAL,
+            start_location_y    REAL,
+            end_location_x      REAL,
+            end_location_y      REAL,
+
+            -- Aggregates
+            event_count         INTEGER,
+            pass_count          INTEGER,
+            shot_count          INTEGER,
+            ended_in_shot       BOOL,
+            total_xg            REAL,
+
+            PRIMARY KEY (match_id, possession),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id),
+            FOREIGN KEY (team_id)  REFERENCES teams(id)
+        );
+        """
+    )
+
+
+def make_actions(c):
+    """SPADL-style action sequence derived from events."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS actions;
+        CREATE TABLE actions (
+            match_id        INTEGER,
+            action_id       INTEGER,
+            event_key       BIGINT,
+            period          INTEGER,
+            time_seconds    REAL,
+            team_id         INTEGER,
+            player_id       INTEGER,
+
+            -- SPADL coordinates (105 x 68 metres, acting team attacks left to right)
+            start_x         REAL,
+            start_y         REAL,
+            end_x           REAL,
+            end_y           REAL,
+
+            type_name       spadl_type_enum,
+            result_name     spadl_result_enum,
+            bodypart_name   spadl_bodypart_enum,
+
+            PRIMARY KEY (match_id, action_id),
+            FOREIGN KEY (event_key) REFERENCES events_core(event_key),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id)
+        );
+        """
+    )
+
+
+def make_xt_grids(c):
+    """Cached Expected Threat surfaces per competition/season and grid size."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS xt_grids;
+        CREATE TABLE xt_grids (
+            competition_id  INTEGER,
+            season_id       INTEGER,
+            grid_cols       INTEGER,
+            grid_rows       INTEGER,
+            xt_values       REAL[],
+            iterations      INTEGER,
+            fingerprint     TEXT,
+
+            PRIMARY KEY (competition_id, season_id, grid_cols, grid_rows),
+            FOREIGN KEY (competition_id, season_id) REFERENCES competitions (competition_id, season_id)
+        );
+        """
+    )
+
+
+def make_action_xt(c):
+    """Per-action xT added for passes and carries, per xT grid resolution."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS action_xt;
+        CREATE TABLE action_xt (
+            event_key       BIGINT,
+            match_id        INTEGER,
+            competition_id  INTEGER,
+            season_id       INTEGER,
+            grid_cols       INTEGER,    -- xt_grids resolution the values come from
+            grid_rows       INTEGER,
+            team_id         INTEGER,
+            player_id       INTEGER,
+            type            TEXT,
+            successful      BOOL,
+            start_cell      INTEGER,
+            end_cell        INTEGER,
+            xt_start        REAL,
+            xt_end          REAL,
+            xt_added        REAL,
+
+            PRIMARY KEY (event_key, grid_cols, grid_rows),
+            FOREIGN KEY (event_key) REFERENCES events_core(event_key),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id)
+        );
+        """
+    )
+
+
+def make_player_intervals(c):
+    """On-pitch intervals per player with integer clock bounds."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS player_intervals;
+        CREATE TABLE player_intervals (
+            match_id        INTEGER,
+            team_id         INTEGER,
+            player_id       INTEGER,
+            position_id     INTEGER,
+
+            -- Clock: period * 10000 + seconds of match time, half-open [start, end)
+            start_period    INTEGER,
+            start_seconds   INTEGER,
+            end_period      INTEGER,
+            end_seconds     INTEGER,
+            start_clock     INTEGER,
+            end_clock       INTEGER,
+            seconds_played  INTEGER,
+
+            start_reason    TEXT,
+            end_reason      TEXT,
+
+            FOREIGN KEY (match_id, team_id) REFERENCES lineups(match_id, team_id)
+        );
+        """
+    )
+
+
+def make_player_match_stats(c):
+    """Per-player match totals with minutes played, for per-90 metrics."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS player_match_stats;
+        CREATE TABLE player_match_stats (
+            match_id            INTEGER,
+            player_id           INTEGER,
+            team_id             INTEGER,
+
+            -- Playing time (from player_intervals)
+            started             BOOL,
+            seconds_played      INTEGER,
+            minutes_played      REAL,
+
+            -- Passing
+            passes              INTEGER,
+            completed_passes    INTEGER,
+            key_passes          INTEGER,
+            assists             INTEGER,
+
+            -- Shooting
+            shots               INTEGER,
+            shots_on_target     INTEGER,
+            goals               INTEGER,
+            xg                  REAL,
+            np_xg               REAL,
+
+            -- Ball carrying
+            carries             INTEGER,
+            dribbles            INTEGER,
+            completed_dribbles  INTEGER,
+            dispossessed        INTEGER,
+
+            -- Defending
+            tackles             INTEGER,
+            tackles_won         INTEGER,
+            interceptions       INTEGER,
+            pressures           INTEGER,
+            ball_recoveries     INTEGER,
+            clearances          INTEGER,
+            blocks              INTEGER,
+
+            -- Discipline
+            fouls_committed     INTEGER,
+            fouls_won           INTEGER,
+
+            PRIMARY KEY (match_id, player_id),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id),
+            FOREIGN KEY (team_id)  REFERENCES teams(id)
+        );
+        """
+    )
+
+
+def make_heatmap_tiles(c):
+    """Event count grids per player/team, season and event type at every zone grid."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS heatmap_tiles;
+        CREATE TABLE heatmap_tiles (
+            entity_type     TEXT,       -- 'player' or 'team'
+            entity_id       INTEGER,
+            competition_id  INTEGER,
+            season_id       INTEGER,
+            event_type      TEXT,
+            grid_name       TEXT,       -- zone_grids.name
+            counts          INTEGER[],  -- row-major, one entry per zone
+            total           INTEGER,
+
+            PRIMARY KEY (entity_type, entity_id, competition_id, season_id, event_type, grid_name),
+            FOREIGN KEY (competition_id, season_id) REFERENCES competitions (competition_id, season_id)
+        );
+        """
+    )
+
+
+def make_zone_transitions(c):
+    """Sparse (COO) zone-to-zone pass and carry transitions per team and season."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS zone_transitions;
+        CREATE TABLE zone_transitions (
+            competition_id  INTEGER,
+            season_id       INTEGER,
+            team_id         INTEGER,
+            grid_name       TEXT,       -- zone_grids.name
+            from_zone       SMALLINT,
+            to_zone         SMALLINT,
+            attempts        INTEGER,
+            successes       INTEGER,
+            transition_prob REAL,       -- attempts / all attempts from from_zone
+            success_prob    REAL,       -- successes / attempts
+
+            PRIMARY KEY (competition_id, season_id, team_id, grid_name, from_zone, to_zone),
+            FOREIGN KEY (competition_id, season_id) REFERENCES competitions (competition_id, season_id),
+            FOREIGN KEY (team_id) REFERENCES teams(id)
+        );
+        """
+    )
+
+
+def make_pass_network_nodes(c):
+    """Average pass positions per player in the starting XI period."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS pass_network_nodes;
+        CREATE TABLE pass_network_nodes (
+            match_id            INTEGER,
+            team_id             INTEGER,
+            player_id           INTEGER,
+            avg_x               REAL,
+            avg_y               REAL,
+            passes              INTEGER,    -- attempted
+            completed_passes    INTEGER,
+            passes_received     INTEGER,
+            window_end_index    INTEGER,    -- first XI change (NULL = full match)
+
+            PRIMARY KEY (match_id, team_id, player_id),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id),
+            FOREIGN KEY (team_id)  REFERENCES teams(id)
+        );
+        """
+    )
+
+
+def make_pass_network_edges(c):
+    """Completed passer -> recipient counts in the starting XI period."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS pass_network_edges;
+        CREATE TABLE pass_network_edges (
+            match_id        INTEGER,
+            team_id         INTEGER,
+            passer_id       INTEGER,
+            recipient_id    INTEGER,
+            pass_count      INTEGER,
+
+            PRIMARY KEY (match_id, team_id, passer_id, recipient_id),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id),
+            FOREIGN KEY (team_id)  REFERENCES teams(id)
+        );
+        """
+    )
+
+
+def make_shot_features(c):
+    """Per-shot model features from event columns and the shot freeze frame."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS shot_features;
+        CREATE TABLE shot_features (
+            event_key                   BIGINT PRIMARY KEY,
+            match_id                    INTEGER,
+            team_id                     INTEGER,
+            player_id                   INTEGER,
+            feature_version             INTEGER,
+
+            -- Geometry (yards, radians)
+            location_x                  REAL,
+            location_y                  REAL,
+            distance                    REAL,
+            angle                       REAL,
+
+            -- Context
+            under_pressure              BOOL,
+            first_time                  BOOL,
+            body_part                   TEXT,
+            shot_type                   TEXT,
+            play_pattern                TEXT,
+
+            -- Freeze frame
+            has_freeze_frame            BOOL,
+            defenders_in_cone           INTEGER,
+            nearest_defender_distance   REAL,
+            gk_x                        REAL,
+            gk_y                        REAL,
+            gk_distance                 REAL,
+            gk_distance_to_goal         REAL,
+
+            -- Labels
+            statsbomb_xg                REAL,
+            is_goal                     BOOL,
+
+            FOREIGN KEY (event_key) REFERENCES events_core(event_key),
+            FOREIGN KEY (match_id) REFERENCES matches(match_id)
         );
         """
     )
@@ -460,11 +977,12 @@ def make_three_sixty_frames(c):
         """
         DROP TABLE IF EXISTS three_sixty_frames;
         CREATE TABLE three_sixty_frames (
-            event_uuid      TEXT PRIMARY KEY,
+            event_key       BIGINT PRIMARY KEY,
+            event_uuid      UUID UNIQUE NOT NULL,
             match_id        INTEGER,
             visible_area    TEXT,
             
-            FOREIGN KEY (event_uuid) REFERENCES events(id),
+            FOREIGN KEY (event_key)  REFERENCES events_core(event_key),
             FOREIGN KEY (match_id)   REFERENCES matches(match_id)
         );
         """
@@ -481,14 +999,129 @@ def make_three_sixty_positions(c):
         DROP TABLE IF EXISTS three_sixty_positions;
         CREATE TABLE three_sixty_positions (
             id              INTEGER PRIMARY KEY DEFAULT nextval('three_sixty_positions_seq'),
-            event_uuid      TEXT,
+            event_key       BIGINT,
+            event_uuid      UUID,
             teammate        BOOL,
             actor           BOOL,
             keeper          BOOL,
             location_x      REAL,
             location_y      REAL,
             
-            FOREIGN KEY (event_uuid) REFERENCES three_sixty_frames(event_uuid)
+            FOREIGN KEY (event_key) REFERENCES three_sixty_frames(event_key)
+        );
+        """
+    )
+
+
+def make_three_sixty_frames_packed(c):
+    """360 positions packed one row per frame as parallel player arrays."""
+    c.execute(
+        f"""
+        DROP VIEW IF EXISTS three_sixty_positions_unpacked;
+        DROP TABLE IF EXISTS three_sixty_frames_packed;
+        CREATE TABLE three_sixty_frames_packed (
+            event_key       BIGINT PRIMARY KEY,
+            match_id        INTEGER,
+            location_x      REAL[],         -- one entry per player, three_sixty_positions.id order
+            location_y      REAL[],
+            flags           UTINYINT[],     -- bitmask: 1 teammate, 2 actor, 4 keeper
+
+            FOREIGN KEY (event_key) REFERENCES three_sixty_frames(event_key),
+            FOREIGN KEY (match_id)  REFERENCES matches(match_id)
+        );
+
+        -- Row-per-player compatibility view over the packed arrays
+        CREATE VIEW three_sixty_positions_unpacked AS
+        SELECT
+            p.event_key,
+            f.event_uuid,
+            p.match_id,
+            p.player_index,
+            (p.flags & {POSITION_FLAG_TEAMMATE}) != 0 as teammate,
+            (p.flags & {POSITION_FLAG_ACTOR}) != 0 as actor,
+            (p.flags & {POSITION_FLAG_KEEPER}) != 0 as keeper,
+            p.location_x,
+            p.location_y
+        FROM (
+            SELECT
+                event_key,
+                match_id,
+                UNNEST(range(len(location_x))) as player_index,
+                UNNEST(location_x) as location_x,
+                UNNEST(location_y) as location_y,
+                UNNEST(flags) as flags
+            FROM three_sixty_frames_packed
+        ) p
+        JOIN three_sixty_frames f ON f.event_key = p.event_key;
+        """
+    )
+
+
+def make_frame_pressure(c):
+    """Actor pressure and nearest-player metrics per 360 frame."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS frame_pressure;
+        CREATE TABLE frame_pressure (
+            event_key                   BIGINT PRIMARY KEY,
+            match_id                    INTEGER,
+
+            -- Distances in metres (105 x 68 pitch); NULL when the actor is not visible
+            nearest_opponent_distance   REAL,
+            opponents_within_5m         INTEGER,
+            opponents_within_10m        INTEGER,
+            nearest_teammate_distance   REAL,
+
+            FOREIGN KEY (event_key)  REFERENCES three_sixty_frames(event_key),
+            FOREIGN KEY (match_id)   REFERENCES matches(match_id)
+        );
+        """
+    )
+
+
+def make_frame_pitch_control(c):
+    """Voronoi control of each 360 frame's visible area per team and zone grid."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS frame_pitch_control;
+        CREATE TABLE frame_pitch_control (
+            event_key           BIGINT,
+            match_id            INTEGER,
+            grid_name           TEXT,       -- zone_grids.name
+            cell_size           DOUBLE,     -- sampling lattice spacing in metres
+
+            -- Areas in square metres (105 x 68 pitch); "team" is the acting team
+            visible_area        REAL,
+            team_area           REAL,
+            opponent_area       REAL,
+            team_zone_area      REAL[],     -- row-major, one entry per zone
+            opponent_zone_area  REAL[],
+
+            PRIMARY KEY (event_key, grid_name, cell_size),
+            FOREIGN KEY (event_key)  REFERENCES three_sixty_frames(event_key),
+            FOREIGN KEY (match_id)   REFERENCES matches(match_id),
+            FOREIGN KEY (grid_name)  REFERENCES zone_grids(name)
+        );
+        """
+    )
+
+
+def make_pass_options(c):
+    """Open passing lanes from the passer to each visible teammate per 360 pass frame."""
+    c.execute(
+        """
+        DROP TABLE IF EXISTS pass_options;
+        CREATE TABLE pass_options (
+            event_key               BIGINT PRIMARY KEY,
+            match_id                INTEGER,
+            lane_clearance          REAL,       -- metres an opponent must keep from the lane
+
+            visible_teammates       INTEGER,
+            open_teammates          INTEGER,
+            open_forward_teammates  INTEGER,    -- open lanes to teammates ahead of the passer
+
+            FOREIGN KEY (event_key)  REFERENCES three_sixty_frames(event_key),
+            FOREIGN KEY (match_id)   REFERENCES matches(match_id)
         );
         """
     )
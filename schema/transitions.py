@@ -0,0 +1,86 @@
+"""Zone-to-zone ball progression transitions stored as sparse COO rows."""
+import numpy as np
+
+from .utils import _affected_seasons_sql, _events_sql
+from .zones import ZONE_GRIDS, zone_column
+
+
+TRANSITION_VALUES = ("attempts", "successes", "transition_prob", "success_prob")
+
+
+def load_zone_transitions(c, match_ids=None):
+    """Build zone_transitions from passes and carries in one grouped pass.
+
+    Each move is unnested into one (grid, from, to) triple per zone grid so
+    a single GROUP BY covers every resolution. Only non-empty cells are
+    stored. With match_ids only the competition/seasons containing those
+    matches are rebuilt.
+    """
+    seasons = _affected_seasons_sql(match_ids)
+    c.execute(f"""
+        DELETE FROM zone_transitions z
+        USING ({seasons}) s
+        WHERE z.competition_id = s.competition_id AND z.season_id = s.season_id;
+    """)
+
+    zones = ", ".join(
+        f"{{'grid_name': '{name}', "
+        f"'from_zone': e.{zone_column('location', name)}, "
+        f"'to_zone': COALESCE(e.{zone_column('pass_end', name)}, e.{zone_column('carry_end', name)})}}"
+        for name in ZONE_GRIDS
+    )
+    c.execute(f"""
+        INSERT INTO zone_transitions
+        WITH moves AS (
+            SELECT
+                m.competition_id,
+                m.season_id,
+                e.team_id,
+                e.type = 'Carry' OR e.pass_outcome IS NULL as successful,
+                UNNEST([{zones}], max_depth := 2)
+            FROM {_events_sql("event_passes", "event_carries")} e
+            JOIN matches m ON e.match_id = m.match_id
+            JOIN ({seasons}) s ON m.competition_id = s.competition_id AND m.season_id = s.season_id
+            WHERE e.type IN ('Pass', 'Carry')
+              AND e.location_x IS NOT NULL
+              AND COALESCE(e.pass_end_location_x, e.carry_end_location_x) IS NOT NULL
+        ),
+        counts AS (
+            SELECT
+                competition_id, season_id, team_id, grid_name, from_zone, to_zone,
+                COUNT(*) as attempts,
+                COUNT(*) FILTER (WHERE successful) as successes
+            FROM moves
+            GROUP BY ALL
+        )
+        SELECT
+            *,
+            attempts / SUM(attempts) OVER (PARTITION BY competition_id, season_id, team_id, grid_name, from_zone) as transition_prob,
+            successes / attempts as success_prob
+        FROM counts;
+    """)
+    return c.execute("SELECT COUNT(*) FROM zone_transitions").fetchone()[0]
+
+
+def get_transition_matrix(c, competition_id, season_id, team_id, grid_name="12x8", value="transition_prob"):
+    """Return a team-season transition matrix as a dense (zones, zones) array.
+
+    Rows are from_zone and columns to_zone; value picks the stored measure
+    (one of TRANSITION_VALUES). Cells with no moves are zero.
+    """
+    if value not in TRANSITION_VALUES:
+        raise ValueError(f"value must be one of {TRANSITION_VALUES}, got {value!r}")
+    (cols, rows), _ = ZONE_GRIDS[grid_name]
+    n_zones = cols * rows
+
+    coo = c.execute(
+        f"""
+        SELECT from_zone, to_zone, {value} as value
+        FROM zone_transitions
+        WHERE competition_id = ? AND season_id = ? AND team_id = ? AND grid_name = ?;
+        """,
+        [competition_id, season_id, team_id, grid_name],
+    ).fetchnumpy()
+    matrix = np.zeros((n_zones, n_zones))
+    matrix[coo["from_zone"].astype(np.int64), coo["to_zone"].astype(np.int64)] = coo["value"]
+    return matrix
@@ -14,3 +14,84 @@ def _get_player_name_case():
             ELSE player.name
         END
     """
+
+
+# StatsBomb pitch dimensions (yards); each team attacks towards x = 120
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+# Metric pitch used when distances must be in metres (as in SPADL)
+PITCH_LENGTH_M = 105.0
+PITCH_WIDTH_M = 68.0
+GOAL_Y_LOW = 36.0
+GOAL_Y_HIGH = 44.0
+
+
+def _grid_cell_sql(x_col, y_col, grid):
+    """SQL expression for the flat cell index of a point on a (cols, rows) grid.
+
+    Cells are numbered row-major from the bottom-left corner; points on or
+    beyond the touchlines are clamped into the edge cells.
+    """
+    cols, rows = grid
+    return f"""(
+        LEAST(GREATEST(FLOOR({y_col}::DOUBLE / {PITCH_WIDTH} * {rows}), 0), {rows - 1}) * {cols}
+        + LEAST(GREATEST(FLOOR({x_col}::DOUBLE / {PITCH_LENGTH} * {cols}), 0), {cols - 1})
+    )::INTEGER"""
+
+
+# Period-major integer clock: period * CLOCK_PERIOD_FACTOR + seconds of match time.
+# Match time restarts at 45:00 in the second half, so seconds alone do not
+# order first-half stoppage time before the second half.
+CLOCK_PERIOD_FACTOR = 10000
+
+
+def _clock_sql(period_col, seconds_sql):
+    """SQL expression for the period-major integer clock."""
+    return f"({period_col} * {CLOCK_PERIOD_FACTOR} + {seconds_sql})"
+
+
+# Dense BIGINT surrogate event key: match_id * EVENT_KEY_FACTOR + index_num.
+# Joins and foreign keys between events and the 360 tables use it instead of
+# hashing 36-character UUID strings; events.id stays as the lookup attribute.
+EVENT_KEY_FACTOR = 10000
+
+
+def _event_key_sql(match_sql, index_sql):
+    """SQL expression for the surrogate event key."""
+    return f"(({match_sql})::BIGINT * {EVENT_KEY_FACTOR} + ({index_sql}))"
+
+
+def _events_sql(*extensions):
+    """events_core LEFT JOINed to only the given extension tables, as a subquery.
+
+    Gives the events view's column names for those tables without joining
+    the other extensions. Extension BOOLEAN columns are NULL rather than
+    false on events that do not carry the object.
+    """
+    joins = "".join(f" LEFT JOIN {table} USING (event_key)" for table in extensions)
+    return f"(SELECT * FROM events_core{joins})"
+
+
+def _mmss_seconds_sql(col):
+    """SQL expression converting a 'MM:SS' lineup time to seconds."""
+    return f"(split_part({col}, ':', 1)::INTEGER * 60 + split_part({col}, ':', 2)::INTEGER)"
+
+
+def _match_filter(match_ids, column="match_id"):
+    """SQL predicate restricting a derived-table build to the given matches.
+
+    None means all matches, which is the full-build path.
+    """
+    if match_ids is None:
+        return "TRUE"
+    ids = ", ".join(str(int(m)) for m in match_ids)
+    return f"{column} IN ({ids})" if ids else "FALSE"
+
+
+def _affected_seasons_sql(match_ids):
+    """Competition/seasons containing the given matches, for season-level tables."""
+    return f"""
+        SELECT DISTINCT competition_id, season_id
+        FROM matches
+        WHERE {_match_filter(match_ids)}
+    """
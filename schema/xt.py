@@ -0,0 +1,208 @@
+"""Expected Threat (xT) grids and per-action xT added.
+
+Each cell's value is solved by fixed-point iteration of
+xT = P(shot) * P(goal | shot) + P(move) * T @ xT (Karun Singh's model).
+"""
+import numpy as np
+
+from .utils import _events_sql, _grid_cell_sql
+
+
+# 16 x 12 cells of 7.5 x 6.67 yards, the usual xT resolution
+DEFAULT_XT_GRID = (16, 12)
+
+
+def _xt_actions_sql(grid):
+    """Passes, carries and non-penalty shots with their start and end cells."""
+    start_cell = _grid_cell_sql("e.location_x", "e.location_y", grid)
+    end_cell = _grid_cell_sql("e.end_x", "e.end_y", grid)
+    return f"""
+        SELECT
+            e.*,
+            {start_cell} as start_cell,
+            CASE WHEN e.type = 'Shot' THEN NULL ELSE {end_cell} END as end_cell,
+            e.type = 'Shot' as is_shot,
+            e.type = 'Shot' AND e.shot_outcome = 'Goal' as is_goal,
+            (e.type = 'Pass' AND e.pass_outcome IS NULL) OR e.type = 'Carry' as is_success
+        FROM (
+            SELECT
+                ev.event_key, ev.match_id, m.competition_id, m.season_id, ev.team_id, ev.player_id, ev.type,
+                ev.location_x, ev.location_y, ev.pass_outcome, ev.shot_outcome,
+                COALESCE(ev.pass_end_location_x, ev.carry_end_location_x) as end_x,
+                COALESCE(ev.pass_end_location_y, ev.carry_end_location_y) as end_y
+            FROM {_events_sql("event_passes", "event_carries", "event_shots")} ev
+            JOIN matches m ON ev.match_id = m.match_id
+            WHERE ev.location_x IS NOT NULL
+              AND (ev.type IN ('Pass', 'Carry') OR (ev.type = 'Shot' AND ev.shot_type IS DISTINCT FROM 'Penalty'))
+        ) e
+        WHERE e.type = 'Shot' OR e.end_x IS NOT NULL
+    """
+
+
+def solve_xt(start_cell, end_cell, is_shot, is_goal, is_success, n_cells, tol=1e-5, max_iter=100):
+    """Solve the xT value function for one set of actions.
+
+    All arguments except n_cells are equal-length NumPy arrays, one entry per
+    action; end_cell is ignored for shots. Returns (values, iterations) where
+    values is a flat array of n_cells xT values.
+    """
+    start_cell = np.asarray(start_cell, dtype=np.int64)
+    is_shot = np.asarray(is_shot, dtype=bool)
+    is_goal = np.asarray(is_goal, dtype=bool)
+    is_move = ~is_shot
+    is_success = np.asarray(is_success, dtype=bool) & is_move
+
+    shots = np.bincount(start_cell[is_shot], minlength=n_cells).astype(np.float64)
+    goals = np.bincount(start_cell[is_goal], minlength=n_cells).astype(np.float64)
+    moves = np.bincount(start_cell[is_move], minlength=n_cells).astype(np.float64)
+    actions = shots + moves
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shot_prob = np.where(actions > 0, shots / actions, 0.0)
+        move_prob = np.where(actions > 0, moves / actions, 0.0)
+        goal_prob = np.where(shots > 0, goals / shots, 0.0)
+
+    # Transition matrix: successful moves from -> to over all moves from a cell,
+    # so failed moves carry zero value
+    end_cell = np.asarray(end_cell, dtype=np.int64)[is_success]
+    pairs = np.bincount(start_cell[is_success] * n_cells + end_cell, minlength=n_cells * n_cells)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        transitions = np.where(
+            moves[:, None] > 0, pairs.reshape(n_cells, n_cells) / moves[:, None], 0.0
+        )
+
+    payoff = shot_prob * goal_prob
+    values = np.zeros(n_cells)
+    iterations = 0
+    while iterations < max_iter:
+        iterations += 1
+        updated = payoff + move_prob * (transitions @ values)
+        converged = np.max(np.abs(updated - values)) < tol
+        values = updated
+        if converged:
+            break
+    return values, iterations
+
+
+def _xt_fingerprints(c, grid):
+    """Current events fingerprint for every competition/season with xT actions."""
+    rows = c.execute(f"""
+        SELECT
+            competition_id,
+            season_id,
+            -- Everything that decides an action's inclusion, attribution or value
+            CAST(hash(COUNT(*), bit_xor(hash(
+                event_key, type, team_id, player_id,
+                location_x, location_y, end_x, end_y, pass_outcome, shot_outcome
+            ))) AS TEXT) as fingerprint
+        FROM ({_xt_actions_sql(grid)})
+        GROUP BY competition_id, season_id;
+    """).fetchall()
+    return {(cid, sid): fp for cid, sid, fp in rows}
+
+
+def load_expected_threat(c, grid=DEFAULT_XT_GRID, force=False):
+    """Build cached xT grids and the action_xt table at one grid resolution.
+
+    Only competition/seasons whose events fingerprint differs from the cached
+    grid are recomputed (all of them when force=True); their action_xt rows
+    at this resolution are then rewritten in one set-based statement, so
+    each resolution keeps its own grids and action values. Grids and action
+    values of competition/seasons that no longer have xT actions are
+    deleted. Returns the number of grids recomputed.
+    """
+    cols, rows = grid
+    n_cells = cols * rows
+
+    current = _xt_fingerprints(c, grid)
+    cached = dict(
+        ((cid, sid), fp) for cid, sid, fp in c.execute(
+            "SELECT competition_id, season_id, fingerprint FROM xt_grids WHERE grid_cols = ? AND grid_rows = ?;",
+            [cols, rows],
+        ).fetchall()
+    )
+    stale = [key for key, fp in current.items() if force or cached.get(key) != fp]
+
+    for competition_id, season_id in cached.keys() - current.keys():
+        for table in ("action_xt", "xt_grids"):
+            c.execute(
+                f"DELETE FROM {table} WHERE competition_id = ? AND season_id = ? AND grid_cols = ? AND grid_rows = ?;",
+                [competition_id, season_id, cols, rows],
+            )
+
+    for competition_id, season_id in stale:
+        actions = c.execute(f"""
+            SELECT start_cell, COALESCE(end_cell, 0) as end_cell, is_shot, is_goal, is_success
+            FROM ({_xt_actions_sql(grid)})
+            WHERE competition_id = ? AND season_id = ?;
+        """, [competition_id, season_id]).fetchnumpy()
+        values, iterations = solve_xt(
+            actions["start_cell"], actions["end_cell"], actions["is_shot"],
+            actions["is_goal"], actions["is_success"], n_cells,
+        )
+
+        c.execute(
+            "DELETE FROM xt_grids WHERE competition_id = ? AND season_id = ? AND grid_cols = ? AND grid_rows = ?;",
+            [competition_id, season_id, cols, rows],
+        )
+        c.execute(
+            "INSERT INTO xt_grids VALUES (?, ?, ?, ?, ?, ?, ?);",
+            [competition_id, season_id, cols, rows, values.tolist(), iterations,
+             current[(competition_id, season_id)]],
+        )
+        _load_action_xt(c, competition_id, season_id, grid)
+
+    return len(stale)
+
+
+def _load_action_xt(c, competition_id, season_id, grid):
+    """Rewrite action_xt for one competition/season and grid from its cached grid."""
+    cols, rows = grid
+    c.execute(
+        "DELETE FROM action_xt WHERE competition_id = ? AND season_id = ? AND grid_cols = ? AND grid_rows = ?;",
+        [competition_id, season_id, cols, rows],
+    )
+    c.execute(f"""
+        INSERT INTO action_xt
+        WITH cells AS (
+            SELECT
+                UNNEST(xt_values) as xt,
+                UNNEST(generate_series(0, len(xt_values) - 1)) as cell
+            FROM xt_grids
+            WHERE competition_id = $competition_id AND season_id = $season_id
+              AND grid_cols = $cols AND grid_rows = $rows
+        )
+        SELECT
+            a.event_key,
+            a.match_id,
+            a.competition_id,
+            a.season_id,
+            $cols as grid_cols,
+            $rows as grid_rows,
+            a.team_id,
+            a.player_id,
+            a.type,
+            a.is_success as successful,
+            a.start_cell,
+            a.end_cell,
+            s.xt as xt_start,
+            CASE WHEN a.is_success THEN t.xt END as xt_end,
+            CASE WHEN a.is_success THEN t.xt - s.xt END as xt_added
+        FROM ({_xt_actions_sql(grid)}) a
+        JOIN cells s ON s.cell = a.start_cell
+        LEFT JOIN cells t ON t.cell = a.end_cell
+        WHERE NOT a.is_shot
+          AND a.competition_id = $competition_id AND a.season_id = $season_id;
+    """, {"competition_id": competition_id, "season_id": season_id, "cols": cols, "rows": rows})
+
+
+def get_xt_grid(c, competition_id, season_id, grid=DEFAULT_XT_GRID):
+    """Return a cached xT grid as a (rows, cols) array, or None if not built."""
+    cols, rows = grid
+    row = c.execute(
+        "SELECT xt_values FROM xt_grids WHERE competition_id = ? AND season_id = ? AND grid_cols = ? AND grid_rows = ?;",
+        [competition_id, season_id, cols, rows],
+    ).fetchone()
+    if row is None:
+        return None
+    return np.asarray(row[0], dtype=np.float64).reshape(rows, cols)
@@ -0,0 +1,62 @@
+"""Pitch zone grids and the integer zone-id columns stored on events.
+
+Zone ids are row-major cell numbers from the bottom-left corner (the same
+layout as the xT grids), so zone aggregates are integer GROUP BYs.
+"""
+from .utils import PITCH_LENGTH, PITCH_WIDTH, _grid_cell_sql
+
+
+# name -> ((cols along the pitch length, rows across its width), description)
+ZONE_GRIDS = {
+    "12x8": ((12, 8), "10 x 10 yard cells"),
+    "18x12": ((18, 12), "6.67 x 6.67 yard cells"),
+    "lanes": ((3, 6), "Thirds of the pitch x 6 vertical lanes"),
+}
+
+# Event location fields that get a zone column per grid
+ZONE_FIELDS = ("location", "pass_end", "carry_end", "shot_end")
+
+
+def zone_column(field, grid_name):
+    """Name of the events column holding field's zone on the named grid."""
+    return f"{field}_zone_{grid_name}"
+
+
+def _zone_columns_ddl(fields=ZONE_FIELDS):
+    """Column definitions for the zone columns of fields, for the events DDL."""
+    return "".join(
+        f"{zone_column(field, name):<28}SMALLINT,\n                "
+        for field in fields
+        for name in ZONE_GRIDS
+    )
+
+
+def _zone_columns_sql(sources):
+    """Select-list expressions computing every zone column.
+
+    sources maps each of ZONE_FIELDS to the (x, y) SQL expressions of that
+    location; locations with no coordinates get a NULL zone.
+    """
+    columns = []
+    for field in ZONE_FIELDS:
+        x_sql, y_sql = sources[field]
+        for name, (grid, _) in ZONE_GRIDS.items():
+            cell = _grid_cell_sql(x_sql, y_sql, grid)
+            columns.append(
+                f"CASE WHEN ({x_sql}) IS NOT NULL AND ({y_sql}) IS NOT NULL "
+                f"THEN {cell}::SMALLINT END as {zone_column(field, name)}"
+            )
+    return ",\n            ".join(columns)
+
+
+def load_zone_grids(c):
+    """Populate the zone_grids registry from ZONE_GRIDS."""
+    c.execute("DELETE FROM zone_grids;")
+    c.executemany(
+        "INSERT INTO zone_grids VALUES (?, ?, ?, ?, ?, ?);",
+        [
+            [name, cols, rows, PITCH_LENGTH / cols, PITCH_WIDTH / rows, description]
+            for name, ((cols, rows), description) in ZONE_GRIDS.items()
+        ],
+    )
+    return c.execute("SELECT COUNT(*) FROM zone_grids").fetchone()[0]
@@ -5,13 +5,19 @@ import os
 
 
 @pytest.fixture(scope="session")
-def db_connection():
-    """Create a DuckDB connection to the stats.duckdb database."""
+def db_path():
+    """Path of the stats.duckdb database; skips when it has not been built."""
     db_path = "stats.duckdb"
     
     if not os.path.exists(db_path):
         pytest.skip(f"Database file {db_path} not found. Run build.py first.")
     
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def db_connection(db_path):
+    """Create a DuckDB connection to the stats.duckdb database."""
     db = duckdb.connect(db_path)
     yield db
     db.close()
@@ -22,3 +28,13 @@ def cursor(db_connection):
     """Create a cursor for executing queries."""
     return db_connection.cursor()
 
+
+
+@pytest.fixture(scope="function")
+def scratch_cursor(db_connection):
+    """Create a cursor inside a transaction that is rolled back after the test, for tests that write."""
+    cursor = db_connection.cursor()
+    cursor.execute("BEGIN TRANSACTION;")
+    yield cursor
+    cursor.execute("ROLLBACK;")
+    cursor.close()
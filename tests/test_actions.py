@@ -0,0 +1,98 @@
+"""Tests for the SPADL-style actions table."""
+import pytest
+
+from schema.derived import KEEPER_SAVE_TYPES
+
+
+class TestActionSequence:
+    """Test the normalized per-match action sequence."""
+
+    def test_action_ids_are_contiguous(self, cursor):
+        """Test that action_id runs from 0 to n-1 within each match."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM (
+                SELECT match_id, MIN(action_id) as lo, MAX(action_id) as hi, COUNT(*) as n
+                FROM actions
+                GROUP BY match_id
+            )
+            WHERE lo != 0 OR hi != n - 1;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} matches with gaps in action_id"
+
+    def test_action_order_follows_events(self, cursor):
+        """Test that action order matches event order within each period."""
+        cursor.execute("""
+            WITH ordered AS (
+                SELECT
+                    e.index_num,
+                    LEAD(e.index_num) OVER (PARTITION BY a.match_id ORDER BY a.action_id) as next_index
+                FROM actions a
+                JOIN events e ON a.event_key = e.event_key
+            )
+            SELECT COUNT(*) FROM ordered WHERE next_index < index_num;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} actions out of event order"
+
+
+class TestActionCoverage:
+    """Test that the core on-ball events are converted."""
+
+    @pytest.mark.parametrize("event_type", ["Pass", "Carry", "Shot", "Dribble", "Clearance", "Interception"])
+    def test_event_type_converted(self, cursor, event_type):
+        """Test that every located event of the type has an action."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM events e
+            LEFT JOIN actions a ON a.event_key = e.event_key
+            WHERE e.type = ? AND e.location_x IS NOT NULL AND a.event_key IS NULL;
+        """, [event_type])
+        missing = cursor.fetchone()[0]
+        assert missing == 0, f"Found {missing} {event_type} events without an action"
+
+    def test_keeper_saves_converted(self, cursor):
+        """Test that every located keeper save, including smothers and saves to the post, is a keeper_save."""
+        cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM events e
+            LEFT JOIN actions a ON a.event_key = e.event_key
+            WHERE e.type = 'Goal Keeper' AND e.goalkeeper_type::VARCHAR IN ({", ".join(f"'{t}'" for t in KEEPER_SAVE_TYPES)})
+              AND e.location_x IS NOT NULL AND a.type_name IS DISTINCT FROM 'keeper_save';
+        """)
+        missing = cursor.fetchone()[0]
+        assert missing == 0, f"Found {missing} keeper saves not converted to keeper_save"
+
+
+class TestActionValues:
+    """Test SPADL coordinates and results."""
+
+    def test_coordinates_in_spadl_pitch(self, cursor):
+        """Test that coordinates fall on a 105 x 68 pitch."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM actions
+            WHERE start_x NOT BETWEEN 0 AND 105 OR start_y NOT BETWEEN 0 AND 68
+               OR end_x NOT BETWEEN 0 AND 105 OR end_y NOT BETWEEN 0 AND 68;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} actions outside the SPADL pitch"
+
+    def test_throw_ins_use_other_bodypart(self, cursor):
+        """Test that throw-ins are taken with the 'other' body part, as in SPADL."""
+        cursor.execute("SELECT COUNT(*) FROM actions WHERE type_name = 'throw_in' AND bodypart_name != 'other';")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} throw-ins with a foot or head body part"
+
+    def test_shot_success_means_goal(self, cursor):
+        """Test that successful shots are exactly the goals."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM actions a
+            JOIN events e ON a.event_key = e.event_key
+            WHERE a.type_name IN ('shot', 'shot_penalty', 'shot_freekick')
+              AND (a.result_name = 'success') != (e.shot_outcome = 'Goal');
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} shots whose result disagrees with the outcome"
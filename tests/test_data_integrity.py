@@ -1,6 +1,8 @@
 """Tests for data integrity: primary keys, foreign keys, and referential integrity."""
 import pytest
 
+from schema.utils import EVENT_KEY_FACTOR
+
 
 class TestPrimaryKeys:
     """Test that primary keys are unique and non-null."""
@@ -125,6 +127,15 @@ class TestPrimaryKeys:
         null_count = cursor.fetchone()[0]
         assert null_count == 0, f"Found {null_count} events with NULL id"
 
+    def test_events_event_key_derivation(self, cursor):
+        """Test that event_key is match_id * EVENT_KEY_FACTOR + index_num."""
+        cursor.execute(f"""
+            SELECT COUNT(*) FROM events
+            WHERE event_key IS DISTINCT FROM match_id::BIGINT * {EVENT_KEY_FACTOR} + index_num;
+        """)
+        mismatched = cursor.fetchone()[0]
+        assert mismatched == 0, f"Found {mismatched} events whose event_key does not match match_id/index_num"
+
 
 class TestForeignKeys:
     """Test foreign key referential integrity."""
@@ -263,6 +274,23 @@ class TestForeignKeys:
             f"Found {orphaned} events with invalid pass_recipient_id references"
         )
 
+    @pytest.mark.parametrize("id_column,key_column", [
+        ("shot_key_pass_id", "shot_key_pass_key"),
+        ("pass_assisted_shot_id", "pass_assisted_shot_key"),
+    ])
+    def test_event_reference_keys(self, cursor, id_column, key_column):
+        """Test that surrogate reference keys point at the same event as the UUID references."""
+        cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM events e
+            LEFT JOIN events ref ON ref.event_key = e.{key_column}
+            WHERE e.{id_column} IS NOT NULL AND ref.id IS DISTINCT FROM e.{id_column};
+        """)
+        mismatched = cursor.fetchone()[0]
+        assert mismatched == 0, (
+            f"Found {mismatched} events whose {key_column} disagrees with {id_column}"
+        )
+
 
 class TestDataConsistency:
     """Test data consistency across related tables."""
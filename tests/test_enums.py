@@ -0,0 +1,84 @@
+"""Tests for the data-driven ENUM columns on events."""
+import pytest
+
+from schema.benchmarks import benchmark_enum_columns
+from schema.enums import ENUM_MAX_CARDINALITY
+from schema.tables import EVENT_ENUM_COLUMNS
+
+
+# Hand-written ENUMs with fixed vocabularies, not inferred from data
+FIXED_ENUM_COLUMNS = {"shot_outcome", "pass_outcome"}
+
+# Free-text columns that must stay TEXT whatever the corpus size
+NAME_COLUMNS = ["player", "team", "possession_team", "pass_recipient", "substitution_replacement_name"]
+
+
+def get_enum_columns(cursor):
+    """events columns stored as ENUM types."""
+    cursor.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = 'events' AND data_type LIKE 'ENUM%';
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+class TestInferredEnums:
+    """Test the ENUM types inferred from the staged events."""
+
+    def test_fixed_enums_kept(self, cursor):
+        """Test that the hand-written outcome ENUMs are still used."""
+        assert FIXED_ENUM_COLUMNS <= set(get_enum_columns(cursor))
+
+    def test_enum_values_match_data(self, cursor):
+        """Test that every inferred ENUM holds exactly the values seen in its column."""
+        for column in set(get_enum_columns(cursor)) - FIXED_ENUM_COLUMNS:
+            cursor.execute(f"""
+                SELECT
+                    (SELECT list_sort(enum_range("{column}")) FROM events WHERE "{column}" IS NOT NULL LIMIT 1),
+                    (SELECT list_sort(list(DISTINCT "{column}"::VARCHAR) FILTER (WHERE "{column}" IS NOT NULL))
+                     FROM events);
+            """)
+            enum_values, data_values = cursor.fetchone()
+            assert enum_values == data_values, f"ENUM for {column} does not match its values"
+
+    def test_enum_cardinality_under_threshold(self, cursor):
+        """Test that no inferred ENUM exceeds the cardinality threshold."""
+        for column in set(get_enum_columns(cursor)) - FIXED_ENUM_COLUMNS:
+            cursor.execute(f'SELECT COUNT(DISTINCT "{column}") FROM events;')
+            assert cursor.fetchone()[0] <= ENUM_MAX_CARDINALITY, f"{column} exceeds the ENUM threshold"
+
+    def test_candidates_inferred(self, cursor):
+        """Test that every candidate column within the threshold is stored as an ENUM."""
+        enum_columns = set(get_enum_columns(cursor))
+        for column in EVENT_ENUM_COLUMNS:
+            cursor.execute(f'SELECT COUNT(DISTINCT "{column}") FROM events;')
+            count = cursor.fetchone()[0]
+            if 0 < count <= ENUM_MAX_CARDINALITY:
+                assert column in enum_columns, f"{column} should have been inferred as an ENUM"
+
+    def test_only_candidates_inferred(self, cursor):
+        """Test that no column outside the categorical allowlist became an ENUM."""
+        unexpected = set(get_enum_columns(cursor)) - FIXED_ENUM_COLUMNS - set(EVENT_ENUM_COLUMNS)
+        assert not unexpected, f"Columns inferred as ENUM outside EVENT_ENUM_COLUMNS: {sorted(unexpected)}"
+
+    @pytest.mark.parametrize("column", NAME_COLUMNS)
+    def test_names_stay_text(self, cursor, column):
+        """Test that name columns stay TEXT even on a small build."""
+        cursor.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'events' AND column_name = ?;
+        """, [column])
+        assert cursor.fetchone()[0] == "VARCHAR"
+
+
+class TestEnumBenchmark:
+    """Test the VARCHAR vs ENUM benchmark."""
+
+    def test_reports_both_layouts(self, cursor):
+        """Test that the benchmark reports both layouts and ENUMs are no larger."""
+        columns = [c for c in get_enum_columns(cursor) if c not in FIXED_ENUM_COLUMNS]
+        if not columns:
+            pytest.skip("No inferred ENUM columns")
+        results = benchmark_enum_columns(cursor, columns[:3], repeat=1)
+        assert set(results) == {"VARCHAR", "ENUM"}
+        assert results["ENUM"]["bytes"] <= results["VARCHAR"]["bytes"]
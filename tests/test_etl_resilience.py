@@ -35,7 +35,7 @@ class TestSchemaResilience:
 
     def test_primary_keys_defined(self, cursor):
         """Verify that critical tables have primary keys defined in the schema."""
-        tables_to_check = ['competitions', 'matches', 'teams', 'events', 'lineups']
+        tables_to_check = ['competitions', 'matches', 'teams', 'events_core', 'lineups']
         for table in tables_to_check:
             # query to find table schema
             cursor.execute(f"PRAGMA table_info('{table}')")
@@ -48,18 +48,18 @@ class TestSchemaResilience:
         cursor.execute("""
             SELECT count(*) 
             FROM duckdb_constraints() 
-            WHERE table_name = 'events' AND constraint_type = 'FOREIGN KEY';
+            WHERE table_name = 'events_core' AND constraint_type = 'FOREIGN KEY';
         """)
         fk_count = cursor.fetchone()[0]
-        assert fk_count > 0, "No foreign keys found on the events table"
+        assert fk_count > 0, "No foreign keys found on the events_core table"
         
         # Check specific critical FKs
         cursor.execute("""
             SELECT referenced_table 
             FROM duckdb_constraints() 
-            WHERE table_name = 'events' AND constraint_type = 'FOREIGN KEY';
+            WHERE table_name = 'events_core' AND constraint_type = 'FOREIGN KEY';
         """)
         referencing_tables = {row[0] for row in cursor.fetchall()}
         expected_refs = {'matches', 'teams', 'players', 'event_types'}
         for ref in expected_refs:
-            assert ref in referencing_tables, f"Missing FK reference from events to {ref}"
+            assert ref in referencing_tables, f"Missing FK reference from events_core to {ref}"
@@ -0,0 +1,80 @@
+"""Tests for the vertically partitioned events layout."""
+import pytest
+
+from schema.benchmarks import EVENT_PARTITION_QUERIES, benchmark_event_partitions
+from schema.tables import EVENT_EXTENSIONS
+
+
+class TestEventPartitions:
+    """Test that events_core, the extension tables and the events view agree."""
+
+    def test_view_has_one_row_per_event(self, cursor):
+        """Test that the events view neither drops nor duplicates core events."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM events_core),
+                (SELECT COUNT(*) FROM events),
+                (SELECT COUNT(DISTINCT event_key) FROM events);
+        """)
+        core, view, distinct = cursor.fetchone()
+        assert core == view == distinct
+
+    @pytest.mark.parametrize("table", EVENT_EXTENSIONS.keys())
+    def test_extension_rows_have_core_event(self, cursor, table):
+        """Test that every extension row belongs to an event in events_core."""
+        cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM {table} x
+            LEFT JOIN events_core e ON e.event_key = x.event_key
+            WHERE e.event_key IS NULL;
+        """)
+        orphans = cursor.fetchone()[0]
+        assert orphans == 0, f"Found {orphans} {table} rows without a core event"
+
+    @pytest.mark.parametrize("table,event_type", [("event_shots", "Shot"), ("event_passes", "Pass")])
+    def test_type_partitions(self, cursor, table, event_type):
+        """Test that shot and pass extension rows are exactly the events of that type."""
+        cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM events_core e
+            FULL JOIN {table} x ON x.event_key = e.event_key
+            WHERE (e.type = '{event_type}') IS DISTINCT FROM (x.event_key IS NOT NULL);
+        """)
+        mismatches = cursor.fetchone()[0]
+        assert mismatches == 0, f"Found {mismatches} events misplaced relative to {table}"
+
+    def test_view_booleans_never_null(self, cursor):
+        """Test that extension flags read false, not NULL, for events without the extension."""
+        cursor.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'events' AND data_type = 'BOOLEAN';
+        """)
+        columns = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT " + ", ".join(f"COUNT(*) FILTER (WHERE {column} IS NULL)" for column in columns)
+            + " FROM events;"
+        )
+        nulls = {column: n for column, n in zip(columns, cursor.fetchone()) if n}
+        assert not nulls, f"Found NULL flags in the events view: {nulls}"
+
+
+class TestPartitionBenchmark:
+    """Test the wide view vs extension table benchmark."""
+
+    @pytest.mark.parametrize("view,narrow", [("wide_view", "extension"), ("core_wide_view", "events_core")])
+    def test_benchmark_queries_equivalent(self, cursor, view, narrow):
+        """Test that the view and narrow-table queries return the same aggregates."""
+        results = {
+            name: sorted(
+                (team, n, round(total or 0, 3), flagged)
+                for team, n, total, flagged in cursor.execute(EVENT_PARTITION_QUERIES[name]).fetchall()
+            )
+            for name in (view, narrow)
+        }
+        assert results[view] == results[narrow]
+
+    def test_benchmark_reports_both_layouts(self, cursor):
+        """Test that the benchmark times both queries."""
+        timings = benchmark_event_partitions(cursor, repeat=1)
+        assert set(timings) == set(EVENT_PARTITION_QUERIES)
+        assert all(t >= 0 for t in timings.values())
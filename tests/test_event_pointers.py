@@ -0,0 +1,57 @@
+"""Tests for the precomputed prev/next event pointers."""
+import pytest
+
+
+class TestEventPointers:
+    """Test that pointers link consecutive events within a match period."""
+
+    def test_pointers_match_window_functions(self, cursor):
+        """Test that stored pointers equal LAG/LEAD over index order."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM (
+                SELECT
+                    prev_event_key,
+                    next_event_key,
+                    LAG(event_key) OVER w as expected_prev,
+                    LEAD(event_key) OVER w as expected_next
+                FROM events
+                WINDOW w AS (PARTITION BY match_id, period ORDER BY index_num)
+            )
+            WHERE prev_event_key IS DISTINCT FROM expected_prev
+               OR next_event_key IS DISTINCT FROM expected_next;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with stale sequence pointers"
+
+    def test_pointers_round_trip(self, cursor):
+        """Test that following next then prev returns to the same event."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM events e
+            JOIN events n ON n.event_key = e.next_event_key
+            WHERE n.prev_event_key != e.event_key
+               OR n.match_id != e.match_id
+               OR n.period != e.period
+               OR n.index_num <= e.index_num;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} next pointers that do not round-trip"
+
+    def test_next_same_team_event(self, cursor):
+        """Test that the same-team pointer is the team's next event in the period."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM events e
+            JOIN events n ON n.event_key = e.next_same_team_event_key
+            WHERE n.team_id != e.team_id
+               OR n.period != e.period
+               OR n.index_num <= e.index_num
+               OR EXISTS (
+                   SELECT 1 FROM events b
+                   WHERE b.match_id = e.match_id AND b.period = e.period AND b.team_id = e.team_id
+                     AND b.index_num > e.index_num AND b.index_num < n.index_num
+               );
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} same-team pointers that skip or cross teams"
@@ -0,0 +1,78 @@
+"""Tests for the event_relations edge table and chain traversal helper."""
+import pytest
+
+from schema.queries import get_event_chains
+
+
+class TestEventRelationIntegrity:
+    """Test that relation edges point at real events in the same match."""
+
+    def test_related_keys_link_to_valid_events(self, cursor):
+        """Test that every related_key resolves to an event."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM event_relations r
+            LEFT JOIN events e ON r.related_key = e.event_key
+            WHERE e.event_key IS NULL;
+        """)
+        orphans = cursor.fetchone()[0]
+        assert orphans == 0, f"Found {orphans} relations pointing at non-existent events"
+
+    def test_relations_stay_within_match(self, cursor):
+        """Test that both ends of a relation belong to the relation's match."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM event_relations r
+            JOIN events a ON r.event_key = a.event_key
+            JOIN events b ON r.related_key = b.event_key
+            WHERE a.match_id != r.match_id OR b.match_id != r.match_id;
+        """)
+        mismatches = cursor.fetchone()[0]
+        assert mismatches == 0, f"Found {mismatches} relations crossing match boundaries"
+
+    def test_completed_passes_relate_to_ball_receipt(self, cursor):
+        """Test that most completed passes link to a Ball Receipt* event."""
+        cursor.execute("""
+            SELECT
+                COUNT(*) as passes,
+                COUNT(*) FILTER (WHERE EXISTS (
+                    SELECT 1
+                    FROM event_relations r
+                    JOIN events b ON r.related_key = b.event_key
+                    WHERE r.event_key = p.event_key AND b.type = 'Ball Receipt*'
+                )) as linked
+            FROM events p
+            WHERE p.type = 'Pass' AND p.pass_outcome IS NULL;
+        """)
+        passes, linked = cursor.fetchone()
+        if passes > 0:
+            assert linked / passes > 0.95, f"Only {linked}/{passes} completed passes link to a ball receipt"
+
+
+class TestEventChains:
+    """Test the recursive chain traversal helper."""
+
+    @pytest.fixture
+    def sample_match_id(self, cursor):
+        cursor.execute("SELECT match_id FROM event_relations LIMIT 1;")
+        row = cursor.fetchone()
+        if row is None:
+            pytest.skip("No event relations loaded")
+        return row[0]
+
+    def test_chains_include_direct_relations(self, cursor, sample_match_id):
+        """Test that every direct relation of the match appears at depth 1."""
+        chains = get_event_chains(cursor, sample_match_id)
+        depth_one = {(a, b) for a, b, depth in chains if depth == 1}
+        cursor.execute(
+            "SELECT event_key, related_key FROM event_relations WHERE match_id = ?;",
+            [sample_match_id],
+        )
+        direct = set(cursor.fetchall())
+        assert direct <= depth_one, f"{len(direct - depth_one)} direct relations missing from chains"
+
+    def test_chains_respect_max_depth(self, cursor, sample_match_id):
+        """Test that no chain exceeds the requested depth or loops back to its start."""
+        chains = get_event_chains(cursor, sample_match_id, max_depth=2)
+        assert all(depth <= 2 for _, _, depth in chains)
+        assert all(a != b for a, b, _ in chains), "Chain walked back to its starting event"
@@ -0,0 +1,142 @@
+"""Tests for the Expected Threat (xT) engine and its cached grids."""
+import numpy as np
+import pytest
+
+import schema.xt as xt
+from schema.xt import DEFAULT_XT_GRID, get_xt_grid, load_expected_threat, solve_xt
+
+
+class TestXTSolver:
+    """Test the vectorized value iteration on synthetic actions."""
+
+    def test_shot_only_cell_equals_conversion_rate(self):
+        """Test that a cell where players only shoot is worth its goal rate."""
+        # Cell 1: four shots, one goal
+        values, _ = solve_xt(
+            start_cell=[1, 1, 1, 1], end_cell=[0, 0, 0, 0],
+            is_shot=[True] * 4, is_goal=[True, False, False, False],
+            is_success=[False] * 4, n_cells=2,
+        )
+        assert values[1] == pytest.approx(0.25)
+        assert values[0] == 0
+
+    def test_move_into_shooting_cell_inherits_value(self):
+        """Test that always moving successfully into a scoring cell propagates its value."""
+        # Cell 0 always passes to cell 1; cell 1 always shoots and scores half the time
+        values, iterations = solve_xt(
+            start_cell=[0, 0, 1, 1], end_cell=[1, 1, 0, 0],
+            is_shot=[False, False, True, True], is_goal=[False, False, True, False],
+            is_success=[True, True, False, False], n_cells=2,
+        )
+        assert values[1] == pytest.approx(0.5)
+        assert values[0] == pytest.approx(0.5, abs=1e-4)
+        assert iterations < 100
+
+    def test_failed_moves_dilute_value(self):
+        """Test that failed moves count against a cell's move probability."""
+        values, _ = solve_xt(
+            start_cell=[0, 0, 1], end_cell=[1, 1, 0],
+            is_shot=[False, False, True], is_goal=[False, False, True],
+            is_success=[True, False, False], n_cells=2,
+        )
+        assert values[0] == pytest.approx(0.5, abs=1e-4)
+
+
+class TestXTGrids:
+    """Test the cached grids built from events."""
+
+    def test_grid_per_competition_season(self, cursor):
+        """Test that every competition/season with passes has an xT grid."""
+        cursor.execute("""
+            SELECT COUNT(DISTINCT (m.competition_id, m.season_id))
+            FROM events e
+            JOIN matches m ON e.match_id = m.match_id
+            LEFT JOIN xt_grids g ON g.competition_id = m.competition_id AND g.season_id = m.season_id
+            WHERE e.type = 'Pass' AND g.competition_id IS NULL;
+        """)
+        missing = cursor.fetchone()[0]
+        assert missing == 0, f"Found {missing} competition/seasons without an xT grid"
+
+    def test_grid_values_are_probabilities(self, cursor):
+        """Test that grid values lie in [0, 1] and match the grid dimensions."""
+        cursor.execute("SELECT competition_id, season_id FROM xt_grids LIMIT 1;")
+        row = cursor.fetchone()
+        if row is None:
+            pytest.skip("No xT grids built")
+        grid = get_xt_grid(cursor, row[0], row[1])
+        assert grid.shape == (DEFAULT_XT_GRID[1], DEFAULT_XT_GRID[0])
+        assert np.all((grid >= 0) & (grid <= 1))
+
+    def test_unchanged_events_use_cache(self, scratch_cursor):
+        """Test that a second build recomputes no grids when events are unchanged."""
+        assert load_expected_threat(scratch_cursor) == 0
+
+    @pytest.mark.parametrize("column", ["team_id", "player_id"])
+    def test_fingerprint_tracks_attribution(self, cursor, monkeypatch, column):
+        """Test that re-attributing a single action changes only its competition/season's fingerprint."""
+        before = xt._xt_fingerprints(cursor, DEFAULT_XT_GRID)
+        if not before:
+            pytest.skip("No xT actions loaded")
+        event_key, competition_id, season_id = cursor.execute(f"""
+            SELECT event_key, competition_id, season_id
+            FROM ({xt._xt_actions_sql(DEFAULT_XT_GRID)})
+            ORDER BY event_key
+            LIMIT 1;
+        """).fetchone()
+
+        # events_core's FK columns cannot be updated in place, so the change is made in the actions query
+        actions_sql = xt._xt_actions_sql
+        monkeypatch.setattr(xt, "_xt_actions_sql", lambda grid: f"""
+            SELECT * REPLACE (CASE WHEN event_key = {event_key} THEN {column} + 1 ELSE {column} END AS {column})
+            FROM ({actions_sql(grid)})
+        """)
+        after = xt._xt_fingerprints(cursor, DEFAULT_XT_GRID)
+        assert {key for key in before if after[key] != before[key]} == {(competition_id, season_id)}
+
+    def test_vanished_season_deleted(self, scratch_cursor):
+        """Test that the grid of a competition/season without events is deleted."""
+        cols, rows = DEFAULT_XT_GRID
+        scratch_cursor.execute("INSERT INTO competitions (competition_id, season_id) VALUES (-1, -1);")
+        scratch_cursor.execute(
+            "INSERT INTO xt_grids VALUES (-1, -1, ?, ?, ?, 1, '0');", [cols, rows, [0.0] * (cols * rows)]
+        )
+        load_expected_threat(scratch_cursor)
+        scratch_cursor.execute("SELECT COUNT(*) FROM xt_grids WHERE competition_id = -1;")
+        assert scratch_cursor.fetchone()[0] == 0
+
+
+class TestActionXT:
+    """Test per-action xT added."""
+
+    def test_grid_resolutions_kept_apart(self, scratch_cursor):
+        """Test that building another grid resolution leaves the default grid's action values alone."""
+        query = "SELECT * FROM action_xt WHERE grid_cols = ? AND grid_rows = ? ORDER BY ALL;"
+        default = scratch_cursor.execute(query, list(DEFAULT_XT_GRID)).fetchall()
+        if not default:
+            pytest.skip("No action xT built")
+        load_expected_threat(scratch_cursor, grid=(8, 6))
+        assert scratch_cursor.execute(query, list(DEFAULT_XT_GRID)).fetchall() == default
+        assert len(scratch_cursor.execute(query, [8, 6]).fetchall()) == len(default)
+        assert load_expected_threat(scratch_cursor) == 0
+
+    def test_xt_added_is_end_minus_start(self, cursor):
+        """Test that xt_added equals xt_end - xt_start for successful actions."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM action_xt
+            WHERE successful AND abs(xt_added - (xt_end - xt_start)) > 1e-6;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} actions with inconsistent xT added"
+
+    def test_failed_actions_have_no_xt_added(self, cursor):
+        """Test that unsuccessful passes carry no xT added."""
+        cursor.execute("SELECT COUNT(*) FROM action_xt WHERE NOT successful AND xt_added IS NOT NULL;")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} failed actions with xT added"
+
+    def test_only_passes_and_carries(self, cursor):
+        """Test that action_xt only rates passes and carries."""
+        cursor.execute("SELECT DISTINCT type FROM action_xt;")
+        types = {row[0] for row in cursor.fetchall()}
+        assert types <= {"Pass", "Carry"}, f"Unexpected action types in action_xt: {types}"
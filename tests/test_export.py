@@ -0,0 +1,202 @@
+"""Tests for the hive-partitioned, incremental and tunable Parquet export."""
+import glob
+import os
+
+import pytest
+
+from export_to_parquet import (
+    BENCHMARK_SETTINGS,
+    PARTITIONED_EXPORTS,
+    benchmark_export,
+    export_partitioned,
+    export_to_parquet,
+    load_manifest,
+    parquet_options,
+    partition_path,
+)
+
+
+@pytest.fixture(scope="module")
+def export_dir(db_connection, tmp_path_factory):
+    """Export every partitioned output of the test database once."""
+    output_dir = str(tmp_path_factory.mktemp("parq_output"))
+    cursor = db_connection.cursor()
+    for name in PARTITIONED_EXPORTS:
+        export_partitioned(cursor, name, output_dir)
+    return output_dir
+
+
+def _read_sql(export_dir, name):
+    return f"read_parquet('{export_dir}/{name}/*/*/*.parquet', hive_partitioning=true)"
+
+
+class TestPartitionedExport:
+    """Test the layout and contents of the partitioned outputs."""
+
+    @pytest.mark.parametrize("name", PARTITIONED_EXPORTS.keys())
+    def test_rows_match_source(self, cursor, export_dir, name):
+        """Test that the partitions together hold exactly the rows of the export query."""
+        select_sql, _ = PARTITIONED_EXPORTS[name]
+        cursor.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM ({select_sql})),
+                (SELECT COUNT(*) FROM {_read_sql(export_dir, name)});
+        """)
+        source, exported = cursor.fetchone()
+        assert source == exported
+
+    def test_one_partition_per_season(self, cursor, export_dir):
+        """Test that events are written to one file per competition/season with events."""
+        cursor.execute("""
+            SELECT DISTINCT m.competition_id, m.season_id
+            FROM events_core e JOIN matches m ON e.match_id = m.match_id;
+        """)
+        expected = {partition_path(export_dir, "events", *row) for row in cursor.fetchall()}
+        assert set(glob.glob(f"{export_dir}/events/*/*/*.parquet")) == expected
+
+    @pytest.mark.parametrize("name", PARTITIONED_EXPORTS.keys())
+    def test_partitions_sorted_by_match(self, cursor, export_dir, name):
+        """Test that rows are in match_id order within every partition file."""
+        for path in glob.glob(f"{export_dir}/{name}/*/*/*.parquet"):
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM (
+                    SELECT match_id < LAG(match_id) OVER (ORDER BY file_row_number) as out_of_order
+                    FROM read_parquet('{path}', file_row_number=true)
+                )
+                WHERE out_of_order;
+            """)
+            assert cursor.fetchone()[0] == 0, f"{path} is not sorted by match_id"
+
+    def test_partition_filter_reads_one_season(self, cursor, export_dir):
+        """Test that filtering on the partition keys returns exactly that season's events."""
+        cursor.execute("""
+            SELECT m.competition_id, m.season_id, COUNT(*)
+            FROM events_core e JOIN matches m ON e.match_id = m.match_id
+            GROUP BY ALL LIMIT 1;
+        """)
+        row = cursor.fetchone()
+        if row is None:
+            pytest.skip("No events exported")
+        competition_id, season_id, count = row
+        cursor.execute(f"""
+            SELECT COUNT(*) FROM {_read_sql(export_dir, "events")}
+            WHERE competition_id = {competition_id} AND season_id = {season_id};
+        """)
+        assert cursor.fetchone()[0] == count
+
+    def test_partition_columns_only_in_paths(self, cursor, export_dir):
+        """Test that partition keys live in the directory names, not inside the files."""
+        path = glob.glob(f"{export_dir}/events/*/*/*.parquet")[0]
+        cursor.execute(f"DESCRIBE SELECT * FROM read_parquet('{path}', hive_partitioning=false);")
+        columns = {row[0] for row in cursor.fetchall()}
+        assert not columns & {"competition_id", "season_id"}
+        assert os.path.basename(os.path.dirname(path)).startswith("season_id=")
+
+
+def _mtimes(output_dir, name):
+    return {path: os.stat(path).st_mtime_ns for path in glob.glob(f"{output_dir}/{name}/*/*/*.parquet")}
+
+
+class TestIncrementalExport:
+    """Test that only changed partitions are rewritten."""
+
+    @pytest.fixture
+    def exported(self, cursor, tmp_path):
+        """A fresh events export and its manifest entry."""
+        entry, written = export_partitioned(cursor, "events", str(tmp_path))
+        assert written == len(entry["partitions"])
+        return str(tmp_path), entry
+
+    def test_unchanged_export_writes_nothing(self, cursor, exported):
+        """Test that re-exporting unchanged data leaves every file untouched."""
+        output_dir, entry = exported
+        before = _mtimes(output_dir, "events")
+        again, written = export_partitioned(cursor, "events", output_dir, entry)
+        assert written == 0
+        assert again == entry
+        assert _mtimes(output_dir, "events") == before
+
+    def test_changed_partition_rewritten(self, cursor, exported):
+        """Test that a partition whose hash changed is the only one rewritten."""
+        output_dir, entry = exported
+        key = sorted(entry["partitions"])[0]
+        stale = {**entry, "partitions": {**entry["partitions"], key: {**entry["partitions"][key], "hash": "0"}}}
+        _, written = export_partitioned(cursor, "events", output_dir, stale)
+        assert written == 1
+
+    def test_removed_partition_deleted(self, cursor, exported):
+        """Test that a partition no longer in the data is deleted with its empty directories."""
+        output_dir, entry = exported
+        gone = partition_path(output_dir, "events", -1, -1)
+        os.makedirs(os.path.dirname(gone))
+        open(gone, "w").close()
+        previous = {**entry, "partitions": {**entry["partitions"], "competition_id=-1/season_id=-1": {"hash": "0"}}}
+        _, written = export_partitioned(cursor, "events", output_dir, previous)
+        assert written == 0
+        assert not os.path.exists(os.path.join(output_dir, "events", "competition_id=-1"))
+
+    def test_column_change_rewrites_output(self, cursor, exported):
+        """Test that a different column list rewrites every partition."""
+        output_dir, entry = exported
+        _, written = export_partitioned(cursor, "events", output_dir, {**entry, "columns": []})
+        assert written == len(entry["partitions"])
+
+    def test_manifest_records_outputs(self, db_connection, db_path, tmp_path):
+        """Test that a full export writes a manifest covering every output."""
+        export_to_parquet(db_path=db_path, output_dir=str(tmp_path))
+        manifest = load_manifest(str(tmp_path))
+        assert set(manifest["outputs"]) == set(PARTITIONED_EXPORTS) | {"reference"}
+        for name in PARTITIONED_EXPORTS:
+            recorded = {
+                partition_path(str(tmp_path), name, p["competition_id"], p["season_id"])
+                for p in manifest["outputs"][name]["partitions"].values()
+            }
+            assert recorded == set(glob.glob(f"{tmp_path}/{name}/*/*/*.parquet"))
+
+    def test_missing_database_raises(self, tmp_path):
+        """Test that exporting a missing database fails instead of creating an empty one."""
+        db_path = str(tmp_path / "missing.duckdb")
+        with pytest.raises(FileNotFoundError):
+            export_to_parquet(db_path=db_path, output_dir=str(tmp_path / "out"))
+        assert not os.path.exists(db_path)
+
+
+class TestExportTuning:
+    """Test the writer settings and the export benchmark."""
+
+    def test_writer_settings_applied(self, cursor, tmp_path):
+        """Test that the codec and row-group size reach the written files."""
+        export_partitioned(cursor, "events", str(tmp_path), copy_options=parquet_options("zstd", 3, 2048))
+        cursor.execute(f"""
+            SELECT list(DISTINCT compression), MAX(row_group_num_rows)
+            FROM parquet_metadata('{tmp_path}/events/*/*/*.parquet');
+        """)
+        codecs, largest_row_group = cursor.fetchone()
+        assert codecs == ["ZSTD"]
+        assert largest_row_group <= 2048
+
+    def test_settings_change_rewrites_output(self, cursor, tmp_path):
+        """Test that changing the writer settings rewrites every partition."""
+        entry, _ = export_partitioned(cursor, "events", str(tmp_path))
+        _, written = export_partitioned(
+            cursor, "events", str(tmp_path), entry, copy_options=parquet_options("zstd", 1)
+        )
+        assert written == len(entry["partitions"])
+
+    def test_benchmark_reports_each_setting(self, db_connection, db_path):
+        """Test that the benchmark measures size, throughput and read time per setting."""
+        settings = {label: BENCHMARK_SETTINGS[label] for label in ("snappy", "zstd-3")}
+        results = benchmark_export(db_path=db_path, settings=settings, repeat=1)
+        assert set(results) == set(settings)
+        for result in results.values():
+            assert result["bytes"] > 0 and result["seconds"] > 0 and result["rows_per_s"] > 0
+            assert result["query_seconds"] is None or result["query_seconds"] >= 0
+        # Throughput is over rows exported, which no writer setting changes
+        assert len({result["rows"] for result in results.values()}) == 1
+
+    def test_benchmark_missing_database_raises(self, tmp_path):
+        """Test that benchmarking a missing database fails instead of creating an empty one."""
+        db_path = str(tmp_path / "missing.duckdb")
+        with pytest.raises(FileNotFoundError):
+            benchmark_export(db_path=db_path, settings={"snappy": BENCHMARK_SETTINGS["snappy"]})
+        assert not os.path.exists(db_path)
@@ -0,0 +1,328 @@
+"""Tests for the batch 360 frame engines."""
+import json
+from functools import partial
+
+import numpy as np
+import pytest
+
+import schema.frames as frames
+from schema.frames import (
+    frame_pressure_metrics,
+    load_frame_pressure,
+    load_pass_options,
+    load_pitch_control,
+    pad_frames,
+    pad_polygons,
+    pass_lane_metrics,
+    pitch_control_areas,
+)
+
+
+def _record_engine_runs(monkeypatch):
+    """Record the matches each frame engine run computes."""
+    runs = []
+    run = frames._run_frame_engine
+
+    def recording(c, table, columns, worker, matches, *args, **kwargs):
+        runs.append(list(matches))
+        return run(c, table, columns, worker, matches, *args, **kwargs)
+
+    monkeypatch.setattr(frames, "_run_frame_engine", recording)
+    return runs
+
+
+def _positions(rows):
+    """Build a positions dict from (event_key, teammate, actor, keeper, x, y) rows."""
+    columns = list(zip(*rows))
+    return {
+        "event_key": np.array(columns[0], dtype=np.int64),
+        "teammate": np.array(columns[1]),
+        "actor": np.array(columns[2]),
+        "keeper": np.array(columns[3]),
+        "location_x": np.array(columns[4], dtype=float),
+        "location_y": np.array(columns[5], dtype=float),
+        "match_id": 1,
+    }
+
+
+# Two frames in yards; frame 1 has an actor, frame 2 does not
+SYNTHETIC = _positions([
+    (1, True, True, False, 60.0, 40.0),
+    (1, False, False, False, 60.0, 44.0),
+    (1, False, False, True, 72.0, 40.0),
+    (1, True, False, False, 48.0, 40.0),
+    (2, False, False, False, 10.0, 10.0),
+])
+
+
+class TestPadFrames:
+    """Test padding frame-sorted positions into arrays."""
+
+    def test_shapes_and_units(self):
+        """Test padded shapes, masks and the metre conversion."""
+        event_keys, xy, teammate, actor, keeper, valid = pad_frames(SYNTHETIC)
+        assert list(event_keys) == [1, 2]
+        assert xy.shape == (2, 4, 2)
+        assert valid.sum(axis=1).tolist() == [4, 1]
+        assert actor[0, 0] and not actor[1].any()
+        assert keeper[0, 2]
+        assert xy[0, 0].tolist() == pytest.approx([52.5, 34.0])
+
+
+class TestFramePressureMetrics:
+    """Test the broadcast pressure metrics on synthetic frames."""
+
+    def test_metrics(self):
+        """Test nearest distances and radius counts against hand-computed values."""
+        _, xy, teammate, actor, _, valid = pad_frames(SYNTHETIC)
+        metrics = frame_pressure_metrics(xy, teammate, actor, valid)
+        # 4 yards across is 3.4 m; 12 yards along is 10.5 m
+        assert metrics["nearest_opponent_distance"][0] == pytest.approx(3.4)
+        assert metrics["nearest_teammate_distance"][0] == pytest.approx(10.5)
+        assert metrics["opponents_within_5m"][0] == 1
+        assert metrics["opponents_within_10m"][0] == 1
+        assert all(np.isnan(values[1]) for values in metrics.values())
+
+
+class TestFramePressureTable:
+    """Test frame_pressure against the raw 360 positions."""
+
+    def test_every_frame_covered(self, cursor):
+        """Test that every 360 frame has a pressure row."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM three_sixty_frames),
+                (SELECT COUNT(*) FROM frame_pressure);
+        """)
+        frames, rows = cursor.fetchone()
+        assert frames == rows
+
+    def test_matches_sql_reference(self, cursor):
+        """Test nearest-opponent distances against a SQL self-join on a sample of frames."""
+        cursor.execute("""
+            WITH sample AS (SELECT event_key FROM frame_pressure ORDER BY event_key LIMIT 200),
+            reference AS (
+                SELECT a.event_key, MIN(sqrt(
+                    pow((o.location_x - a.location_x) * 105.0 / 120, 2)
+                    + pow((o.location_y - a.location_y) * 68.0 / 80, 2)
+                )) as nearest
+                FROM three_sixty_positions a
+                JOIN three_sixty_positions o ON o.event_key = a.event_key AND NOT o.teammate
+                WHERE a.actor AND a.event_key IN (SELECT event_key FROM sample)
+                GROUP BY a.event_key
+            )
+            SELECT COUNT(*)
+            FROM reference r
+            JOIN frame_pressure p ON p.event_key = r.event_key
+            WHERE abs(p.nearest_opponent_distance - r.nearest) > 1e-3;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} frames disagreeing with the SQL reference"
+
+
+
+class TestPitchControlAreas:
+    """Test the discrete Voronoi partition on synthetic frames."""
+
+    # One teammate and one opponent 44 m apart; the boundary at x = 52 m is a cell edge
+    XY = np.array([[[30.0, 34.0], [74.0, 34.0]]])
+    TEAMMATE = np.array([[True, False]])
+    VALID = np.array([[True, True]])
+
+    def test_whole_pitch_split(self):
+        """Test the halfway split and per-zone areas when no polygon is recorded."""
+        polygons = pad_polygons([None])
+        # 35 x 17 m zones, aligned with the 1 m sampling lattice
+        areas = pitch_control_areas(self.XY, self.TEAMMATE, self.VALID, polygons, grid=(3, 4))
+        assert areas["visible_area"][0] == pytest.approx(105 * 68)
+        assert areas["team_area"][0] == pytest.approx(52 * 68)
+        assert areas["opponent_area"][0] == pytest.approx(53 * 68)
+        # The boundary cuts the middle third at 17 m
+        team_zones = areas["team_zone_area"][0].reshape(4, 3)
+        assert team_zones[:, 0] == pytest.approx([35 * 17] * 4)
+        assert team_zones[:, 1] == pytest.approx([17 * 17] * 4)
+        assert team_zones[:, 2] == pytest.approx([0.0] * 4)
+
+    def test_clipped_to_visible_polygon(self):
+        """Test that only the visible polygon is partitioned."""
+        # First 52 m of the pitch in yards
+        polygons = pad_polygons([[0, 0, 52 * 120 / 105, 0, 52 * 120 / 105, 80, 0, 80]])
+        areas = pitch_control_areas(self.XY, self.TEAMMATE, self.VALID, polygons, grid=(3, 6))
+        assert areas["visible_area"][0] == pytest.approx(52 * 68)
+        assert areas["team_area"][0] == pytest.approx(52 * 68)
+        assert areas["opponent_area"][0] == 0
+
+    def test_frame_without_players(self):
+        """Test that a frame with no visible players controls nothing."""
+        areas = pitch_control_areas(
+            np.full((1, 1, 2), np.nan), np.zeros((1, 1), bool), np.zeros((1, 1), bool),
+            pad_polygons([None]), grid=(3, 6),
+        )
+        assert areas["visible_area"][0] == 0
+
+
+class TestPitchControlTable:
+    """Test frame_pitch_control against the visible polygons."""
+
+    def test_every_frame_covered(self, cursor):
+        """Test that every 360 frame has a pitch control row on the default grid."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM three_sixty_frames),
+                (SELECT COUNT(*) FROM frame_pitch_control WHERE grid_name = 'lanes');
+        """)
+        frames, rows = cursor.fetchone()
+        assert frames == rows
+
+    def test_areas_are_consistent(self, cursor):
+        """Test that team areas and zone areas add up to the visible area."""
+        cursor.execute("""
+            SELECT COUNT(*) FROM frame_pitch_control
+            WHERE abs(team_area + opponent_area - visible_area) > 1
+               OR abs(list_sum(team_zone_area) - team_area) > 1
+               OR abs(list_sum(opponent_zone_area) - opponent_area) > 1;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} frames whose areas do not add up"
+
+    def test_visible_area_matches_polygon(self, cursor):
+        """Test the sampled visible area against the polygon's shoelace area."""
+        rows = cursor.execute("""
+            SELECT p.visible_area, f.visible_area
+            FROM frame_pitch_control p
+            JOIN three_sixty_frames f ON f.event_key = p.event_key
+            WHERE f.visible_area IS NOT NULL
+            ORDER BY p.event_key
+            LIMIT 200;
+        """).fetchall()
+        for sampled, polygon_json in rows:
+            polygon = json.loads(polygon_json)
+            x = np.array(polygon[0::2]) * 105 / 120
+            y = np.array(polygon[1::2]) * 68 / 80
+            area = 0.5 * abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+            assert sampled == pytest.approx(area, rel=0.05, abs=20)
+
+    def test_cell_sizes_cached_separately(self, scratch_cursor, monkeypatch):
+        """Test that each cell size is cached beside the others, including sizes a REAL cannot hold exactly."""
+        count_sql = "SELECT COUNT(*) FROM frame_pitch_control WHERE grid_name = 'lanes' AND cell_size = ?;"
+        count = scratch_cursor.execute(count_sql, [1.0]).fetchone()[0]
+        if count == 0:
+            pytest.skip("No 360 frames loaded")
+        matches = [row[0] for row in scratch_cursor.execute(
+            "SELECT DISTINCT match_id FROM three_sixty_frames ORDER BY match_id;"
+        ).fetchall()]
+        runs = _record_engine_runs(monkeypatch)
+
+        load_pitch_control(scratch_cursor, workers=1)
+        load_pitch_control(scratch_cursor, cell_size=2.1, workers=1)
+        load_pitch_control(scratch_cursor, cell_size=2.1, workers=1)
+        assert runs == [[], matches, []]
+        assert scratch_cursor.execute(count_sql, [1.0]).fetchone()[0] == count
+        assert scratch_cursor.execute(count_sql, [2.1]).fetchone()[0] == count
+
+    def test_unknown_grid(self, cursor):
+        """Test that an unregistered zone grid is rejected."""
+        with pytest.raises(ValueError):
+            load_pitch_control(cursor, grid_name="7x7")
+
+
+def _segment_distance(a, b, p):
+    """Reference distance from point p to segment a-b."""
+    a, b, p = np.asarray(a), np.asarray(b), np.asarray(p)
+    length_sq = np.dot(b - a, b - a)
+    t = 0.0 if length_sq == 0 else min(max(np.dot(p - a, b - a) / length_sq, 0.0), 1.0)
+    return float(np.linalg.norm(a + t * (b - a) - p))
+
+
+class TestPassLaneMetrics:
+    """Test open-lane counts on a synthetic frame in metres."""
+
+    def test_open_and_blocked_lanes(self):
+        """Test a blocked lane, a backward lane and an opponent beyond the receiver."""
+        xy = np.array([[
+            [50.0, 34.0],   # actor
+            [60.0, 34.0],   # teammate, lane blocked by the opponent 1 m off it
+            [40.0, 20.0],   # teammate behind the passer
+            [70.0, 50.0],   # teammate ahead; the opponent beyond them does not close the lane
+            [55.0, 35.0],   # opponent
+            [74.0, 53.0],   # opponent
+        ]])
+        teammate = np.array([[True, True, True, True, False, False]])
+        actor = np.array([[True, False, False, False, False, False]])
+        valid = np.ones_like(teammate)
+        metrics = pass_lane_metrics(xy, teammate, actor, valid, np.array([[50.0, 34.0]]))
+        assert metrics["visible_teammates"][0] == 3
+        assert metrics["open_teammates"][0] == 2
+        assert metrics["open_forward_teammates"][0] == 1
+
+
+class TestPassOptionsTable:
+    """Test pass_options against the raw 360 positions."""
+
+    def test_every_pass_frame_covered(self, cursor):
+        """Test that every located pass with a 360 frame has a row."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM events e JOIN three_sixty_frames f ON f.event_key = e.event_key
+                 WHERE e.type = 'Pass' AND e.location_x IS NOT NULL),
+                (SELECT COUNT(*) FROM pass_options);
+        """)
+        frames, rows = cursor.fetchone()
+        assert frames == rows
+
+    def test_matches_python_reference(self, cursor):
+        """Test open-lane counts against a per-pair Python loop on a sample of passes."""
+        options = cursor.execute("""
+            SELECT o.event_key, o.lane_clearance, o.open_teammates, e.location_x, e.location_y
+            FROM pass_options o
+            JOIN events e ON e.event_key = o.event_key
+            ORDER BY o.event_key
+            LIMIT 100;
+        """).fetchall()
+        for event_key, clearance, open_teammates, passer_x, passer_y in options:
+            players = cursor.execute("""
+                SELECT teammate, actor, location_x * 105.0 / 120, location_y * 68.0 / 80
+                FROM three_sixty_positions WHERE event_key = ?;
+            """, [event_key]).fetchall()
+            passer = (passer_x * 105.0 / 120, passer_y * 68.0 / 80)
+            opponents = [(x, y) for mate, _, x, y in players if not mate]
+            expected = sum(
+                1 for mate, actor, x, y in players
+                if mate and not actor
+                and all(_segment_distance(passer, (x, y), o) > clearance for o in opponents)
+            )
+            assert open_teammates == expected, f"Pass {event_key} disagrees with the reference"
+
+
+class TestProcessPool:
+    """Test that the spawned worker pool reproduces the in-process results."""
+
+    @pytest.mark.parametrize("table,loader,scope", [
+        ("frame_pressure", load_frame_pressure, "TRUE"),
+        ("pass_options", load_pass_options, "TRUE"),
+        # A coarse lattice keeps the pitch control sampling quick
+        ("frame_pitch_control", partial(load_pitch_control, cell_size=3.0), "cell_size = 3.0"),
+    ])
+    def test_pool_matches_serial(self, scratch_cursor, monkeypatch, table, loader, scope):
+        """Test that two pool workers produce the same rows as an in-process run."""
+        row = scratch_cursor.execute("SELECT MIN(match_id) FROM three_sixty_frames;").fetchone()
+        if row[0] is None:
+            pytest.skip("No 360 frames loaded")
+        match_id = row[0]
+        loader(scratch_cursor, [match_id], workers=1)
+        serial = scratch_cursor.execute(
+            f"SELECT * FROM {table} WHERE match_id = ? AND {scope} ORDER BY ALL;", [match_id]
+        ).fetchall()
+
+        # Hand every match to the pool twice (it only starts with two or more
+        # matches) and collect the rows in a key-less copy of the table
+        run = frames._run_frame_engine
+
+        def pooled(c, table, columns, worker, matches, workers=None, **kwargs):
+            c.execute(f"CREATE TEMP TABLE pooled_rows AS SELECT * FROM {table} LIMIT 0;")
+            return run(c, "pooled_rows", columns, worker, matches * 2, workers=2, **kwargs)
+
+        monkeypatch.setattr(frames, "_run_frame_engine", pooled)
+        loader(scratch_cursor, [match_id])
+        rows = scratch_cursor.execute("SELECT * FROM pooled_rows ORDER BY ALL;").fetchall()
+        assert serial and rows == sorted(serial * 2)
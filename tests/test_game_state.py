@@ -0,0 +1,80 @@
+"""Tests for the game-state columns written onto events."""
+import pytest
+
+
+class TestScoreState:
+    """Test score before each event."""
+
+    def test_game_state_populated(self, cursor):
+        """Test that every event has a score state."""
+        cursor.execute("SELECT COUNT(*) FROM events WHERE home_score_before IS NULL OR away_score_before IS NULL;")
+        missing = cursor.fetchone()[0]
+        assert missing == 0, f"Found {missing} events without a score state"
+
+    def test_scores_never_decrease(self, cursor):
+        """Test that scores are non-decreasing in event order."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM (
+                SELECT
+                    home_score_before - LAG(home_score_before) OVER w as home_step,
+                    away_score_before - LAG(away_score_before) OVER w as away_step
+                FROM events
+                WINDOW w AS (PARTITION BY match_id ORDER BY index_num)
+            )
+            WHERE home_step NOT IN (0, 1) OR away_step NOT IN (0, 1);
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events where the score jumps or decreases"
+
+    def test_final_score_bounded_by_result(self, cursor):
+        """Test that the in-play score never exceeds the final result."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM events e
+            JOIN matches m ON e.match_id = m.match_id
+            WHERE e.home_score_before > m.home_score OR e.away_score_before > m.away_score;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with a score above the final result"
+
+    def test_score_diff_perspective(self, cursor):
+        """Test that score_diff_for_team matches the acting team's side."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM events e
+            JOIN matches m ON e.match_id = m.match_id
+            WHERE e.team_id IS NOT NULL
+              AND score_diff_for_team IS DISTINCT FROM CASE
+                  WHEN e.team_id = m.home_team_id THEN home_score_before - away_score_before
+                  ELSE away_score_before - home_score_before
+              END;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with a mis-oriented score difference"
+
+
+class TestManAdvantage:
+    """Test player count differences from sendings-off."""
+
+    def test_player_count_diff_bounded(self, cursor):
+        """Test that player count differences stay within plausible bounds."""
+        cursor.execute("SELECT COUNT(*) FROM events WHERE abs(player_count_diff) > 4;")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with an implausible man advantage"
+
+    def test_no_advantage_without_sending_off(self, cursor):
+        """Test that matches without red cards are always level on players."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM events e
+            WHERE player_count_diff != 0
+              AND NOT EXISTS (
+                  SELECT 1 FROM events r
+                  WHERE r.match_id = e.match_id
+                    AND (r.foul_committed_card IN ('Red Card', 'Second Yellow')
+                         OR r.bad_behaviour_card IN ('Red Card', 'Second Yellow'))
+              );
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with a man advantage but no sending-off"
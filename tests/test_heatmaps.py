@@ -0,0 +1,49 @@
+"""Tests for the precomputed heatmap tiles."""
+import pytest
+
+from schema.heatmaps import get_heatmap
+from schema.zones import ZONE_GRIDS
+
+
+class TestHeatmapTiles:
+    """Test that tiles agree with the events they summarize."""
+
+    def test_counts_sum_to_total(self, cursor):
+        """Test that every tile's zone counts add up to its total."""
+        cursor.execute("SELECT COUNT(*) FROM heatmap_tiles WHERE list_sum(counts) != total;")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} tiles whose counts do not sum to the total"
+
+    def test_tile_sizes_match_grids(self, cursor):
+        """Test that every tile has one count per zone of its grid."""
+        for name, ((cols, rows), _) in ZONE_GRIDS.items():
+            cursor.execute(
+                "SELECT COUNT(*) FROM heatmap_tiles WHERE grid_name = ? AND len(counts) != ?;",
+                [name, cols * rows],
+            )
+            violations = cursor.fetchone()[0]
+            assert violations == 0, f"Found {violations} {name} tiles with the wrong size"
+
+    @pytest.mark.parametrize("grid_name", list(ZONE_GRIDS))
+    def test_team_tiles_cover_located_events(self, cursor, grid_name):
+        """Test that team tiles at each resolution count every located event once."""
+        cursor.execute("""
+            SELECT
+                (SELECT COALESCE(SUM(total), 0) FROM heatmap_tiles WHERE entity_type = 'team' AND grid_name = ?),
+                (SELECT COUNT(*) FROM events WHERE location_x IS NOT NULL);
+        """, [grid_name])
+        tile_total, event_total = cursor.fetchone()
+        assert tile_total == event_total
+
+    def test_get_heatmap_shape(self, cursor):
+        """Test that get_heatmap returns a (rows, cols) array matching the stored tile."""
+        cursor.execute("""
+            SELECT entity_type, entity_id, competition_id, season_id, event_type, total
+            FROM heatmap_tiles WHERE grid_name = '12x8' LIMIT 1;
+        """)
+        row = cursor.fetchone()
+        if row is None:
+            pytest.skip("No heatmap tiles built")
+        heatmap = get_heatmap(cursor, *row[:5], grid_name="12x8")
+        assert heatmap.shape == (8, 12)
+        assert heatmap.sum() == row[5]
@@ -0,0 +1,68 @@
+"""Tests for the managers dimension and match_managers bridge table."""
+import pytest
+
+
+class TestManagerIntegrity:
+    """Test that manager tables are consistent with matches."""
+
+    def test_managers_primary_key_unique(self, cursor):
+        """Test that id is unique in managers."""
+        cursor.execute("""
+            SELECT id, COUNT(*) as cnt
+            FROM managers
+            GROUP BY id
+            HAVING COUNT(*) > 1;
+        """)
+        duplicates = cursor.fetchall()
+        assert len(duplicates) == 0, f"Found duplicate manager IDs: {duplicates}"
+
+    def test_match_managers_link_to_valid_managers(self, cursor):
+        """Test that every bridge row points to a known manager."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM match_managers mm
+            LEFT JOIN managers m ON mm.manager_id = m.id
+            WHERE m.id IS NULL;
+        """)
+        orphans = cursor.fetchone()[0]
+        assert orphans == 0, f"Found {orphans} match_managers rows with unknown manager_id"
+
+    def test_match_managers_team_plays_in_match(self, cursor):
+        """Test that the bridge team_id is the home or away team of the match, per is_home."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM match_managers mm
+            JOIN matches m ON mm.match_id = m.match_id
+            WHERE (mm.is_home AND mm.team_id != m.home_team_id)
+               OR (NOT mm.is_home AND mm.team_id != m.away_team_id);
+        """)
+        mismatches = cursor.fetchone()[0]
+        assert mismatches == 0, f"Found {mismatches} match_managers rows on the wrong side of the match"
+
+
+class TestManagerJSONConsistency:
+    """Test that the bridge table agrees with the legacy JSON manager columns."""
+
+    @pytest.mark.parametrize("side", ["home", "away"])
+    def test_bridge_matches_json_managers(self, cursor, side):
+        """Test that each match side has as many bridge rows as managers in its JSON column."""
+        is_home = "true" if side == "home" else "false"
+        cursor.execute(f"""
+            WITH json_counts AS (
+                SELECT match_id, json_array_length({side}_managers) as n
+                FROM matches
+                WHERE {side}_managers IS NOT NULL
+            ),
+            bridge_counts AS (
+                SELECT match_id, COUNT(*) as n
+                FROM match_managers
+                WHERE is_home = {is_home}
+                GROUP BY match_id
+            )
+            SELECT COUNT(*)
+            FROM json_counts j
+            LEFT JOIN bridge_counts b ON j.match_id = b.match_id
+            WHERE COALESCE(b.n, 0) != j.n;
+        """)
+        mismatches = cursor.fetchone()[0]
+        assert mismatches == 0, f"Found {mismatches} matches where {side} managers differ from the bridge table"
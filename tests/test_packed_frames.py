@@ -0,0 +1,87 @@
+"""Tests for the packed array-per-frame 360 layout."""
+import numpy as np
+import pytest
+
+from schema.frames import load_packed_frame_arrays, pad_frames
+from schema.packed import fetch_packed_positions
+
+
+POSITION_COLUMNS = "event_key, event_uuid, teammate, actor, keeper, location_x, location_y"
+
+
+class TestPackedLayout:
+    """Test that the packed table holds exactly the row-per-player positions."""
+
+    def test_every_frame_packed(self, cursor):
+        """Test one packed row per frame and one array entry per position."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM three_sixty_frames),
+                (SELECT COUNT(*) FROM three_sixty_frames_packed),
+                (SELECT COUNT(*) FROM three_sixty_positions),
+                (SELECT COALESCE(SUM(len(location_x)), 0) FROM three_sixty_frames_packed);
+        """)
+        frames, packed, positions, entries = cursor.fetchone()
+        assert frames == packed
+        assert positions == entries
+
+    def test_parallel_arrays_aligned(self, cursor):
+        """Test that the x, y and flag arrays of each frame have the same length."""
+        cursor.execute("""
+            SELECT COUNT(*) FROM three_sixty_frames_packed
+            WHERE len(location_x) != len(location_y) OR len(location_x) != len(flags);
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} packed frames with misaligned arrays"
+
+    def test_unpacked_view_matches_positions(self, cursor):
+        """Test that the unnest view reproduces three_sixty_positions row for row."""
+        cursor.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM (
+                    SELECT {POSITION_COLUMNS} FROM three_sixty_positions
+                    EXCEPT ALL
+                    SELECT {POSITION_COLUMNS} FROM three_sixty_positions_unpacked
+                )),
+                (SELECT COUNT(*) FROM (
+                    SELECT {POSITION_COLUMNS} FROM three_sixty_positions_unpacked
+                    EXCEPT ALL
+                    SELECT {POSITION_COLUMNS} FROM three_sixty_positions
+                ));
+        """)
+        missing, extra = cursor.fetchone()
+        assert missing == 0 and extra == 0, f"Unpacked view differs: {missing} missing, {extra} extra rows"
+
+
+class TestPackedNumpyLoader:
+    """Test the NumPy loader against the row-table fetch."""
+
+    def test_matches_row_table(self, cursor):
+        """Test that padded arrays from the packed layout equal those from three_sixty_positions."""
+        cursor.execute("SELECT match_id FROM three_sixty_frames_packed LIMIT 1;")
+        row = cursor.fetchone()
+        if row is None:
+            pytest.skip("No 360 frames loaded")
+        match_id = row[0]
+
+        packed = load_packed_frame_arrays(cursor, match_id)
+        positions = cursor.execute("""
+            SELECT p.event_key, p.teammate, p.actor, p.keeper, p.location_x, p.location_y
+            FROM three_sixty_positions p
+            JOIN three_sixty_frames f ON p.event_key = f.event_key
+            WHERE f.match_id = ?
+            ORDER BY p.event_key, p.id;
+        """, [match_id]).fetchnumpy()
+        rows = pad_frames(positions)
+        for packed_array, row_array in zip(packed, rows):
+            np.testing.assert_array_equal(packed_array, row_array)
+
+    def test_flat_arrays(self, cursor):
+        """Test that the loader returns flat, contiguous NumPy arrays."""
+        cursor.execute("SELECT match_id FROM three_sixty_frames_packed LIMIT 1;")
+        row = cursor.fetchone()
+        if row is None:
+            pytest.skip("No 360 frames loaded")
+        positions = fetch_packed_positions(cursor, row[0])
+        for name in ("event_key", "teammate", "actor", "keeper", "location_x", "location_y"):
+            assert positions[name].ndim == 1 and positions[name].flags.c_contiguous
@@ -0,0 +1,66 @@
+"""Tests for the materialized pass network tables."""
+import pytest
+
+
+class TestPassNetworkNodes:
+    """Test pass network node positions and counts."""
+
+    def test_at_most_eleven_nodes(self, cursor):
+        """Test that the starting XI period never has more than eleven players per team."""
+        cursor.execute("""
+            SELECT match_id, team_id, COUNT(*) as nodes
+            FROM pass_network_nodes
+            GROUP BY match_id, team_id
+            HAVING nodes > 11;
+        """)
+        violations = cursor.fetchall()
+        assert not violations, f"Found pass networks with more than eleven players: {violations[:5]}"
+
+    def test_positions_on_pitch(self, cursor):
+        """Test that average positions lie on the 120x80 pitch."""
+        cursor.execute("""
+            SELECT COUNT(*) FROM pass_network_nodes
+            WHERE avg_x NOT BETWEEN 0 AND 120 OR avg_y NOT BETWEEN 0 AND 80;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} nodes positioned off the pitch"
+
+    def test_window_excludes_substitutes(self, cursor):
+        """Test that no node is a player who only entered as a substitute."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM pass_network_nodes n
+            JOIN events s ON s.match_id = n.match_id AND s.type = 'Substitution'
+                         AND s.substitution_replacement_id = n.player_id
+            WHERE n.window_end_index IS NOT NULL AND s.index_num >= n.window_end_index;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} substitutes in starting XI pass networks"
+
+
+class TestPassNetworkEdges:
+    """Test passer -> recipient edge counts."""
+
+    def test_edges_match_completed_passes(self, cursor):
+        """Test that edge counts sum to the nodes' completed passes with a recipient."""
+        cursor.execute("""
+            SELECT
+                (SELECT COALESCE(SUM(pass_count), 0) FROM pass_network_edges),
+                (SELECT COALESCE(SUM(passes_received), 0) FROM pass_network_nodes);
+        """)
+        edge_total, received_total = cursor.fetchone()
+        assert edge_total == received_total
+
+    def test_edge_endpoints_are_nodes(self, cursor):
+        """Test that every edge connects two nodes of the same team network."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM pass_network_edges e
+            LEFT JOIN pass_network_nodes p
+                ON p.match_id = e.match_id AND p.team_id = e.team_id AND p.player_id = e.passer_id
+            LEFT JOIN pass_network_nodes r
+                ON r.match_id = e.match_id AND r.team_id = e.team_id AND r.player_id = e.recipient_id
+            WHERE p.player_id IS NULL OR r.player_id IS NULL;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} edges whose endpoints are not nodes"
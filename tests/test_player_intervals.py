@@ -0,0 +1,87 @@
+"""Tests for on-pitch player intervals and the event interval join."""
+import pytest
+
+from schema.queries import get_on_pitch_players
+
+
+def _interval_match_id(cursor):
+    cursor.execute("SELECT match_id FROM player_intervals LIMIT 1;")
+    row = cursor.fetchone()
+    if row is None:
+        pytest.skip("No player intervals built")
+    return row[0]
+
+
+class TestPlayerIntervals:
+    """Test interval bounds derived from lineup_positions."""
+
+    def test_intervals_not_inverted(self, cursor):
+        """Test that every interval ends after it starts."""
+        cursor.execute("SELECT COUNT(*) FROM player_intervals WHERE end_clock <= start_clock;")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} empty or inverted player intervals"
+
+    def test_seconds_played_bounded(self, cursor):
+        """Test that no player is credited with more time than the match lasted."""
+        cursor.execute("""
+            WITH periods AS (
+                SELECT match_id, period, MAX(minute * 60 + second) - MIN(minute * 60 + second) as length
+                FROM events
+                WHERE period <= 4
+                GROUP BY match_id, period
+            ),
+            match_lengths AS (
+                SELECT match_id, SUM(length) as length FROM periods GROUP BY match_id
+            ),
+            played AS (
+                SELECT match_id, player_id, SUM(seconds_played) as seconds_played
+                FROM player_intervals
+                GROUP BY match_id, player_id
+            )
+            SELECT COUNT(*)
+            FROM played p
+            JOIN match_lengths m ON p.match_id = m.match_id
+            WHERE p.seconds_played < 0 OR p.seconds_played > m.length;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} players with out-of-range seconds played"
+
+
+class TestOnPitchPlayers:
+    """Test the set-based event to on-pitch players join."""
+
+    def test_at_most_eleven_per_team(self, cursor):
+        """Test that no team ever has more than eleven players on the pitch."""
+        match_id = _interval_match_id(cursor)
+        rows = get_on_pitch_players(cursor, [match_id])
+        assert rows, f"No on-pitch players found for match {match_id}"
+        oversized = [(event_key, team_id) for event_key, team_id, players in rows if len(players) > 11]
+        assert not oversized, f"Found {len(oversized)} event/team pairs with more than 11 players"
+
+    def test_kickoff_has_full_elevens(self, cursor):
+        """Test that both teams field eleven players at the first event."""
+        match_id = _interval_match_id(cursor)
+        first_event = cursor.execute(
+            "SELECT event_key FROM events WHERE match_id = ? ORDER BY index_num LIMIT 1;", [match_id]
+        ).fetchone()[0]
+        sizes = [len(players) for event_key, _, players in get_on_pitch_players(cursor, [match_id])
+                 if event_key == first_event]
+        assert sizes == [11, 11], f"Expected two full XIs at kickoff, got {sizes}"
+
+    def test_actors_are_on_pitch(self, cursor):
+        """Test that the acting player is almost always on the pitch."""
+        match_id = _interval_match_id(cursor)
+        on_pitch = {
+            (event_key, team_id): set(players)
+            for event_key, team_id, players in get_on_pitch_players(cursor, [match_id])
+        }
+        events = cursor.execute(
+            "SELECT event_key, team_id, player_id FROM events WHERE match_id = ? AND player_id IS NOT NULL;",
+            [match_id],
+        ).fetchall()
+        missing = sum(1 for event_key, team_id, player_id in events
+                      if player_id not in on_pitch.get((event_key, team_id), ()))
+        # Substitutions share a second with the players' first/last touches
+        assert missing <= 0.01 * len(events), (
+            f"{missing} of {len(events)} events have an actor who is not on the pitch"
+        )
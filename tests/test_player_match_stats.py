@@ -0,0 +1,103 @@
+"""Tests for the per-player match aggregate table."""
+import pytest
+
+from schema.derived import load_player_match_stats
+
+
+class TestPlayerMatchTotals:
+    """Test that player totals agree with raw events."""
+
+    @pytest.mark.parametrize("column,predicate", [
+        ("passes", "type = 'Pass'"),
+        ("shots", "type = 'Shot' AND period < 5"),
+        ("shots_on_target", "type = 'Shot' AND period < 5 AND shot_outcome IN ('Goal', 'Saved', 'Saved to Post')"),
+        ("goals", "type = 'Shot' AND period < 5 AND shot_outcome = 'Goal'"),
+        ("pressures", "type = 'Pressure'"),
+    ])
+    def test_counts_match_events(self, cursor, column, predicate):
+        """Test that summed player counts equal the matching events."""
+        cursor.execute(f"""
+            SELECT
+                (SELECT COALESCE(SUM({column}), 0) FROM player_match_stats),
+                (SELECT COUNT(*) FROM events WHERE player_id IS NOT NULL AND {predicate});
+        """)
+        stats_total, event_total = cursor.fetchone()
+        assert stats_total == event_total, f"{column}: {stats_total} in stats vs {event_total} events"
+
+    def test_xg_matches_events(self, cursor):
+        """Test that summed player xG equals shot xG."""
+        cursor.execute("""
+            SELECT
+                (SELECT COALESCE(SUM(xg), 0) FROM player_match_stats),
+                (SELECT COALESCE(SUM(shot_statsbomb_xg), 0) FROM events WHERE type = 'Shot' AND period < 5);
+        """)
+        stats_xg, event_xg = cursor.fetchone()
+        assert stats_xg == pytest.approx(event_xg, rel=1e-4)
+
+    def test_subset_counts_bounded(self, cursor):
+        """Test that completed/on-target/won counts never exceed their totals."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM player_match_stats
+            WHERE completed_passes > passes
+               OR key_passes > passes
+               OR assists > key_passes
+               OR shots_on_target > shots
+               OR goals > shots_on_target
+               OR completed_dribbles > dribbles
+               OR tackles_won > tackles
+               OR np_xg > xg + 1e-6;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} player rows with inconsistent subset counts"
+
+    def test_shootout_shots_excluded(self, scratch_cursor):
+        """Test that a shot moved into the penalty shootout no longer counts for its player."""
+        scratch_cursor.execute("""
+            SELECT e.event_key, e.match_id, e.player_id, s.shot_outcome IN ('Goal', 'Saved', 'Saved to Post')
+            FROM events_core e JOIN event_shots s ON s.event_key = e.event_key
+            WHERE e.period < 5
+            ORDER BY e.event_key LIMIT 1;
+        """)
+        row = scratch_cursor.fetchone()
+        if row is None:
+            pytest.skip("No shots loaded")
+        event_key, match_id, player_id, on_target = row
+
+        query = "SELECT shots, shots_on_target FROM player_match_stats WHERE match_id = ? AND player_id = ?;"
+        shots, shots_on_target = scratch_cursor.execute(query, [match_id, player_id]).fetchone()
+        scratch_cursor.execute("UPDATE events_core SET period = 5 WHERE event_key = ?;", [event_key])
+        load_player_match_stats(scratch_cursor, [match_id])
+        assert scratch_cursor.execute(query, [match_id, player_id]).fetchone() == (shots - 1, shots_on_target - on_target)
+
+
+class TestPlayingTime:
+    """Test minutes played derived from player intervals."""
+
+    def test_minutes_match_intervals(self, cursor):
+        """Test that minutes played equal the player's interval seconds."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM player_match_stats s
+            JOIN (
+                SELECT match_id, player_id, SUM(seconds_played) as seconds_played
+                FROM player_intervals
+                GROUP BY match_id, player_id
+            ) i ON s.match_id = i.match_id AND s.player_id = i.player_id
+            WHERE s.seconds_played != i.seconds_played
+               OR abs(s.minutes_played * 60 - s.seconds_played) > 1e-3;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} players whose minutes disagree with their intervals"
+
+    def test_eleven_starters_per_team(self, cursor):
+        """Test that every team with playing time has eleven starters."""
+        cursor.execute("""
+            SELECT match_id, team_id, COUNT(*) FILTER (WHERE started) as starters
+            FROM player_match_stats
+            WHERE seconds_played IS NOT NULL
+            GROUP BY match_id, team_id
+            HAVING starters != 11;
+        """)
+        violations = cursor.fetchall()
+        assert not violations, f"Found teams without eleven starters: {violations[:5]}"
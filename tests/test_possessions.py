@@ -0,0 +1,58 @@
+"""Tests for the materialized possessions table."""
+import pytest
+
+
+class TestPossessionCoverage:
+    """Test that possessions account for every event exactly once."""
+
+    def test_event_counts_sum_to_events(self, cursor):
+        """Test that possession event counts add up to the events table."""
+        cursor.execute("SELECT SUM(event_count) FROM possessions;")
+        possession_events = cursor.fetchone()[0] or 0
+        cursor.execute("SELECT COUNT(*) FROM events WHERE possession IS NOT NULL;")
+        total_events = cursor.fetchone()[0]
+        assert possession_events == total_events, (
+            f"Possessions cover {possession_events} events, events table has {total_events}"
+        )
+
+    def test_every_event_possession_materialized(self, cursor):
+        """Test that every (match_id, possession) in events has a possessions row."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM (SELECT DISTINCT match_id, possession FROM events) e
+            LEFT JOIN possessions p ON e.match_id = p.match_id AND e.possession = p.possession
+            WHERE p.match_id IS NULL;
+        """)
+        missing = cursor.fetchone()[0]
+        assert missing == 0, f"Found {missing} possessions missing from the possessions table"
+
+
+class TestPossessionAggregates:
+    """Test that possession aggregates agree with raw events."""
+
+    def test_total_xg_matches_shot_events(self, cursor):
+        """Test that possession xG sums to the possession team's shot xG."""
+        cursor.execute("""
+            SELECT
+                (SELECT COALESCE(SUM(total_xg), 0) FROM possessions),
+                (SELECT COALESCE(SUM(shot_statsbomb_xg), 0) FROM events
+                 WHERE type = 'Shot' AND team_id = possession_team_id);
+        """)
+        possession_xg, event_xg = cursor.fetchone()
+        assert possession_xg == pytest.approx(event_xg, rel=1e-4)
+
+    def test_shot_flags_consistent(self, cursor):
+        """Test that ended_in_shot implies the possession contains a shot."""
+        cursor.execute("SELECT COUNT(*) FROM possessions WHERE ended_in_shot AND shot_count = 0;")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} possessions ending in a shot without any shot"
+
+    def test_clock_ordering(self, cursor):
+        """Test that possessions end no earlier than they start."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM possessions
+            WHERE end_seconds < start_seconds OR end_index < start_index OR duration < 0;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} possessions with inverted clock values"
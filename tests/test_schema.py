@@ -51,6 +51,20 @@ EXPECTED_TABLES = {
         "shot_fidelity_version": "TEXT",
         "xy_fidelity_version": "TEXT",
     },
+    "managers": {
+        "id": "INTEGER",
+        "name": "TEXT",
+        "nickname": "TEXT",
+        "dob": "TEXT",
+        "country_id": "INTEGER",
+        "country_name": "TEXT",
+    },
+    "match_managers": {
+        "match_id": "INTEGER",
+        "team_id": "INTEGER",
+        "manager_id": "INTEGER",
+        "is_home": "BOOLEAN",
+    },
     "event_types": {
         "id": "INTEGER",
         "name": "TEXT",
@@ -72,7 +86,8 @@ EXPECTED_TABLES = {
         "name": "TEXT",
     },
     "events": {
-        "id": "TEXT",
+        "event_key": "BIGINT",
+        "id": "UUID",
         "index_num": "INTEGER",
         "period": "INTEGER",
         "minute": "INTEGER",
@@ -107,7 +122,8 @@ EXPECTED_TABLES = {
         "shot_technique": "TEXT",
         "shot_body_part": "TEXT",
         "shot_type": "TEXT",
-        "shot_key_pass_id": "TEXT",
+        "shot_key_pass_id": "UUID",
+        "shot_key_pass_key": "BIGINT",
         "shot_freeze_frame": "TEXT",
         "shot_first_time": "BOOLEAN",
         "shot_deflected": "BOOLEAN",
@@ -129,7 +145,8 @@ EXPECTED_TABLES = {
         "pass_type": "TEXT",
         "pass_outcome": "TEXT",
         "pass_technique": "TEXT",
-        "pass_assisted_shot_id": "TEXT",
+        "pass_assisted_shot_id": "UUID",
+        "pass_assisted_shot_key": "BIGINT",
         "pass_goal_assist": "BOOLEAN",
         "pass_shot_assist": "BOOLEAN",
         "pass_cross": "BOOLEAN",
@@ -184,6 +201,168 @@ EXPECTED_TABLES = {
         "fifty_fifty_outcome": "TEXT",
         "bad_behaviour_card": "TEXT",
         "injury_stoppage_in_chain": "BOOLEAN",
+        "home_score_before": "INTEGER",
+        "away_score_before": "INTEGER",
+        "score_diff_for_team": "INTEGER",
+        "player_count_diff": "INTEGER",
+        "prev_event_key": "BIGINT",
+        "next_event_key": "BIGINT",
+        "next_same_team_event_key": "BIGINT",
+        "location_zone_12x8": "SMALLINT",
+        "location_zone_18x12": "SMALLINT",
+        "location_zone_lanes": "SMALLINT",
+        "pass_end_zone_12x8": "SMALLINT",
+        "pass_end_zone_18x12": "SMALLINT",
+        "pass_end_zone_lanes": "SMALLINT",
+        "carry_end_zone_12x8": "SMALLINT",
+        "carry_end_zone_18x12": "SMALLINT",
+        "carry_end_zone_lanes": "SMALLINT",
+        "shot_end_zone_12x8": "SMALLINT",
+        "shot_end_zone_18x12": "SMALLINT",
+        "shot_end_zone_lanes": "SMALLINT",
+    },
+    "zone_grids": {
+        "name": "TEXT",
+        "grid_cols": "INTEGER",
+        "grid_rows": "INTEGER",
+        "cell_length": "DOUBLE",
+        "cell_width": "DOUBLE",
+        "description": "TEXT",
+    },
+    "event_relations": {
+        "event_key": "BIGINT",
+        "related_key": "BIGINT",
+        "match_id": "INTEGER",
+    },
+    "possessions": {
+        "match_id": "INTEGER",
+        "possession": "INTEGER",
+        "team_id": "INTEGER",
+        "team": "TEXT",
+        "period": "INTEGER",
+        "play_pattern_id": "INTEGER",
+        "play_pattern": "TEXT",
+        "start_index": "INTEGER",
+        "end_index": "INTEGER",
+        "start_seconds": "INTEGER",
+        "end_seconds": "DOUBLE",
+        "duration": "DOUBLE",
+        "start_location_x": "DOUBLE",
+        "start_location_y": "DOUBLE",
+        "end_location_x": "DOUBLE",
+        "end_location_y": "DOUBLE",
+        "event_count": "INTEGER",
+        "pass_count": "INTEGER",
+        "shot_count": "INTEGER",
+        "ended_in_shot": "BOOLEAN",
+        "total_xg": "DOUBLE",
+    },
+    "actions": {
+        "match_id": "INTEGER",
+        "action_id": "INTEGER",
+        "event_key": "BIGINT",
+        "period": "INTEGER",
+        "time_seconds": "DOUBLE",
+        "team_id": "INTEGER",
+        "player_id": "INTEGER",
+        "start_x": "DOUBLE",
+        "start_y": "DOUBLE",
+        "end_x": "DOUBLE",
+        "end_y": "DOUBLE",
+        "type_name": "TEXT",
+        "result_name": "TEXT",
+        "bodypart_name": "TEXT",
+    },
+    "xt_grids": {
+        "competition_id": "INTEGER",
+        "season_id": "INTEGER",
+        "grid_cols": "INTEGER",
+        "grid_rows": "INTEGER",
+        "xt_values": "REAL[]",
+        "iterations": "INTEGER",
+        "fingerprint": "TEXT",
+    },
+    "action_xt": {
+        "event_key": "BIGINT",
+        "match_id": "INTEGER",
+        "competition_id": "INTEGER",
+        "season_id": "INTEGER",
+        "grid_cols": "INTEGER",
+        "grid_rows": "INTEGER",
+        "team_id": "INTEGER",
+        "player_id": "INTEGER",
+        "type": "TEXT",
+        "successful": "BOOLEAN",
+        "start_cell": "INTEGER",
+        "end_cell": "INTEGER",
+        "xt_start": "DOUBLE",
+        "xt_end": "DOUBLE",
+        "xt_added": "DOUBLE",
+    },
+    "heatmap_tiles": {
+        "entity_type": "TEXT",
+        "entity_id": "INTEGER",
+        "competition_id": "INTEGER",
+        "season_id": "INTEGER",
+        "event_type": "TEXT",
+        "grid_name": "TEXT",
+        "counts": "INTEGER[]",
+        "total": "INTEGER",
+    },
+    "zone_transitions": {
+        "competition_id": "INTEGER",
+        "season_id": "INTEGER",
+        "team_id": "INTEGER",
+        "grid_name": "TEXT",
+        "from_zone": "SMALLINT",
+        "to_zone": "SMALLINT",
+        "attempts": "INTEGER",
+        "successes": "INTEGER",
+        "transition_prob": "DOUBLE",
+        "success_prob": "DOUBLE",
+    },
+    "pass_network_nodes": {
+        "match_id": "INTEGER",
+        "team_id": "INTEGER",
+        "player_id": "INTEGER",
+        "avg_x": "DOUBLE",
+        "avg_y": "DOUBLE",
+        "passes": "INTEGER",
+        "completed_passes": "INTEGER",
+        "passes_received": "INTEGER",
+        "window_end_index": "INTEGER",
+    },
+    "pass_network_edges": {
+        "match_id": "INTEGER",
+        "team_id": "INTEGER",
+        "passer_id": "INTEGER",
+        "recipient_id": "INTEGER",
+        "pass_count": "INTEGER",
+    },
+    "shot_features": {
+        "event_key": "BIGINT",
+        "match_id": "INTEGER",
+        "team_id": "INTEGER",
+        "player_id": "INTEGER",
+        "feature_version": "INTEGER",
+        "location_x": "DOUBLE",
+        "location_y": "DOUBLE",
+        "distance": "DOUBLE",
+        "angle": "DOUBLE",
+        "under_pressure": "BOOLEAN",
+        "first_time": "BOOLEAN",
+        "body_part": "TEXT",
+        "shot_type": "TEXT",
+        "play_pattern": "TEXT",
+        "has_freeze_frame": "BOOLEAN",
+        "defenders_in_cone": "INTEGER",
+        "nearest_defender_distance": "DOUBLE",
+        "gk_x": "DOUBLE",
+        "gk_y": "DOUBLE",
+        "gk_distance": "DOUBLE",
+        "gk_distance_to_goal": "DOUBLE",
+        "statsbomb_xg": "DOUBLE",
+        "is_goal": "BOOLEAN",
     },
     "lineups": {
         "match_id": "INTEGER",
@@ -214,6 +393,51 @@ EXPECTED_TABLES = {
         "start_reason": "TEXT",
         "end_reason": "TEXT",
     },
+    "player_intervals": {
+        "match_id": "INTEGER",
+        "team_id": "INTEGER",
+        "player_id": "INTEGER",
+        "position_id": "INTEGER",
+        "start_period": "INTEGER",
+        "start_seconds": "INTEGER",
+        "end_period": "INTEGER",
+        "end_seconds": "INTEGER",
+        "start_clock": "INTEGER",
+        "end_clock": "INTEGER",
+        "seconds_played": "INTEGER",
+        "start_reason": "TEXT",
+        "end_reason": "TEXT",
+    },
+    "player_match_stats": {
+        "match_id": "INTEGER",
+        "player_id": "INTEGER",
+        "team_id": "INTEGER",
+        "started": "BOOLEAN",
+        "seconds_played": "INTEGER",
+        "minutes_played": "DOUBLE",
+        "passes": "INTEGER",
+        "completed_passes": "INTEGER",
+        "key_passes": "INTEGER",
+        "assists": "INTEGER",
+        "shots": "INTEGER",
+        "shots_on_target": "INTEGER",
+        "goals": "INTEGER",
+        "xg": "DOUBLE",
+        "np_xg": "DOUBLE",
+        "carries": "INTEGER",
+        "dribbles": "INTEGER",
+        "completed_dribbles": "INTEGER",
+        "dispossessed": "INTEGER",
+        "tackles": "INTEGER",
+        "tackles_won": "INTEGER",
+        "interceptions": "INTEGER",
+        "pressures": "INTEGER",
+        "ball_recoveries": "INTEGER",
+        "clearances": "INTEGER",
+        "blocks": "INTEGER",
+        "fouls_committed": "INTEGER",
+        "fouls_won": "INTEGER",
+    },
     "lineup_cards": {
         "id": "INTEGER",
         "match_id": "INTEGER",
@@ -225,13 +449,49 @@ EXPECTED_TABLES = {
         "period": "INTEGER",
     },
     "three_sixty_frames": {
-        "event_uuid": "TEXT",
+        "event_key": "BIGINT",
+        "event_uuid": "UUID",
         "match_id": "INTEGER",
         "visible_area": "TEXT",
     },
+    "three_sixty_frames_packed": {
+        "event_key": "BIGINT",
+        "match_id": "INTEGER",
+        "location_x": "REAL[]",
+        "location_y": "REAL[]",
+        "flags": "UTINYINT[]",
+    },
+    "frame_pressure": {
+        "event_key": "BIGINT",
+        "match_id": "INTEGER",
+        "nearest_opponent_distance": "DOUBLE",
+        "opponents_within_5m": "INTEGER",
+        "opponents_within_10m": "INTEGER",
+        "nearest_teammate_distance": "DOUBLE",
+    },
+    "frame_pitch_control": {
+        "event_key": "BIGINT",
+        "match_id": "INTEGER",
+        "grid_name": "TEXT",
+        "cell_size": "DOUBLE",
+        "visible_area": "DOUBLE",
+        "team_area": "DOUBLE",
+        "opponent_area": "DOUBLE",
+        "team_zone_area": "REAL[]",
+        "opponent_zone_area": "REAL[]",
+    },
+    "pass_options": {
+        "event_key": "BIGINT",
+        "match_id": "INTEGER",
+        "lane_clearance": "DOUBLE",
+        "visible_teammates": "INTEGER",
+        "open_teammates": "INTEGER",
+        "open_forward_teammates": "INTEGER",
+    },
     "three_sixty_positions": {
         "id": "INTEGER",
-        "event_uuid": "TEXT",
+        "event_key": "BIGINT",
+        "event_uuid": "UUID",
         "teammate": "BOOLEAN",
         "actor": "BOOLEAN",
         "keeper": "BOOLEAN",
@@ -240,22 +500,66 @@ EXPECTED_TABLES = {
     },
 }
 
+# events is a view joining events_core to one extension table per StatsBomb
+# event object; each extension holds the events columns with its prefix
+EXPECTED_VIEWS = {"events"}
+EVENT_EXTENSION_PREFIXES = {
+    "event_shots": "shot_",
+    "event_passes": "pass_",
+    "event_carries": "carry_",
+    "event_dribbles": "dribble_",
+    "event_duels": "duel_",
+    "event_fouls_committed": "foul_committed_",
+    "event_fouls_won": "foul_won_",
+    "event_goalkeeper": "goalkeeper_",
+    "event_clearances": "clearance_",
+    "event_interceptions": "interception_",
+    "event_blocks": "block_",
+    "event_ball_recoveries": "ball_recovery_",
+    "event_miscontrols": "miscontrol_",
+    "event_substitutions": "substitution_",
+    "event_fifty_fifties": "fifty_fifty_",
+    "event_bad_behaviours": "bad_behaviour_",
+    "event_injury_stoppages": "injury_stoppage_",
+}
+EXPECTED_TABLES["events_core"] = {
+    column: column_type
+    for column, column_type in EXPECTED_TABLES["events"].items()
+    if not column.startswith(tuple(EVENT_EXTENSION_PREFIXES.values()))
+}
+for _table, _prefix in EVENT_EXTENSION_PREFIXES.items():
+    EXPECTED_TABLES[_table] = {
+        "event_key": "BIGINT",
+        **{column: column_type for column, column_type in EXPECTED_TABLES["events"].items() if column.startswith(_prefix)},
+    }
+
 EXPECTED_INDEXES = [
     "idx_events_match",
     "idx_events_player",
     "idx_events_type",
     "idx_events_team",
     "idx_events_possession",
+    "idx_event_relations_related",
+    "idx_event_relations_match",
+    "idx_possessions_team",
+    "idx_actions_player",
+    "idx_action_xt_match",
+    "idx_action_xt_player",
     "idx_matches_competition",
     "idx_matches_home_team",
     "idx_matches_away_team",
     "idx_matches_date",
+    "idx_match_managers_manager",
+    "idx_match_managers_match",
     "idx_lineup_players_player",
     "idx_lineup_players_match",
     "idx_lineup_positions_player",
     "idx_lineup_positions_match",
     "idx_lineup_cards_player",
     "idx_lineup_cards_match",
+    "idx_player_intervals_match",
+    "idx_player_intervals_player",
+    "idx_player_match_stats_player",
     "idx_360_frames_match",
     "idx_360_positions_event",
 ]
@@ -299,13 +603,25 @@ def get_tables(cursor):
     return {row[0] for row in cursor.fetchall()}
 
 
+def get_views(cursor):
+    """Get all view names from the database."""
+    cursor.execute(
+        """
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = 'main' AND table_type = 'VIEW';
+        """
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
 class TestTableExistence:
     """Test that all required tables exist."""
 
     def test_all_tables_exist(self, cursor):
         """Verify all 8 expected tables exist."""
         tables = get_tables(cursor)
-        expected_table_names = set(EXPECTED_TABLES.keys())
+        expected_table_names = set(EXPECTED_TABLES.keys()) - EXPECTED_VIEWS
         assert tables == expected_table_names, (
             f"Missing tables: {expected_table_names - tables}. "
             f"Unexpected tables: {tables - expected_table_names}"
@@ -314,7 +630,7 @@ class TestTableExistence:
     @pytest.mark.parametrize("table_name", EXPECTED_TABLES.keys())
     def test_table_exists(self, cursor, table_name):
         """Test that each expected table exists."""
-        tables = get_tables(cursor)
+        tables = get_views(cursor) if table_name in EXPECTED_VIEWS else get_tables(cursor)
         assert table_name in tables, f"Table {table_name} does not exist"
 
 
@@ -356,6 +672,12 @@ class TestTableColumns:
             "TEXT": ["VARCHAR", "TEXT"],
             "DOUBLE": ["DOUBLE", "REAL", "FLOAT"],
             "BOOLEAN": ["BOOLEAN", "BOOL"],
+            "REAL[]": ["FLOAT[]", "REAL[]", "DOUBLE[]"],
+            "SMALLINT": ["SMALLINT"],
+            "INTEGER[]": ["INTEGER[]"],
+            "BIGINT": ["BIGINT"],
+            "UUID": ["UUID"],
+            "UTINYINT[]": ["UTINYINT[]"],
         }
 
         # Handle ENUM types - DuckDB stores ENUMs but tests expect TEXT
@@ -0,0 +1,86 @@
+"""Tests for the shot feature store."""
+import json
+import math
+
+import pytest
+
+from schema.shots import SHOT_FEATURE_VERSION, load_shot_features
+
+
+def _in_cone(shot, point):
+    """Reference point-in-triangle test against the shot and both posts."""
+    (sx, sy), (px, py) = shot, point
+    corners = [(sx, sy), (120.0, 36.0), (120.0, 44.0)]
+    signs = []
+    for (ax, ay), (bx, by) in zip(corners, corners[1:] + corners[:1]):
+        signs.append((bx - ax) * (py - ay) - (by - ay) * (px - ax))
+    return all(s >= 0 for s in signs) or all(s <= 0 for s in signs)
+
+
+class TestShotFeatureCoverage:
+    """Test that every located shot has current features."""
+
+    def test_every_shot_has_features(self, cursor):
+        """Test that shot_features covers every located shot at the current version."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM events WHERE type = 'Shot' AND location_x IS NOT NULL),
+                (SELECT COUNT(*) FROM shot_features WHERE feature_version = ?);
+        """, [SHOT_FEATURE_VERSION])
+        shots, features = cursor.fetchone()
+        assert shots == features
+
+
+class TestShotGeometry:
+    """Test distance, angle and freeze-frame features."""
+
+    def test_distance_and_angle(self, cursor):
+        """Test distance and goal angle against a Python reference."""
+        rows = cursor.execute(
+            "SELECT location_x, location_y, distance, angle FROM shot_features;"
+        ).fetchall()
+        for x, y, distance, angle in rows:
+            assert distance == pytest.approx(math.hypot(120 - x, 40 - y), rel=1e-4)
+            expected = abs(math.atan2(44 - y, 120 - x) - math.atan2(36 - y, 120 - x))
+            assert angle == pytest.approx(expected, rel=1e-4, abs=1e-6)
+            assert 0 <= angle <= math.pi
+
+    def test_freeze_frame_features(self, cursor):
+        """Test defenders in the cone and keeper position against the parsed freeze frame."""
+        rows = cursor.execute("""
+            SELECT f.location_x, f.location_y, f.defenders_in_cone, f.gk_x, f.gk_y, e.shot_freeze_frame
+            FROM shot_features f
+            JOIN events e ON e.event_key = f.event_key
+            WHERE f.has_freeze_frame;
+        """).fetchall()
+        if not rows:
+            pytest.skip("No shots with freeze frames")
+        for x, y, defenders_in_cone, gk_x, gk_y, frame_json in rows:
+            frame = json.loads(frame_json)
+            opponents = [p for p in frame if not p["teammate"]]
+            keepers = [p for p in opponents if p["position"]["name"] == "Goalkeeper"]
+            outfield = [p for p in opponents if p["position"]["name"] != "Goalkeeper"]
+            expected = sum(1 for p in outfield if _in_cone((x, y), p["location"]))
+            assert defenders_in_cone == expected
+            if keepers:
+                assert [gk_x, gk_y] == pytest.approx(keepers[0]["location"], rel=1e-4)
+            else:
+                assert gk_x is None
+
+
+class TestShotFeatureRefresh:
+    """Test versioned recomputation."""
+
+    def test_stale_version_recomputed(self, scratch_cursor):
+        """Test that rows from an older feature version are recomputed."""
+        scratch_cursor.execute("SELECT event_key FROM shot_features LIMIT 1;")
+        row = scratch_cursor.fetchone()
+        if row is None:
+            pytest.skip("No shot features built")
+        event_key = row[0]
+
+        query = "SELECT * FROM shot_features WHERE event_key = ?;"
+        before = scratch_cursor.execute(query, [event_key]).fetchall()
+        scratch_cursor.execute("UPDATE shot_features SET feature_version = 0 WHERE event_key = ?;", [event_key])
+        assert load_shot_features(scratch_cursor, []) == 1
+        assert scratch_cursor.execute(query, [event_key]).fetchall() == before
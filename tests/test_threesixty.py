@@ -2,6 +2,8 @@
 import pytest
 import json
 
+from schema.benchmarks import EVENT_360_JOINS, UUID_LAYOUTS, benchmark_uuid_storage
+
 class TestThreeSixtyDataExistence:
     """Test that 360 tables have data proportional to matches with 360 availability."""
 
@@ -64,6 +66,36 @@ class TestThreeSixtyReferentialIntegrity:
         orphans = cursor.fetchone()[0]
         assert orphans == 0, f"Found {orphans} 360 positions linking to non-existent frames"
 
+    def test_event_keys_agree_with_uuids(self, cursor):
+        """Test that the 360 event_key columns identify the same events as event_uuid."""
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM three_sixty_frames f
+                 LEFT JOIN events e ON e.event_key = f.event_key
+                 WHERE e.id IS DISTINCT FROM f.event_uuid),
+                (SELECT COUNT(*) FROM three_sixty_positions p
+                 LEFT JOIN three_sixty_frames f ON f.event_key = p.event_key
+                 WHERE f.event_uuid IS DISTINCT FROM p.event_uuid);
+        """)
+        frames, positions = cursor.fetchone()
+        assert frames == 0, f"Found {frames} 360 frames whose event_key disagrees with event_uuid"
+        assert positions == 0, f"Found {positions} 360 positions whose event_key disagrees with event_uuid"
+
+    def test_benchmark_joins_equivalent(self, cursor):
+        """Test that the benchmarked UUID and event_key joins return the same rows."""
+        results = {
+            name: sorted((str(t), n, round(total, 3)) for t, n, total in cursor.execute(sql).fetchall())
+            for name, sql in EVENT_360_JOINS.items()
+        }
+        assert results["uuid"] == results["event_key"]
+
+    def test_uuid_storage_benchmark(self, cursor):
+        """Test that the UUID storage benchmark reports both layouts and native UUIDs are no larger."""
+        results = benchmark_uuid_storage(cursor, repeat=1)
+        assert set(results) == set(UUID_LAYOUTS)
+        assert all(r["bytes"] > 0 and r["join_seconds"] >= 0 for r in results.values())
+        assert results["UUID"]["bytes"] <= results["VARCHAR"]["bytes"]
+
 class TestThreeSixtyDataQuality:
     """Test data quality and coordinate ranges for 360 data."""
 
@@ -0,0 +1,83 @@
+"""Tests for the sparse zone-to-zone transition tables."""
+import numpy as np
+import pytest
+
+from schema.transitions import get_transition_matrix
+from schema.zones import ZONE_GRIDS
+
+
+def _team_season(cursor):
+    cursor.execute("SELECT competition_id, season_id, team_id FROM zone_transitions LIMIT 1;")
+    row = cursor.fetchone()
+    if row is None:
+        pytest.skip("No zone transitions built")
+    return row
+
+
+class TestZoneTransitions:
+    """Test transition counts and probabilities."""
+
+    @pytest.mark.parametrize("grid_name", list(ZONE_GRIDS))
+    def test_attempts_cover_moves(self, cursor, grid_name):
+        """Test that every located pass and carry is counted once per grid."""
+        cursor.execute("""
+            SELECT
+                (SELECT COALESCE(SUM(attempts), 0) FROM zone_transitions WHERE grid_name = ?),
+                (SELECT COUNT(*) FROM events
+                 WHERE type IN ('Pass', 'Carry') AND location_x IS NOT NULL
+                   AND COALESCE(pass_end_location_x, carry_end_location_x) IS NOT NULL);
+        """, [grid_name])
+        transition_total, move_total = cursor.fetchone()
+        assert transition_total == move_total
+
+    def test_transition_probs_sum_to_one(self, cursor):
+        """Test that outgoing transition probabilities of every zone sum to one."""
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM (
+                SELECT SUM(transition_prob) as total
+                FROM zone_transitions
+                GROUP BY competition_id, season_id, team_id, grid_name, from_zone
+            )
+            WHERE abs(total - 1) > 1e-4;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} zones whose transition probabilities do not sum to 1"
+
+    def test_success_prob_bounded(self, cursor):
+        """Test that successes never exceed attempts."""
+        cursor.execute("""
+            SELECT COUNT(*) FROM zone_transitions
+            WHERE successes > attempts OR success_prob < 0 OR success_prob > 1;
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} transitions with invalid success rates"
+
+
+class TestTransitionMatrix:
+    """Test the dense NumPy loader."""
+
+    def test_dense_matrix_matches_rows(self, cursor):
+        """Test that the dense count matrix holds exactly the stored attempts."""
+        competition_id, season_id, team_id = _team_season(cursor)
+        (cols, rows), _ = ZONE_GRIDS["12x8"]
+        matrix = get_transition_matrix(cursor, competition_id, season_id, team_id, "12x8", value="attempts")
+        assert matrix.shape == (cols * rows, cols * rows)
+
+        cursor.execute("""
+            SELECT COALESCE(SUM(attempts), 0) FROM zone_transitions
+            WHERE competition_id = ? AND season_id = ? AND team_id = ? AND grid_name = '12x8';
+        """, [competition_id, season_id, team_id])
+        assert matrix.sum() == cursor.fetchone()[0]
+
+    def test_probability_rows_stochastic(self, cursor):
+        """Test that non-empty rows of the probability matrix sum to one."""
+        competition_id, season_id, team_id = _team_season(cursor)
+        matrix = get_transition_matrix(cursor, competition_id, season_id, team_id)
+        row_sums = matrix.sum(axis=1)
+        assert np.allclose(row_sums[row_sums > 0], 1.0, atol=1e-4)
+
+    def test_rejects_unknown_value(self):
+        """Test that only stored measures can be requested."""
+        with pytest.raises(ValueError):
+            get_transition_matrix(None, 0, 0, 0, value="from_zone")
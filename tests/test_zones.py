@@ -0,0 +1,60 @@
+"""Tests for the pitch zone registry and event zone columns."""
+import pytest
+
+from schema.zones import ZONE_FIELDS, ZONE_GRIDS, zone_column
+
+# (field, x column, y column) for every zoned location field
+ZONE_SOURCES = [
+    ("location", "location_x", "location_y"),
+    ("pass_end", "pass_end_location_x", "pass_end_location_y"),
+    ("carry_end", "carry_end_location_x", "carry_end_location_y"),
+    ("shot_end", "shot_end_location_x", "shot_end_location_y"),
+]
+
+ZONE_CASES = [
+    (field, x_col, y_col, name, cols, rows)
+    for field, x_col, y_col in ZONE_SOURCES
+    for name, ((cols, rows), _) in ZONE_GRIDS.items()
+]
+
+
+class TestZoneRegistry:
+    """Test the zone_grids registry."""
+
+    def test_registry_matches_config(self, cursor):
+        """Test that zone_grids lists every configured grid."""
+        cursor.execute("SELECT name, grid_cols, grid_rows FROM zone_grids ORDER BY name;")
+        registered = cursor.fetchall()
+        expected = sorted((name, cols, rows) for name, ((cols, rows), _) in ZONE_GRIDS.items())
+        assert registered == expected
+
+    def test_sources_cover_fields(self):
+        """Test that every zoned field is covered by these tests."""
+        assert tuple(field for field, _, _ in ZONE_SOURCES) == ZONE_FIELDS
+
+
+class TestZoneColumns:
+    """Test that stored zone ids agree with the float coordinates."""
+
+    @pytest.mark.parametrize("field,x_col,y_col,name,cols,rows", ZONE_CASES)
+    def test_zone_matches_coordinates(self, cursor, field, x_col, y_col, name, cols, rows):
+        """Test that each zone id is the row-major cell of its location."""
+        column = zone_column(field, name)
+        cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM events
+            WHERE ({x_col} IS NULL) != ({column} IS NULL)
+               OR {column} != LEAST(GREATEST(FLOOR({y_col} / 80.0 * {rows}), 0), {rows - 1}) * {cols}
+                             + LEAST(GREATEST(FLOOR({x_col} / 120.0 * {cols}), 0), {cols - 1});
+        """)
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with a wrong {column}"
+
+    @pytest.mark.parametrize("name", list(ZONE_GRIDS))
+    def test_zone_ids_in_range(self, cursor, name):
+        """Test that location zone ids stay within the grid."""
+        (cols, rows), _ = ZONE_GRIDS[name]
+        column = zone_column("location", name)
+        cursor.execute(f"SELECT COUNT(*) FROM events WHERE {column} < 0 OR {column} >= {cols * rows};")
+        violations = cursor.fetchone()[0]
+        assert violations == 0, f"Found {violations} events with {column} outside the grid"